@@ -0,0 +1,59 @@
+import logging
+from fastapi import APIRouter, HTTPException
+from app.core.executors import io_executor
+from app.schemas.resume import JobMatchRequest, JobPostingsRequest
+from app.services.job_index import get_job_index, index_jobs, resume_query_vector
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+@router.post("/")
+async def add_jobs(request: JobPostingsRequest):
+    """
+    Add job postings to the index (an existing id is replaced)
+    """
+    try:
+        await io_executor.run(
+            index_jobs, [(job.id, job.description, job.metadata) for job in request.jobs])
+        return {"success": True, "indexed": len(request.jobs)}
+    except Exception as e:
+        logger.error(f"Error indexing jobs: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to index jobs")
+
+
+@router.delete("/{job_id}")
+async def delete_job(job_id: str):
+    deleted = await io_executor.run(lambda: get_job_index().delete([job_id]))
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"success": True}
+
+
+@router.post("/match")
+async def match_jobs(request: JobMatchRequest):
+    """
+    Top-N indexed jobs for a resume, by cosine similarity of embeddings
+    """
+    try:
+        def search():
+            query = resume_query_vector(request.resume_content)
+            return get_job_index().search(
+                query, top_k=request.top_n, filters=request.filters, exact=request.exact)
+
+        return {"success": True, "jobs": await io_executor.run(search)}
+    except Exception as e:
+        logger.error(f"Error matching jobs: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to match jobs")
+
+
+@router.post("/compact")
+async def compact_jobs():
+    """Drop deleted and replaced rows from the index files."""
+    await io_executor.run(lambda: get_job_index().compact())
+    return {"success": True, "stats": get_job_index().stats()}
+
+
+@router.get("/stats")
+def job_index_stats():
+    return {"success": True, "stats": get_job_index().stats()}
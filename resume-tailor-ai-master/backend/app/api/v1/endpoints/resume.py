@@ -1,12 +1,42 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
-from app.services.latex_parser import parse_latex_resume
-from app.schemas.resume import ResumeUploadResponse, ResumeTailorRequest
-from app.services.ai_service import analyze_resume_job_match
+from typing import List
+from app.core.config import settings
+from app.core.executors import io_executor
+from app.services.analysis_cache import analysis_cache
+from app.schemas.resume import (
+    BatchUploadItem, BatchUploadResponse, JobRankingRequest, ResumeTailorRequest, ResumeUploadResponse,
+)
+from app.utils.file_handler import UploadDecodeError, UploadTooLargeError, is_allowed_file, read_text_upload
+from app.services.ai_service import analyze_resume_job_match_async
+from app.services.match_scoring import rank_jobs_for_resume
+import asyncio
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+def _validate_filename(file: UploadFile) -> None:
+    if not is_allowed_file(file.filename, settings.allowed_file_types):
+        raise HTTPException(
+            status_code=400,
+            detail="Only .tex files are supported"
+        )
+
+
+async def _read_and_parse(file: UploadFile) -> list:
+    """
+    Stream the upload with the size limit enforced while reading, then
+    parse it on a worker thread
+    """
+    try:
+        latex_content = await read_text_upload(file, settings.max_file_size)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UploadDecodeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await io_executor.run(analysis_cache.resume_sections, latex_content)
+
+
 @router.post("/upload", response_model=ResumeUploadResponse)
 async def upload_resume(file: UploadFile = File(...)):
     """
@@ -14,25 +44,10 @@ async def upload_resume(file: UploadFile = File(...)):
     """
     try:
         # Validate file type
-        if not file.filename.endswith('.tex'):
-            raise HTTPException(
-                status_code=400, 
-                detail="Only .tex files are supported"
-            )
-        
-        # Validate file size (10MB limit)
-        if file.size and file.size > 10 * 1024 * 1024:
-            raise HTTPException(
-                status_code=400,
-                detail="File size must be less than 10MB"
-            )
+        _validate_filename(file)
         
-        # Read file content
-        content = await file.read()
-        latex_content = content.decode('utf-8')
-        
-        # Parse LaTeX resume
-        parsed_sections = parse_latex_resume(latex_content)
+        # Read (size-limited, chunked) and parse off the event loop
+        parsed_sections = await _read_and_parse(file)
         
         return ResumeUploadResponse(
             success=True,
@@ -49,13 +64,44 @@ async def upload_resume(file: UploadFile = File(...)):
             detail="Failed to process resume file"
         )
 
+@router.post("/upload/batch", response_model=BatchUploadResponse)
+async def upload_resumes(files: List[UploadFile] = File(...)):
+    """
+    Upload several LaTeX resume files; they are parsed in parallel and each
+    file reports its own success or error
+    """
+    if len(files) > settings.max_upload_files:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.max_upload_files} files per upload"
+        )
+
+    async def handle(file: UploadFile) -> BatchUploadItem:
+        try:
+            _validate_filename(file)
+            sections = await _read_and_parse(file)
+            return BatchUploadItem(filename=file.filename, success=True, sections=sections)
+        except HTTPException as e:
+            return BatchUploadItem(filename=file.filename or "", success=False, error=e.detail)
+        except Exception as e:
+            logger.error(f"Error processing resume {file.filename}: {str(e)}")
+            return BatchUploadItem(filename=file.filename or "", success=False,
+                                   error="Failed to process resume file")
+
+    results = await asyncio.gather(*(handle(file) for file in files))
+    return BatchUploadResponse(
+        success=all(result.success for result in results),
+        results=results,
+        message=f"Parsed {sum(result.success for result in results)} of {len(results)} files"
+    )
+
 @router.post("/analyze")
 async def analyze_resume(request: ResumeTailorRequest):
     """
     Analyze how well resume matches job description
     """
     try:
-        analysis = analyze_resume_job_match(request.resume_content, request.job_description)
+        analysis = await analyze_resume_job_match_async(request.resume_content, request.job_description)
         return {
             "success": True,
             "analysis": analysis
@@ -67,6 +113,30 @@ async def analyze_resume(request: ResumeTailorRequest):
             detail="Failed to analyze resume"
         )
 
+@router.post("/rank-jobs")
+async def rank_jobs(request: JobRankingRequest):
+    """
+    Rank many job descriptions against one resume in a single vectorized pass
+    """
+    try:
+        ranking = await io_executor.run(
+            rank_jobs_for_resume, request.resume_content, request.job_descriptions, request.top_k)
+        return {
+            "success": True,
+            "ranking": ranking
+        }
+    except Exception as e:
+        logger.error(f"Error ranking jobs: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to rank jobs"
+        )
+
+@router.get("/cache")
+def analysis_cache_stats():
+    """Hit-rate metrics of the shared document-analysis cache."""
+    return {"success": True, "stats": analysis_cache.stats()}
+
 @router.get("/")
 def read_resume():
     return {"message": "Resume endpoint placeholder"}
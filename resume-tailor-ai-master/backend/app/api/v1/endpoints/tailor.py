@@ -1,40 +1,243 @@
-from fastapi import APIRouter, HTTPException, Response
-from app.schemas.tailor import TailorRequest, TailorResponse
-from app.services.ai_service import tailor_resume
-from app.utils.latex_utils import compile_latex_to_pdf, LatexCompilationError
+import asyncio
+import json
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Path, Request, Response
+from fastapi.responses import StreamingResponse
+from app.schemas.tailor import BatchJobStatus, BatchTailorRequest, TailorRequest, TailorResponse
+from app.services.batch_service import batch_manager
+from app.services.llm_cache import llm_cache
+from app.services.prompt_builder import prompt_stats
+from app.services.ai_service import stream_tailored_resume, analyze_resume_job_match_async, model_router
+from app.services.section_tailoring import tailor_resume_checked_async, tailor_sections_async
+from app.utils.latex_utils import preprocess_latex, LatexCompilationError
+from app.utils.compile_scheduler import compile_scheduler, CompileQueueFullError
+from app.utils.pdf_cache import pdf_cache, latex_cache_key
+from app.utils.single_flight import compile_flights, flight_key, single_flight_stats, tailor_flights
+from app.core.metrics import span
 
 router = APIRouter()
 
 
-@router.post("/", response_model=TailorResponse)
-def tailor_resume_endpoint(request: TailorRequest):
-    try:
-        tailored = tailor_resume(request.resume, request.job_description, request.model)
+async def _suggestions_for(request: TailorRequest) -> list[str]:
+    """Generate suggestions (reuse analyze logic) without blocking the event loop."""
+    analysis = await analyze_resume_job_match_async(request.resume, request.job_description)
+    return analysis.get(
+        "suggested_improvements", []) if isinstance(analysis, dict) else []
 
-        # Generate suggestions (reuse analyze logic)
-        from app.services.ai_service import analyze_resume_job_match
-        analysis = analyze_resume_job_match(
-            request.resume, request.job_description)
-        suggestions = analysis.get(
-            "suggested_improvements", []) if isinstance(analysis, dict) else []
 
+@router.post("/", response_model=TailorResponse)
+async def tailor_resume_endpoint(request: TailorRequest):
+    try:
+        tailor = tailor_sections_async if request.mode == "sections" else tailor_resume_checked_async
+        # A double submit or a second tab waits on the first request's LLM calls
+        tailored = await tailor_flights.run(
+            flight_key(request.mode, request.model, request.resume, request.job_description),
+            lambda: tailor(request.resume, request.job_description, request.model))
+        suggestions = await _suggestions_for(request)
         return TailorResponse(tailored_resume=tailored, suggestions=suggestions)
     except Exception:
         raise HTTPException(status_code=500, detail="Failed to tailor resume.")
 
 
+@router.get("/cache")
+def tailor_cache_stats():
+    """Hit/miss metrics of the LLM response cache."""
+    return {"success": True, "stats": llm_cache.stats()}
+
+
+@router.get("/models")
+def tailor_model_stats():
+    """Per-model latency, error rate and circuit breaker state of the model router."""
+    return {"success": True, "stats": model_router.stats()}
+
+
+@router.get("/coalescing")
+def tailor_coalescing_stats():
+    """Calls that started work vs. calls that joined an identical one in flight."""
+    return {"success": True, "stats": single_flight_stats()}
+
+
+@router.get("/prompt")
+def tailor_prompt_stats():
+    """Prompt tokens sent and saved by the token-budgeted prompt builder."""
+    return {"success": True, "stats": prompt_stats.stats()}
+
+
+def _sse(event: str, payload: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+@router.post("/stream")
+async def tailor_resume_stream_endpoint(request: TailorRequest):
+    """
+    Stream the tailored resume as Server-Sent Events.
+
+    Emits `delta` events with {"text": ...} as sanitized LaTeX arrives, then a
+    single `done` event with the same body as POST /, or `error` on failure.
+    """
+    async def events():
+        parts = []
+        try:
+            async for text in stream_tailored_resume(request.resume, request.job_description, request.model):
+                parts.append(text)
+                yield _sse("delta", {"text": text})
+            suggestions = await _suggestions_for(request)
+            yield _sse("done", TailorResponse(
+                tailored_resume="".join(parts), suggestions=suggestions).dict())
+        except Exception:
+            yield _sse("error", {"detail": "Failed to tailor resume."})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/batch", response_model=BatchJobStatus, status_code=202)
+async def submit_batch_endpoint(request: BatchTailorRequest, http_request: Request):
+    """
+    Tailor one resume against many job descriptions (or many explicit pairs).
+    Returns a job id; poll GET /batch/{job_id} or stream /batch/{job_id}/events.
+    Every item counts against the caller's tailoring rate limit.
+    """
+    try:
+        job = batch_manager.submit(request, client=getattr(http_request.state, "admission_client", None))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return job.snapshot()
+
+
+def _get_batch_job(job_id: str):
+    job = batch_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Batch job not found.")
+    return job
+
+
+@router.get("/batch/{job_id}", response_model=BatchJobStatus)
+async def get_batch_endpoint(job_id: str):
+    return _get_batch_job(job_id).snapshot()
+
+
+@router.get("/batch/{job_id}/events")
+async def stream_batch_endpoint(job_id: str):
+    """
+    Server-Sent Events for a batch job: one `result` event per finished item
+    (with progress counters), then a final `done` event with the full status.
+    """
+    job = _get_batch_job(job_id)
+
+    async def events():
+        sent = set()
+        while True:
+            async with job.changed:
+                pending = [r for i, r in job.results.items() if i not in sent]
+                if not pending and not job.done:
+                    await job.changed.wait()
+                    continue
+            status = job.snapshot()
+            for result in sorted(pending, key=lambda r: r.index):
+                sent.add(result.index)
+                yield _sse("result", {
+                    "completed": status.completed,
+                    "failed": status.failed,
+                    "total": status.total,
+                    "result": result.dict(),
+                })
+            if job.done and len(sent) == len(job.results):
+                yield _sse("done", status.dict())
+                return
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header (possibly a list or weak tags) against `etag`."""
+    if not if_none_match:
+        return False
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+async def _compile(key: str, preprocessed: str) -> bytes:
+    # Queue wait plus build; the scheduler's threads do not report spans
+    with span("compile"):
+        pdf_bytes = await asyncio.wrap_future(compile_scheduler.submit(preprocessed))
+    pdf_cache.put(key, pdf_bytes)
+    return pdf_bytes
+
+
 @router.post("/compile", response_class=Response)
-def compile_latex_endpoint(request: TailorRequest):
+async def compile_latex_endpoint(request: TailorRequest, http_request: Request):
     """
     Accept LaTeX (in request.resume) and return compiled PDF bytes.
     This is used by the frontend for live preview.
+
+    Responses are content-addressed: the ETag is the hash of the
+    preprocessed LaTeX and Content-Location points at GET /compile/{key},
+    where the same PDF can be revalidated with If-None-Match. Repeated
+    sources are served from the PDF cache. Cache misses are built by the
+    bounded compile scheduler; when its queue is full the request is
+    rejected with 429 and Retry-After.
     """
     try:
-        pdf_bytes = compile_latex_to_pdf(request.resume)
-        headers = {"Cache-Control": "no-store"}
+        preprocessed = preprocess_latex(request.resume)
+        key = latex_cache_key(preprocessed)
+        headers = {
+            "Cache-Control": "no-cache",
+            "ETag": f'"{key}"',
+            "Content-Location": str(http_request.url_for("compiled_pdf_endpoint", key=key)),
+        }
+
+        pdf_bytes = pdf_cache.get(key)
+        headers["X-Cache"] = "HIT" if pdf_bytes is not None else "MISS"
+        if pdf_bytes is None:
+            # Tabs previewing the same source share one build
+            pdf_bytes = await compile_flights.run(key, lambda: _compile(key, preprocessed))
+
         return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
+    except CompileQueueFullError as e:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many compile requests in progress. Please retry shortly.",
+            headers={"Retry-After": str(e.retry_after)},
+        )
     except LatexCompilationError as e:
         # Return 422 with error details so UI can surface them
         raise HTTPException(status_code=422, detail=str(e))
     except Exception:
         raise HTTPException(status_code=500, detail="Failed to compile LaTeX.")
+
+
+@router.get("/compile/cache")
+def compile_cache_stats():
+    """Hit/miss counters and sizes of the compiled PDF cache."""
+    return {"success": True, "stats": pdf_cache.stats()}
+
+
+@router.get("/compile/queue")
+def compile_queue_stats():
+    """Slot usage, queue depth and job counters of the compile scheduler."""
+    return {"success": True, "stats": compile_scheduler.stats()}
+
+
+@router.get("/compile/{key}", response_class=Response)
+def compiled_pdf_endpoint(key: str = Path(..., pattern="^[0-9a-f]{64}$"),
+                          if_none_match: Optional[str] = Header(None)):
+    """
+    A previously compiled PDF by its content hash (the ETag of POST /compile).
+    Answers 304 when If-None-Match carries that ETag, 404 once it has left the cache.
+    """
+    etag = f'"{key}"'
+    # The key is the hash of the source, so the PDF behind a URL never changes
+    headers = {"Cache-Control": "public, max-age=31536000, immutable", "ETag": etag}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    pdf_bytes = pdf_cache.get(key)
+    if pdf_bytes is None:
+        raise HTTPException(status_code=404, detail="Compiled PDF not found.")
+    return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
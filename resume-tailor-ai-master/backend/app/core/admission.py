@@ -0,0 +1,300 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import admission_rejected, admission_wait_seconds
+
+# Per-client state is dropped least recently seen first beyond this many clients
+MAX_CLIENTS = 10000
+
+
+@dataclass(frozen=True)
+class Tier:
+    """Budget and queue cost of one class of routes."""
+    name: str
+    per_minute: float  # requests each client may start per minute
+    burst: float  # requests a client may start back to back
+    cost: int  # capacity units held while a request runs
+    shed_level: int  # overload level at which new requests are refused (0: never)
+
+
+class AdmissionRejected(Exception):
+    """A request was refused before reaching the app."""
+
+    def __init__(self, status: int, detail: str, retry_after: float):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Token bucket that lends: a request over budget takes a token ahead of
+    time and is told how long to wait for it, so a client sending faster
+    than its rate is slowed down rather than refused, up to `max_delay`.
+    """
+
+    def __init__(self, per_second: float, capacity: float, now: float):
+        self.per_second = per_second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Seconds until the next token is available (0: one is available now)."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.per_second)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.per_second
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+
+class FairQueue:
+    """
+    Weighted fair queue in front of `capacity` units of concurrent work.
+
+    Each waiting request gets a virtual finish time: its client's previous
+    finish time (or the queue's virtual clock, if later) plus the request's
+    cost. Waiters are admitted in finish-time order, so a client with many
+    requests queued is served in turn with everyone else instead of ahead
+    of them, and expensive requests count for more than cheap ones.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.in_use = 0
+        self._heap: List[Tuple[float, int, int, float, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._virtual = 0.0
+        self._finish: Dict[str, float] = {}
+
+    def waiting(self) -> int:
+        return sum(1 for *_, waiter in self._heap if not waiter.done())
+
+    def oldest_wait(self, now: float) -> float:
+        """Age of the longest-waiting request (0 when none wait)."""
+        ages = [now - enqueued for *_, enqueued, waiter in self._heap if not waiter.done()]
+        return max(ages, default=0.0)
+
+    async def acquire(self, client: str, cost: int, timeout: Optional[float]) -> None:
+        """Wait for `cost` units; raises asyncio.TimeoutError after `timeout` seconds (None: never)."""
+        cost = min(cost, self.capacity)
+        tag = max(self._virtual, self._finish.get(client, 0.0)) + cost
+        self._finish[client] = tag
+        if len(self._finish) > MAX_CLIENTS:
+            self._finish = {c: t for c, t in self._finish.items() if t > self._virtual}
+        if not self._heap and self.in_use + cost <= self.capacity:
+            self.in_use += cost
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._heap, (tag, next(self._sequence), cost, time.monotonic(), waiter))
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # Admitted just as we gave up; hand the units on
+                self.release(cost)
+            else:
+                waiter.cancel()
+                self._dispatch()
+            raise
+
+    def release(self, cost: int) -> None:
+        self.in_use -= min(cost, self.capacity)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self._heap:
+            tag, _, cost, _, waiter = self._heap[0]
+            if waiter.done():
+                heapq.heappop(self._heap)
+                continue
+            if self.in_use + cost > self.capacity:
+                return  # the head waits for room; skipping it would starve big requests
+            heapq.heappop(self._heap)
+            self.in_use += cost
+            self._virtual = tag
+            waiter.set_result(None)
+        if self.in_use == 0:
+            # Idle: past usage no longer counts against anyone
+            self._virtual = 0.0
+            self._finish.clear()
+
+
+class AdmissionController:
+    """
+    Decides whether, and when, a request reaches the app.
+
+    1. Per-client token buckets, one per tier: a client over its rate is
+       delayed until its next token, or refused with 429 when that is more
+       than `max_delay` away.
+    2. A weighted fair queue shared by all tiers bounds concurrent work,
+       interleaving clients instead of serving them first come first
+       served.
+    3. Load shedding from measured queue latency: when even the shortest
+       wait in the last `interval` exceeds `target_wait` (the queue never
+       drained, CoDel style), the overload level rises by one per
+       interval and new requests of tiers at or below it are refused with
+       503; it falls again once waits drop under half the target. Cheap
+       requests are never shed, only queued.
+
+    Work that a request starts but that runs after it has been answered
+    (batch items) goes through `admit_background`, which charges the same
+    buckets and queue but waits instead of refusing.
+    """
+
+    def __init__(self, tiers: Dict[str, Tier], capacity: int, max_delay: float, max_wait: float,
+                 target_wait: float, interval: float = 1.0):
+        self.tiers = tiers
+        self.queue = FairQueue(capacity)
+        self.max_delay = max_delay
+        self.max_wait = max_wait
+        self.target_wait = target_wait
+        self.interval = interval
+        self.level = 0
+        self._buckets: "OrderedDict[Tuple[str, str], TokenBucket]" = OrderedDict()
+        self._window_started = time.monotonic()
+        self._window_min: Optional[float] = None
+        self._stats = {tier: {"admitted": 0, "delayed": 0, "rate_limited": 0, "shed": 0, "timed_out": 0}
+                       for tier in tiers}
+
+    def _bucket(self, client: str, tier: Tier, now: float) -> TokenBucket:
+        key = (client, tier.name)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(tier.per_minute / 60.0, tier.burst, now)
+            while len(self._buckets) > MAX_CLIENTS * len(self.tiers):
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def _observe_wait(self, wait: float) -> None:
+        self._window_min = wait if self._window_min is None else min(self._window_min, wait)
+
+    def _update_level(self, now: float) -> None:
+        if now - self._window_started < self.interval:
+            return
+        # Requests still queued count with their age so far; a stalled queue has no completions to measure
+        self._observe_wait(self.queue.oldest_wait(now))
+        shortest = self._window_min or 0.0
+        if shortest > self.target_wait:
+            self.level = min(self.level + 1, max(tier.shed_level for tier in self.tiers.values()))
+        elif shortest < self.target_wait / 2:
+            self.level = max(self.level - 1, 0)
+        self._window_started = now
+        self._window_min = None
+
+    def _reject(self, tier: Tier, reason: str, status: int, detail: str, retry_after: float):
+        self._stats[tier.name][reason] += 1
+        admission_rejected.labels(tier=tier.name, reason=reason).inc()
+        return AdmissionRejected(status, detail, retry_after)
+
+    async def admit(self, client: str, tier_name: str) -> int:
+        """
+        Wait until the request may run and return the capacity units it
+        holds; pass them to `release` when it finishes. Raises
+        AdmissionRejected instead when it must not run.
+        """
+        tier = self.tiers[tier_name]
+        self._update_level(time.monotonic())
+        if tier.shed_level and self.level >= tier.shed_level:
+            raise self._reject(tier, "shed", 503, "Server is overloaded, please retry shortly.",
+                               self.target_wait * 2)
+        await self._wait_for_token(client, tier, self.max_delay)
+        return await self._enter(client, tier, self.max_wait)
+
+    async def admit_background(self, client: str, tier_name: str) -> int:
+        """
+        `admit` for one unit of work with nobody waiting on a response:
+        waits for the client's next token and its turn in the queue however
+        long they take, and is never shed. Returns the units to `release`.
+        """
+        tier = self.tiers[tier_name]
+        await self._wait_for_token(client, tier, None)
+        return await self._enter(client, tier, None)
+
+    async def _wait_for_token(self, client: str, tier: Tier, max_delay: Optional[float]) -> None:
+        now = time.monotonic()
+        bucket = self._bucket(client, tier, now)
+        delay = bucket.delay(now)
+        if max_delay is not None and delay > max_delay:
+            raise self._reject(tier, "rate_limited", 429, f"Rate limit exceeded for {tier.name} requests.",
+                               delay - max_delay)
+        bucket.take()
+        if delay > 0:
+            self._stats[tier.name]["delayed"] += 1
+            await asyncio.sleep(delay)
+
+    async def _enter(self, client: str, tier: Tier, timeout: Optional[float]) -> int:
+        enqueued = time.monotonic()
+        try:
+            await self.queue.acquire(client, tier.cost, timeout)
+        except asyncio.TimeoutError:
+            raise self._reject(tier, "timed_out", 503, "Server is overloaded, please retry shortly.",
+                               self.target_wait * 2)
+        wait = time.monotonic() - enqueued
+        self._observe_wait(wait)
+        admission_wait_seconds.labels(tier=tier.name).observe(wait)
+        self._stats[tier.name]["admitted"] += 1
+        return tier.cost
+
+    def release(self, units: int) -> None:
+        self.queue.release(units)
+
+    def stats(self) -> Dict[str, object]:
+        """Per-tier decisions, queue occupancy and the current overload level."""
+        return {
+            "tiers": {name: dict(counts) for name, counts in self._stats.items()},
+            "capacity": self.queue.capacity,
+            "in_use": self.queue.in_use,
+            "waiting": self.queue.waiting(),
+            "overload_level": self.level,
+            "clients": len({client for client, _ in self._buckets}),
+        }
+
+
+def _tiers() -> Dict[str, Tier]:
+    per_minute = settings.rate_limit_per_minute
+    return {
+        "cheap": Tier("cheap", per_minute, max(1.0, per_minute / 4), cost=1, shed_level=0),
+        "medium": Tier("medium", settings.rate_limit_compile_per_minute,
+                       max(1.0, settings.rate_limit_compile_per_minute / 4), cost=2, shed_level=2),
+        "expensive": Tier("expensive", settings.rate_limit_tailor_per_minute,
+                          max(1.0, settings.rate_limit_tailor_per_minute / 4), cost=4, shed_level=1),
+    }
+
+
+# (method, path without trailing slash) -> tier; everything else is not admission-controlled.
+# A batch submission costs one expensive request, and each of its items another
+# (BatchJobManager charges them to the submitting client as they run).
+ROUTE_TIERS = {
+    ("POST", "/api/v1/tailor"): "expensive",
+    ("POST", "/api/v1/tailor/stream"): "expensive",
+    ("POST", "/api/v1/tailor/batch"): "expensive",
+    ("POST", "/api/v1/tailor/compile"): "medium",
+    ("POST", "/api/v1/resume/analyze"): "cheap",
+    ("POST", "/api/v1/resume/upload"): "cheap",
+    ("POST", "/api/v1/resume/upload/batch"): "cheap",
+    ("POST", "/api/v1/resume/rank-jobs"): "cheap",
+    ("POST", "/api/v1/jobs"): "cheap",
+    ("POST", "/api/v1/jobs/match"): "cheap",
+}
+
+
+# Global admission controller instance
+admission_controller = AdmissionController(
+    tiers=_tiers(),
+    capacity=settings.admission_capacity,
+    max_delay=settings.admission_max_delay_seconds,
+    max_wait=settings.admission_max_wait_seconds,
+    target_wait=settings.admission_target_wait_seconds,
+)
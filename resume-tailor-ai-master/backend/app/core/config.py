@@ -6,24 +6,129 @@ class Settings(BaseSettings):
     # OpenAI Configuration
     openai_api_key: str
     openai_base_url: str = "https://openrouter.ai/api/v1"
+    llm_max_connections: int = 100
+    llm_timeout_seconds: float = 180.0
+    
+    # Model Router Configuration
+    router_enabled: bool = True
+    router_models: List[str] = []  # fallback/hedge pool of provider ids; empty = every model in model_mapping
+    router_hedging: bool = True
+    router_hedge_delay_seconds: float = 20.0  # hedge delay before a model has latency samples
+    router_hedge_min_seconds: float = 2.0
+    router_hedge_max_seconds: float = 60.0
+    router_max_attempts: int = 3  # models tried per request, hedges included
+    router_window: int = 50  # calls per model in the rolling latency/error window
+    router_breaker_failures: int = 3  # consecutive failures that open a model's breaker
+    router_breaker_error_rate: float = 0.5
+    router_breaker_cooldown_seconds: float = 30.0
+    
+    # LLM Response Cache Configuration
+    llm_cache_max_entries: int = 256  # 0 disables the cache
+    llm_cache_ttl_seconds: float = 3600.0
+    llm_cache_semantic: bool = False  # reuse results for near-duplicate job descriptions
+    llm_cache_semantic_threshold: float = 0.97
+    
+    # Prompt Budget Configuration (tokens)
+    prompt_token_budget: int = 8000  # cap per tailoring prompt, lowered for small context windows
+    prompt_min_output_tokens: int = 2048  # context kept free for the rewritten resume
+    prompt_section_excerpt_tokens: int = 80
+    prompt_job_share: float = 0.7  # share of the leftover budget for the job description
+    
+    # Section-Level Tailoring Configuration
+    section_tailor_max_sections: int = 3  # sections rewritten concurrently per request
+    section_tailor_job_tokens: int = 1500  # job description budget per section prompt
+    
+    # Match Scoring Configuration
+    match_semantic_weight: float = 0.7  # embedding vs TF-IDF similarity
+    match_keyword_weight: float = 0.4  # keyword overlap vs requirement coverage in the final score
+    match_coverage_threshold: float = 0.5  # similarity at which a requirement counts as covered
+    match_max_requirements: int = 50
+    
+    # Job Posting Index Configuration
+    job_index_path: str = "./job_index"
+    job_index_approx_threshold: int = 20000  # live jobs above which search uses the IVF index
+    job_index_nprobe: int = 16  # IVF lists scanned per query
     
     # Database Configuration
     chroma_db_path: str = "./chroma_db"
+    rag_persist: bool = False  # store every request's sections/job in ChromaDB
+    rag_ttl_seconds: float = 7 * 24 * 3600
+    rag_gc_interval_seconds: float = 3600  # how often writes trigger maintenance (TTL, LRU, compaction)
+    rag_gc_scan_entries: int = 10000  # entries each background maintenance run reads; 0 = all
+    rag_max_entries: int = 100000  # least recently used entries evicted above this; 0 = unbounded
+    rag_max_bytes: int = 1024 * 1024 * 1024  # on-disk budget of chroma_db_path; 0 = unbounded
+    rag_compact_ratio: float = 0.2  # rebuild the index once this share of it has been evicted
+    
+    # Embedding Configuration
+    embedding_model: str = "all-MiniLM-L6-v2"
+    embedding_cache_size: int = 4096  # vectors kept in memory
+    embedding_store_path: str = ""  # e.g. "./embedding_cache" to persist vectors
+    
+    # Skills vocabulary: optional file with one "Canonical | alias | ..." per line
+    skill_taxonomy_path: str = ""
     
     # Server Configuration
     host: str = "0.0.0.0"
     port: int = 8000
     debug: bool = True
+    preload_rag: bool = True  # false for compile-only workers: never loads torch/ChromaDB up front
     
     # CORS Configuration
     allowed_origins: List[str] = ["http://localhost:5173", "http://localhost:3000"]
     
-    # Rate Limiting
-    rate_limit_per_minute: int = 60
+    # Rate Limiting and Admission Control (per client)
+    rate_limit_per_minute: int = 60  # cheap routes: analyze, upload, job search
+    rate_limit_compile_per_minute: int = 30
+    rate_limit_tailor_per_minute: int = 10  # tailor, stream and batch submissions
+    admission_enabled: bool = True
+    admission_trust_forwarded: bool = False  # identify clients by X-Forwarded-For (only behind a proxy)
+    admission_capacity: int = 32  # concurrent work units; tailor holds 4, compile 2, the rest 1
+    admission_max_delay_seconds: float = 10.0  # longest a client over its rate is held back before 429
+    admission_max_wait_seconds: float = 60.0  # longest queue wait before 503
+    admission_target_wait_seconds: float = 2.0  # sustained queue latency that starts load shedding
     
     # File Upload Configuration
     max_file_size: int = 10 * 1024 * 1024  # 10MB
     allowed_file_types: List[str] = [".tex"]
+    max_upload_files: int = 20  # files per batch upload
+    
+    # Execution Pools
+    cpu_workers: int = 2  # processes for parsing/keyword extraction; 0 runs them inline
+    io_workers: int = 32  # threads for blocking I/O: LLM, embeddings, vector stores
+    
+    # Observability
+    metrics_enabled: bool = True  # Prometheus text format on GET /metrics
+    server_timing: bool = False  # per-stage Server-Timing response header
+    profiler_enabled: bool = False  # sample stacks during requests, dump flamegraphs of slow ones
+    profiler_interval_seconds: float = 0.01
+    profiler_slow_seconds: float = 5.0
+    profiler_output_dir: str = "./profiles"
+    
+    # Batch Tailoring Configuration
+    batch_concurrency: int = 4  # default concurrent LLM calls per batch job
+    batch_max_concurrency: int = 16
+    batch_max_items: int = 100
+    batch_job_ttl_seconds: float = 3600.0
+    
+    # Document Analysis Cache Configuration
+    analysis_cache_max_entries: int = 512
+    analysis_cache_ttl_seconds: float = 600.0
+    
+    # Identical concurrent tailor/analyze/compile calls share one run
+    coalesce_requests: bool = True
+    
+    # PDF Compile Cache Configuration
+    pdf_cache_memory_bytes: int = 64 * 1024 * 1024  # 64MB
+    pdf_cache_dir: str = "./pdf_cache"
+    pdf_cache_disk_bytes: int = 512 * 1024 * 1024  # 512MB
+    
+    # LaTeX Compile Scheduler Configuration
+    compile_workers: int = 2
+    compile_queue_size: int = 16
+    compile_timeout_seconds: float = 30.0
+    compile_work_dir: str = "./compile_work"
+    compile_warm_up: bool = True
+    latex_validation: bool = True  # reject structurally broken LaTeX before starting tectonic
     
     class Config:
         env_file = ".env"
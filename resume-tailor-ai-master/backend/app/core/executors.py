@@ -0,0 +1,139 @@
+import asyncio
+import contextvars
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MonitoredExecutor:
+    """
+    A sized, lazily created pool that counts its in-flight work.
+
+    `pending` covers queued plus running calls; with `workers` slots the
+    queue depth is whatever exceeds them and `saturation` is pending /
+    workers (above 1.0 means callers are waiting). `workers=0` runs every
+    call inline in the caller's thread, e.g. for a single-core deployment.
+    With `copy_context` (threads only) calls run in a copy of the caller's
+    context variables, as with asyncio.to_thread.
+    """
+
+    def __init__(self, name: str, workers: int, factory: Callable[[int], Executor], copy_context: bool = False):
+        self.name = name
+        self.workers = max(0, workers)
+        self._factory = factory
+        self.copy_context = copy_context
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._peak = 0
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0}
+
+    def _get(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = self._factory(self.workers)
+                    logger.info(f"Started {self.name} pool with {self.workers} workers")
+        return self._executor
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        if self.workers == 0:
+            future: Future = Future()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        with self._lock:
+            self._pending += 1
+            self._peak = max(self._peak, self._pending)
+            self._stats["submitted"] += 1
+        if self.copy_context:
+            fn, args = contextvars.copy_context().run, (fn, *args)
+        try:
+            future = self._get().submit(fn, *args, **kwargs)
+        except Exception:
+            self._finished(None)
+            raise
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future: Optional[Future]) -> None:
+        error = None if future is None or future.cancelled() else future.exception()
+        with self._lock:
+            self._pending -= 1
+            failed = future is None or future.cancelled() or error is not None
+            self._stats["failed" if failed else "completed"] += 1
+            if isinstance(error, BrokenProcessPool) and self._executor is not None:
+                # A worker died (e.g. OOM-killed); start a fresh pool on next use
+                logger.error(f"{self.name} pool is broken, restarting it")
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def call(self, fn: Callable, *args, **kwargs):
+        """Run `fn` on the pool and block until it returns."""
+        return self.submit(fn, *args, **kwargs).result()
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        """Run `fn` on the pool without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            pending = self._pending
+            return {
+                **self._stats,
+                "workers": self.workers,
+                "running": min(pending, self.workers),
+                "queued": max(0, pending - self.workers),
+                "peak_pending": self._peak,
+                "saturation": round(pending / self.workers, 3) if self.workers else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def _process_pool(workers: int) -> Executor:
+    # spawn: never fork a process that holds torch/HTTP-client threads
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def _thread_pool(workers: int) -> Executor:
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="io")
+
+
+# CPU-bound pure functions (LaTeX parsing, keyword extraction): separate
+# processes, so they neither hold the GIL against the event loop nor queue
+# behind I/O
+cpu_executor = MonitoredExecutor("cpu", settings.cpu_workers, _process_pool)
+
+# Blocking I/O and native-code calls (sync LLM client, embeddings, vector
+# stores, file access): their own threads, apart from Starlette's default
+# pool and from the tectonic compile queue
+io_executor = MonitoredExecutor("io", settings.io_workers, _thread_pool, copy_context=True)
+
+
+def executor_stats() -> Dict[str, Dict[str, object]]:
+    """Depth and saturation of every execution pool, compile queue included."""
+    from app.utils.compile_scheduler import compile_scheduler
+
+    compile_stats = compile_scheduler.stats()
+    compile_stats["saturation"] = round(
+        (compile_stats["running"] + compile_stats["queued"]) / compile_stats["workers"], 3)
+    return {"cpu": cpu_executor.stats(), "io": io_executor.stats(), "compile": compile_stats}
+
+
+def shutdown_executors() -> None:
+    cpu_executor.shutdown()
+    io_executor.shutdown()
@@ -0,0 +1,91 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict
+
+from fastapi import FastAPI
+
+from app.core.config import settings
+from app.core.executors import cpu_executor, io_executor, shutdown_executors
+
+logger = logging.getLogger(__name__)
+
+
+class StartupState:
+    """Tracks background warm-up so /health can tell "live" from "ready"."""
+
+    def __init__(self):
+        self.components: Dict[str, bool] = {}
+        self.errors: Dict[str, str] = {}
+
+    def pending(self, name: str) -> None:
+        self.components[name] = False
+
+    def done(self, name: str) -> None:
+        self.components[name] = True
+
+    def failed(self, name: str, error: Exception) -> None:
+        self.errors[name] = str(error)
+
+    @property
+    def ready(self) -> bool:
+        return all(self.components.values())
+
+    def report(self) -> Dict[str, object]:
+        return {"ready": self.ready, "components": dict(self.components), "errors": dict(self.errors)}
+
+
+startup_state = StartupState()
+
+
+async def _warm(name: str, fn) -> None:
+    startup_state.pending(name)
+    try:
+        await io_executor.run(fn)
+        startup_state.done(name)
+    except Exception as e:
+        logger.error(f"Warm-up of {name} failed: {str(e)}")
+        startup_state.failed(name, e)
+
+
+async def warm_up() -> None:
+    """
+    Load heavy dependencies concurrently in the background.
+
+    ML services are imported here rather than at module level so that a
+    compile-only worker (PRELOAD_RAG=false) never imports torch or opens
+    ChromaDB unless a tailoring request actually needs them.
+    """
+    from app.utils.compile_scheduler import compile_scheduler
+
+    if settings.compile_warm_up:
+        compile_scheduler.warm_up()
+
+    # Spawn the CPU worker processes now rather than on the first upload
+    from app.services.keyword_matcher import find_skills
+    cpu_executor.submit(find_skills, "warm-up")
+
+    jobs = []
+    if settings.preload_rag:
+        from app.services.ai_service import get_async_client
+        from app.services.rag_service import rag_service
+        jobs.append(_warm("rag", rag_service.warm_up))
+        jobs.append(_warm("llm_client", get_async_client))
+    await asyncio.gather(*jobs)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.preload_rag:
+        # Mark components pending before serving so /health/ready starts at 503
+        startup_state.pending("rag")
+        startup_state.pending("llm_client")
+    task = asyncio.create_task(warm_up())
+    try:
+        yield
+    finally:
+        if not task.done():
+            task.cancel()
+        from app.services.ai_service import close_clients
+        await close_clients()
+        shutdown_executors()
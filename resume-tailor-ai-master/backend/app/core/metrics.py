@@ -0,0 +1,212 @@
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+NAMESPACE = "resume_tailor"
+
+# Seconds; covers sub-millisecond cache hits up to multi-minute LLM calls
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+TOKEN_BUCKETS = (64, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+
+GaugeSamples = Callable[[], Iterable[Tuple[Dict[str, str], float]]]
+
+
+class CallbackGauges(Collector):
+    """Gauges whose samples are read from callbacks at scrape time."""
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+        self._gauges: List[Tuple[str, str, GaugeSamples]] = []
+
+    def gauge(self, name: str, documentation: str, collect: GaugeSamples) -> None:
+        self._gauges.append((f"{self.namespace}_{name}", documentation, collect))
+
+    def collect(self):
+        for name, documentation, collect in self._gauges:
+            samples = list(collect())
+            if not samples:
+                continue
+            labelnames = list(samples[0][0])
+            family = GaugeMetricFamily(name, documentation, labels=labelnames)
+            for labels, value in samples:
+                family.add_metric([str(labels[label]) for label in labelnames], value)
+            yield family
+
+
+# A registry of our own, so /metrics exports only the app's metrics and
+# not whatever libraries register on the default one
+registry = CollectorRegistry()
+gauges = CallbackGauges(NAMESPACE)
+registry.register(gauges)
+
+
+def _histogram(name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+    return Histogram(name, documentation, labelnames, namespace=NAMESPACE, buckets=buckets, registry=registry)
+
+
+def _counter(name: str, documentation: str, labelnames=()) -> Counter:
+    return Counter(name, documentation, labelnames, namespace=NAMESPACE, registry=registry)
+
+
+def render_metrics() -> bytes:
+    """Every metric in the Prometheus text format."""
+    return generate_latest(registry)
+
+
+http_request_seconds = _histogram(
+    "http_request_duration_seconds", "HTTP request latency until the response starts.",
+    ["method", "route", "status"])
+stage_seconds = _histogram(
+    "stage_duration_seconds", "Time spent in each pipeline stage.", ["stage"])
+llm_request_seconds = _histogram(
+    "llm_request_duration_seconds", "Completion latency per model attempt.", ["model", "outcome"])
+llm_ttft_seconds = _histogram(
+    "llm_time_to_first_token_seconds", "Time until the first streamed token.", ["model"])
+llm_tokens = _counter(
+    "llm_tokens_total", "Tokens sent to and generated by each model.", ["model", "kind"])
+llm_completion_tokens = _histogram(
+    "llm_completion_tokens", "Generated tokens per completion.", ["model"], buckets=TOKEN_BUCKETS)
+compile_seconds = _histogram(
+    "compile_duration_seconds", "Tectonic build time.", ["outcome"])
+compile_wait_seconds = _histogram(
+    "compile_queue_wait_seconds", "Time a build waited for a compile slot.")
+admission_wait_seconds = _histogram(
+    "admission_queue_wait_seconds", "Time an admitted request waited in the fair queue.", ["tier"])
+admission_rejected = _counter(
+    "admission_rejected_total", "Requests refused by admission control.", ["tier", "reason"])
+
+
+# Stages recorded during the current request, for the Server-Timing header.
+# The list is shared (not copied) with tasks and pool threads the request
+# spawns, so their spans land in it too.
+request_timings: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("request_timings", default=None)
+
+
+@contextmanager
+def span(stage: str):
+    """
+    Time a block (or, as a decorator, a function) as pipeline stage `stage`.
+
+    Work shipped to the CPU process pool cannot report back, so time such
+    calls around the pool call rather than inside the worker.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        stage_seconds.labels(stage=stage).observe(elapsed)
+        timings = request_timings.get()
+        if timings is not None:
+            timings.append((stage, elapsed))
+
+
+def record_llm_usage(model: str, prompt_tokens: Optional[int], completion_tokens: Optional[int]) -> None:
+    """Count the tokens of one completion; either count may be unknown (None)."""
+    if prompt_tokens:
+        llm_tokens.labels(model=model, kind="prompt").inc(prompt_tokens)
+    if completion_tokens:
+        llm_tokens.labels(model=model, kind="completion").inc(completion_tokens)
+        llm_completion_tokens.labels(model=model).observe(completion_tokens)
+
+
+def server_timing_header(timings: List[Tuple[str, float]], total: float) -> str:
+    """`Server-Timing` value with the summed duration of each stage, in first-seen order."""
+    totals: Dict[str, float] = {}
+    for stage, elapsed in list(timings):
+        totals[stage] = totals.get(stage, 0.0) + elapsed
+    entries = [f"{stage};dur={elapsed * 1000:.1f}" for stage, elapsed in totals.items()]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+def _loaded(module: str):
+    # Report only services this process has imported; a compile-only worker
+    # must not load the ML stack just to be scraped
+    return sys.modules.get(module)
+
+
+def _cache_counters() -> Dict[str, Tuple[float, float, float]]:
+    """(hits, misses, entries) for every loaded cache."""
+    caches = {}
+    if (module := _loaded("app.services.analysis_cache")) is not None:
+        for name, stats in module.analysis_cache.stats().items():
+            caches[f"analysis_{name}"] = (stats["hits"], stats["misses"], stats["entries"])
+    if (module := _loaded("app.services.llm_cache")) is not None:
+        stats = module.llm_cache.stats()
+        exact, semantic = stats["exact"], stats["semantic"]
+        caches["llm_exact"] = (exact["hits"], exact["misses"], exact["entries"])
+        if semantic["enabled"]:
+            caches["llm_semantic"] = (semantic["semantic_hits"], semantic["semantic_misses"], semantic["groups"])
+    if (module := _loaded("app.utils.pdf_cache")) is not None:
+        stats = module.pdf_cache.stats()
+        caches["pdf"] = (stats["memory_hits"] + stats["disk_hits"], stats["misses"],
+                         stats["memory_entries"] + stats["disk_entries"])
+    if (module := _loaded("app.services.rag_service")) is not None and module.rag_service._embeddings is not None:
+        stats = module.rag_service._embeddings.stats()
+        caches["embeddings"] = (stats["memory_hits"] + stats["disk_hits"], stats["misses"], stats["cached"])
+    return caches
+
+
+def _cache_samples(index: int):
+    return [({"cache": name}, values[index]) for name, values in _cache_counters().items()]
+
+
+def _cache_hit_ratio():
+    return [({"cache": name}, hits / (hits + misses) if hits + misses else 0.0)
+            for name, (hits, misses, _) in _cache_counters().items()]
+
+
+def _pool_samples(field: str):
+    from app.core.executors import executor_stats
+
+    return [({"pool": pool}, stats[field]) for pool, stats in executor_stats().items()]
+
+
+def _coalescing_samples(field: str):
+    if (module := _loaded("app.utils.single_flight")) is None:
+        return []
+    return [({"flight": name}, stats[field]) for name, stats in module.single_flight_stats().items()]
+
+
+def _admission_samples(field: str):
+    if (module := _loaded("app.core.admission")) is None:
+        return []
+    return [({}, module.admission_controller.stats()[field])]
+
+
+def _breaker_samples():
+    if (module := _loaded("app.services.ai_service")) is None:
+        return []
+    states = {"closed": 0, "half_open": 1, "open": 2}
+    return [({"model": model}, states[health["state"]])
+            for model, health in module.model_router.stats()["models"].items()]
+
+
+# Hit and miss totals are exported as gauges of the caches' own counters;
+# rate() over them works as over counters
+gauges.gauge("cache_hits", "Lookups answered from each cache.", lambda: _cache_samples(0))
+gauges.gauge("cache_misses", "Lookups each cache had to compute.", lambda: _cache_samples(1))
+gauges.gauge("cache_entries", "Entries currently held by each cache.", lambda: _cache_samples(2))
+gauges.gauge("cache_hit_ratio", "Lifetime hit ratio of each cache.", _cache_hit_ratio)
+gauges.gauge("coalesced_calls", "Calls that joined an identical call already in flight.",
+              lambda: _coalescing_samples("joined"))
+gauges.gauge("coalesce_leaders", "Calls that started work others could join.",
+              lambda: _coalescing_samples("leaders"))
+gauges.gauge("admission_in_use", "Capacity units held by admitted requests.",
+              lambda: _admission_samples("in_use"))
+gauges.gauge("admission_waiting", "Requests waiting in the admission queue.",
+              lambda: _admission_samples("waiting"))
+gauges.gauge("admission_overload_level", "Load-shedding level: 1 sheds tailoring, 2 compiles too.",
+              lambda: _admission_samples("overload_level"))
+gauges.gauge("pool_running", "Calls running on each execution pool.", lambda: _pool_samples("running"))
+gauges.gauge("pool_queued", "Calls waiting for each execution pool.", lambda: _pool_samples("queued"))
+gauges.gauge("pool_saturation", "Pending calls per worker of each execution pool.", lambda: _pool_samples("saturation"))
+gauges.gauge("llm_breaker_state", "Circuit breaker per model: 0 closed, 1 half-open, 2 open.", _breaker_samples)
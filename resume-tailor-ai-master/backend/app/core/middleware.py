@@ -0,0 +1,212 @@
+import json
+import math
+import time
+from typing import Optional, Sequence
+
+from app.core.admission import ROUTE_TIERS, AdmissionController, AdmissionRejected
+from app.core.executors import io_executor
+from app.core.metrics import http_request_seconds, request_timings, server_timing_header
+from app.core.profiler import SamplingProfiler
+from app.utils.file_handler import format_size
+
+
+class _BodyTooLarge(Exception):
+    pass
+
+
+class BodySizeLimitMiddleware:
+    """
+    Reject request bodies over `max_bytes` sent to the given paths.
+
+    A declared Content-Length over the limit is answered with 413 before
+    any of the body is read; chunked bodies are counted as they arrive and
+    cut off with 413 the moment they pass the limit, so an oversized upload
+    never gets spooled in full by the multipart parser.
+    """
+
+    def __init__(self, app, max_bytes: int, paths: Sequence[str]):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.paths = {path.rstrip("/") for path in paths}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].rstrip("/") not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope.get("headers", []):
+            if name == b"content-length" and value.isdigit() and int(value) > self.max_bytes:
+                await self._reject(send)
+                return
+
+        received = 0
+        exceeded = False
+        started = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    exceeded = True
+                    raise _BodyTooLarge()
+            return message
+
+        async def guarded_send(message):
+            nonlocal started
+            if exceeded:
+                # The app turned the aborted read into its own error response;
+                # answer 413 instead
+                if message["type"] == "http.response.start" and not started:
+                    started = True
+                    await self._reject(send)
+                return
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except _BodyTooLarge:
+            if not started:
+                await self._reject(send)
+
+    async def _reject(self, send) -> None:
+        body = json.dumps({"detail": f"Request body must be less than {format_size(self.max_bytes)}"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode()),
+                        (b"connection", b"close")],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+class AdmissionControlMiddleware:
+    """
+    Hold back or refuse requests to the routes in ROUTE_TIERS according to
+    `controller` (per-client rate, fair queueing, load shedding).
+
+    Clients are told apart by their socket address, or by the first
+    X-Forwarded-For hop with `trust_forwarded` (only safe behind a proxy
+    that sets it). Refusals are 429 (client over its rate) or 503
+    (server overloaded), both with Retry-After. Admitted requests hold
+    their queue units until the app has finished the response, streamed
+    ones included. The client is recorded as `request.state.admission_client`
+    for work that outlives the response (batch items).
+    """
+
+    def __init__(self, app, controller: AdmissionController, trust_forwarded: bool = False):
+        self.app = app
+        self.controller = controller
+        self.trust_forwarded = trust_forwarded
+
+    async def __call__(self, scope, receive, send):
+        tier = ROUTE_TIERS.get((scope.get("method"), scope.get("path", "").rstrip("/"))) \
+            if scope["type"] == "http" else None
+        if tier is None:
+            await self.app(scope, receive, send)
+            return
+
+        client = self._client(scope)
+        scope.setdefault("state", {})["admission_client"] = client
+        try:
+            units = await self.controller.admit(client, tier)
+        except AdmissionRejected as e:
+            await self._reject(send, e)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(units)
+
+    def _client(self, scope) -> str:
+        if self.trust_forwarded:
+            for name, value in scope.get("headers", []):
+                if name == b"x-forwarded-for":
+                    return value.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    @staticmethod
+    async def _reject(send, rejected: AdmissionRejected) -> None:
+        body = json.dumps({"detail": rejected.detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": rejected.status,
+            "headers": [(b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode()),
+                        (b"retry-after", str(max(1, math.ceil(rejected.retry_after))).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+class RequestMetricsMiddleware:
+    """
+    Time every HTTP request and collect the pipeline stages it ran.
+
+    Latency until the response starts goes into the request histogram,
+    labelled by route template rather than raw path. With `server_timing`
+    the per-stage durations recorded by `span` are sent back in a
+    `Server-Timing` header (for streamed responses, the stages finished
+    before the first byte). With a `profiler`, slow requests get a
+    flamegraph written to disk.
+    """
+
+    def __init__(self, app, server_timing: bool = False, profiler: Optional[SamplingProfiler] = None):
+        self.app = app
+        self.server_timing = server_timing
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        timings = []
+        token = request_timings.set(timings)
+        profile_id = self.profiler.start_request() if self.profiler is not None else None
+        responded = False
+
+        def observe(status: int) -> float:
+            elapsed = time.perf_counter() - started
+            http_request_seconds.labels(
+                method=scope["method"], route=self._route(scope), status=status).observe(elapsed)
+            return elapsed
+
+        async def timed_send(message):
+            nonlocal responded
+            if message["type"] == "http.response.start":
+                responded = True
+                elapsed = observe(message["status"])
+                if self.server_timing:
+                    message = {**message, "headers": [
+                        *message.get("headers", []),
+                        (b"server-timing", server_timing_header(timings, elapsed).encode()),
+                    ]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timed_send)
+        except Exception:
+            if not responded:
+                # Answered with 500 by the server error handler further out
+                observe(500)
+            raise
+        finally:
+            request_timings.reset(token)
+            if profile_id is not None:
+                name = f"{scope['method']} {self._route(scope)}"
+                await io_executor.run(
+                    self.profiler.finish_request, profile_id, name, time.perf_counter() - started)
+
+    @staticmethod
+    def _route(scope) -> str:
+        """Path template of the matched route, e.g. /api/v1/jobs/{job_id}."""
+        route = scope.get("route")
+        if route is None:
+            return "unmatched"  # keep 404 scans from creating a series per path
+        return route.path
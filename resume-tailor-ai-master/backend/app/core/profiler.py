@@ -0,0 +1,151 @@
+import html
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Leaf frames of threads that are parked waiting for work, not doing any
+_IDLE_FRAMES = {("thread.py", "_worker"), ("threading.py", "wait"), ("queue.py", "get")}
+
+
+def _fold(frame, max_depth: int) -> Optional[str]:
+    """'outer;...;leaf' stack of `frame`, or None for an idle thread."""
+    code = frame.f_code
+    if (os.path.basename(code.co_filename), code.co_name) in _IDLE_FRAMES:
+        return None
+    names = []
+    while frame is not None and len(names) < max_depth:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler for slow requests.
+
+    While at least one request is in flight, a background thread samples
+    the stack of every busy thread each `interval` seconds and adds it to
+    each in-flight request's profile. Requests that take `slow_seconds` or
+    longer are written to `output_dir` as folded stacks (for flamegraph.pl
+    or speedscope) plus a self-contained SVG flamegraph. Concurrent
+    requests share samples, so a profile shows everything the process did
+    while that request was running. The sampler idles when nothing is in
+    flight.
+    """
+
+    def __init__(self, interval: float, slow_seconds: float, output_dir: str, max_depth: int = 64):
+        self.interval = interval
+        self.slow_seconds = slow_seconds
+        self.output_dir = Path(output_dir)
+        self.max_depth = max_depth
+        self._active: Dict[int, Counter] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"profiled": 0, "dumped": 0, "samples": 0}
+
+    def start_request(self) -> int:
+        with self._lock:
+            self._next_id += 1
+            self._active[self._next_id] = Counter()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+                self._thread.start()
+            self._wake.set()
+            return self._next_id
+
+    def finish_request(self, request_id: int, name: str, elapsed: float) -> Optional[Path]:
+        """Stop profiling a request; returns the flamegraph path if it was slow."""
+        with self._lock:
+            stacks = self._active.pop(request_id, None)
+            self._stats["profiled"] += 1
+            if not self._active:
+                self._wake.clear()
+        if stacks is None or elapsed < self.slow_seconds or not stacks:
+            return None
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_") or "request"
+        stem = self.output_dir / f"{time.strftime('%Y%m%d-%H%M%S')}-{slug}-{int(elapsed * 1000)}ms"
+        folded = stem.with_suffix(".folded")
+        folded.write_text("".join(f"{stack} {count}\n" for stack, count in stacks.most_common()))
+        stem.with_suffix(".svg").write_text(render_flamegraph(stacks, f"{name} ({elapsed:.2f}s)"))
+        with self._lock:
+            self._stats["dumped"] += 1
+        logger.warning(f"Slow request {name} took {elapsed:.2f}s, profile written to {folded}")
+        return folded
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while True:
+            self._wake.wait()
+            stacks = []
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own and (stack := _fold(frame, self.max_depth)) is not None:
+                    stacks.append(stack)
+            with self._lock:
+                for profile in self._active.values():
+                    profile.update(stacks)
+                self._stats["samples"] += 1
+            time.sleep(self.interval)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {**self._stats, "in_flight": len(self._active), "slow_seconds": self.slow_seconds}
+
+
+def render_flamegraph(stacks: Counter, title: str, width: int = 1200, row_height: int = 16) -> str:
+    """Render folded stacks as an SVG flamegraph (root at the bottom)."""
+    root: Dict = {"count": 0, "children": {}}
+    depth = 0
+    for stack, count in stacks.items():
+        node = root
+        node["count"] += count
+        frames = stack.split(";")
+        depth = max(depth, len(frames))
+        for name in frames:
+            node = node["children"].setdefault(name, {"count": 0, "children": {}})
+            node["count"] += count
+
+    total = root["count"] or 1
+    height = (depth + 2) * row_height
+    rects = []
+
+    def draw(children: Dict, x: float, level: int) -> None:
+        for name, node in sorted(children.items()):
+            w = node["count"] / total * width
+            if w >= 0.5:
+                y = height - (level + 1) * row_height
+                hue = zlib.crc32(name.encode()) % 60
+                label = html.escape(name)
+                if w > 7 * len(name):
+                    text = label
+                elif w > 35:
+                    text = html.escape(name[: int(w / 7) - 2] + "..")
+                else:
+                    text = ""
+                rects.append(
+                    f'<g><title>{label} ({node["count"]} samples, {node["count"] / total:.1%})</title>'
+                    f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{row_height - 1}" '
+                    f'fill="hsl({hue},80%,60%)"/>'
+                    f'<text x="{x + 3:.1f}" y="{y + row_height - 4}">{text}</text></g>')
+                draw(node["children"], x, level + 1)
+            x += w
+
+    draw(root["children"], 0.0, 0)
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'font-family="monospace" font-size="11">'
+        f'<text x="4" y="{row_height - 4}" font-size="13">{html.escape(title)}, {root["count"]} samples</text>'
+        + "".join(rects) + "</svg>\n")
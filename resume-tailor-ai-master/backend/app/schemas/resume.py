@@ -1,5 +1,7 @@
-from pydantic import BaseModel
-from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional, Union
+
+MAX_JOB_MATCHES = 1000
 
 class ResumeSection(BaseModel):
     section_type: str
@@ -11,6 +13,17 @@ class ResumeUploadResponse(BaseModel):
     sections: List[ResumeSection]
     message: str
 
+class BatchUploadItem(BaseModel):
+    filename: str
+    success: bool
+    sections: List[ResumeSection] = []
+    error: Optional[str] = None
+
+class BatchUploadResponse(BaseModel):
+    success: bool
+    results: List[BatchUploadItem]
+    message: str
+
 class ResumeTailorRequest(BaseModel):
     resume_content: str
     job_description: str
@@ -21,3 +34,24 @@ class ResumeTailorResponse(BaseModel):
     tailored_resume: str
     improvements: Dict[str, str]
     message: str
+
+class JobRankingRequest(BaseModel):
+    resume_content: str
+    job_descriptions: List[str]
+    top_k: Optional[int] = Field(None, ge=1)
+
+class JobPosting(BaseModel):
+    id: str
+    description: str
+    # Flat filterable fields, e.g. {"location": "Berlin", "remote": true}
+    metadata: Dict[str, Union[str, int, float, bool]] = {}
+
+class JobPostingsRequest(BaseModel):
+    jobs: List[JobPosting]
+
+class JobMatchRequest(BaseModel):
+    resume_content: str
+    top_n: int = Field(10, ge=1, le=MAX_JOB_MATCHES)
+    # field -> accepted value or list of accepted values
+    filters: Optional[Dict[str, Union[str, int, float, bool, List[Union[str, int, float, bool]]]]] = None
+    exact: Optional[bool] = None  # force brute force (true) or leave the choice to the index
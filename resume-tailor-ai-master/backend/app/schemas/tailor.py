@@ -1,13 +1,46 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Literal, Optional
 
 
 class TailorRequest(BaseModel):
     resume: str
     job_description: Optional[str] = ""
     model: Optional[str] = "DEEPSEEK_R1_0528"
+    # "full" rewrites the whole document; "sections" rewrites only the most relevant sections
+    mode: Literal["full", "sections"] = "full"
 
 
 class TailorResponse(BaseModel):
     tailored_resume: str
     suggestions: list[str] = []
+
+
+class TailorPair(BaseModel):
+    resume: str
+    job_description: str
+
+
+class BatchTailorRequest(BaseModel):
+    # Either one resume against many job descriptions, or explicit pairs
+    resume: Optional[str] = None
+    job_descriptions: list[str] = []
+    pairs: list[TailorPair] = []
+    model: Optional[str] = "DEEPSEEK_R1_0528"
+    concurrency: Optional[int] = None
+
+
+class BatchTailorResult(BaseModel):
+    index: int
+    status: str  # "completed" or "failed"
+    tailored_resume: Optional[str] = None
+    analysis: Optional[dict] = None
+    error: Optional[str] = None
+
+
+class BatchJobStatus(BaseModel):
+    job_id: str
+    status: str  # "pending", "running", "completed"
+    total: int
+    completed: int = 0
+    failed: int = 0
+    results: list[BatchTailorResult] = []
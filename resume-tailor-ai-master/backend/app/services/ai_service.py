@@ -1,37 +1,229 @@
-from openai import OpenAI
 from app.core.config import settings
+from app.core.executors import io_executor
+from app.core.metrics import llm_request_seconds, llm_ttft_seconds, record_llm_usage, span
 from app.services.rag_service import rag_service
-from typing import Dict
-from app.services.latex_parser import parse_latex_resume
-import uuid
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Tuple
+from app.services.analysis_cache import analysis_cache
+from app.services.llm_cache import llm_cache
+from app.services.prompt_builder import assemble_tailoring_prompt, count_tokens, prompt_stats
+from app.services.model_router import ModelRouter
+from app.services.match_scoring import score_resume_against_job
+from app.utils.latex_utils import new_validation_errors
+from app.utils.single_flight import analyze_flights, flight_key, tailor_flights
+from contextlib import contextmanager
+from functools import lru_cache
 import logging
 import re
+import time
 
 logger = logging.getLogger(__name__)
 
-client = OpenAI(
-    base_url="https://openrouter.ai/api/v1",
-    api_key=settings.openai_api_key,
+
+def _max_retries() -> int:
+    # With routing on, a failed call moves to another model instead of
+    # retrying the same overloaded one
+    return 0 if settings.router_enabled else 2
+
+
+@lru_cache(maxsize=1)
+def get_client():
+    """Shared blocking OpenAI client, created on first use"""
+    from openai import OpenAI
+    return OpenAI(
+        base_url=settings.openai_base_url,
+        api_key=settings.openai_api_key,
+        max_retries=_max_retries(),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_async_client():
+    """
+    Shared async client, created on first use; one pooled HTTP connection
+    pool for all in-flight calls
+    """
+    import httpx
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+    return AsyncOpenAI(
+        base_url=settings.openai_base_url,
+        api_key=settings.openai_api_key,
+        timeout=settings.llm_timeout_seconds,
+        max_retries=_max_retries(),
+        http_client=DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=settings.llm_max_connections,
+                max_keepalive_connections=settings.llm_max_connections,
+            ),
+        ),
+    )
+
+
+async def close_clients() -> None:
+    """Close the async client's connection pool if it was ever created"""
+    if get_async_client.cache_info().currsize:
+        await get_async_client().close()
+
+
+# Friendly keys → provider model ids (extend easily here)
+model_mapping = {
+    "DEEPSEEK_R1_0528": "deepseek/deepseek-r1-0528:free",
+    "DEEPSEEK_V3_0324": "deepseek/deepseek-chat-v3-0324:free",
+    "QWEN3_235B_A22B": "qwen/qwen3-235b-a22b:free",
+    "Z.AI_GLM_4_5_AIR": "z-ai/glm-4.5-air:free",
+    "DeepSeek R1T2": "tngtech/deepseek-r1t2-chimera:free",
+    "MICROSOFT_MAI_DS_R1": "microsoft/mai-ds-r1:free",
+    "MOONSHOTAI_KIMI_VL_A3B_THINKING": "moonshotai/kimi-vl-a3b-thinking:free",
+}
+
+# Routes every tailoring completion, hedging and falling back across the pool
+model_router = ModelRouter(
+    models=settings.router_models or list(model_mapping.values()),
+    hedging=settings.router_hedging,
+    default_delay=settings.router_hedge_delay_seconds,
+    hedge_min=settings.router_hedge_min_seconds,
+    hedge_max=settings.router_hedge_max_seconds,
+    max_attempts=settings.router_max_attempts,
+    window=settings.router_window,
+    failure_threshold=settings.router_breaker_failures,
+    error_rate_threshold=settings.router_breaker_error_rate,
+    cooldown=settings.router_breaker_cooldown_seconds,
 )
 
+SYSTEM_PROMPT = "You are a professional resume writer specializing in LaTeX formatting. Always preserve LaTeX syntax and formatting. Output only the final LaTeX content of the resume without any analysis, commentary, chain-of-thought, or <think>...</think> blocks. Do not use code fences. If you need to include any notes, put them after \\end{document}."
+
+EXTRA_HEADERS = {
+    "X-Title": "Resume Tailor AI",
+}
+
 
+@span("sanitize")
 def sanitize_model_output(text: str) -> str:
     """Remove chain-of-thought and code fences if present, return clean LaTeX."""
     try:
         # Remove <think>...</think>
         text = re.sub(r"<think>[\s\S]*?</think>",
                       "", text, flags=re.IGNORECASE)
-        # Remove surrounding triple backtick fences (optionally with language)
+        # Remove surrounding triple backtick fences (optionally with language);
+        # an unterminated fence means the output was cut off, drop it anyway
+        text = text.lstrip()
         fence_open = re.match(r"^```[a-zA-Z]*\n", text)
         if fence_open:
+            text = text[fence_open.end():]
             closing_index = text.rfind("```")
-            if closing_index > len(fence_open.group(0)):
-                text = text[len(fence_open.group(0)):closing_index]
+            if closing_index != -1:
+                text = text[:closing_index]
         return text.strip()
     except Exception:
         return text
 
 
+def _partial_suffix(text: str, marker: str) -> int:
+    """Length of the longest suffix of `text` that is a proper prefix of `marker`."""
+    for size in range(min(len(text), len(marker) - 1), 0, -1):
+        if marker.startswith(text[-size:]):
+            return size
+    return 0
+
+
+class StreamingSanitizer:
+    """
+    Incremental version of `sanitize_model_output` for streamed completions.
+
+    `feed` returns the text that is safe to emit so far; anything that could
+    still turn out to be part of a <think> block, an opening/closing code
+    fence or trailing whitespace is held back until `finish`. A <think>
+    block that is never closed is ordinary text, as in the batch version,
+    so its content is held too and released by `finish`.
+    """
+
+    def __init__(self):
+        self._pending = ""
+        self._in_think = False
+        self._thought = ""
+        self._started = False
+        self._fenced = False
+        self._body_started = False
+        self._held = ""
+
+    def feed(self, chunk: str) -> str:
+        self._pending += chunk
+        visible = []
+        while self._pending:
+            lowered = self._pending.lower()
+            if self._in_think:
+                end = lowered.find("</think>")
+                if end == -1:
+                    cut = len(self._pending) - _partial_suffix(lowered, "</think>")
+                    self._thought += self._pending[:cut]
+                    self._pending = self._pending[cut:]
+                    break
+                self._pending = self._pending[end + len("</think>"):]
+                self._in_think = False
+                self._thought = ""
+                continue
+            start = lowered.find("<think>")
+            if start == -1:
+                keep = _partial_suffix(lowered, "<think>")
+                cut = len(self._pending) - keep
+                visible.append(self._pending[:cut])
+                self._pending = self._pending[cut:]
+                break
+            visible.append(self._pending[:start])
+            self._thought = self._pending[start:start + len("<think>")]
+            self._pending = self._pending[start + len("<think>"):]
+            self._in_think = True
+        return self._emit("".join(visible), final=False)
+
+    def finish(self) -> str:
+        # A dangling partial "<think" or an unclosed <think> block is ordinary text
+        tail = self._thought + self._pending if self._in_think else self._pending
+        self._pending = self._thought = ""
+        self._in_think = False
+        return self._emit(tail, final=True)
+
+    def _emit(self, text: str, final: bool) -> str:
+        self._held += text
+        if not self._started:
+            self._held = self._held.lstrip()
+            if not self._held:
+                return ""
+            if self._held.startswith("```") or (not final and "```".startswith(self._held)):
+                fence_open = re.match(r"^```[a-zA-Z]*\n", self._held)
+                if fence_open:
+                    self._held = self._held[fence_open.end():]
+                    self._fenced = True
+                elif not final and re.fullmatch(r"`{1,3}[a-zA-Z]*", self._held):
+                    # Still undecided whether this is an opening fence
+                    return ""
+            self._started = True
+        if not self._body_started:
+            # Whitespace right after an opening fence is stripped as well
+            self._held = self._held.lstrip()
+            if not self._held:
+                return ""
+            self._body_started = True
+
+        if final:
+            out = self._held
+            if self._fenced and out.rfind("```") > 0:
+                out = out[:out.rfind("```")]
+            elif self._fenced and out.startswith("```"):
+                out = ""
+            self._held = ""
+            return out.rstrip()
+
+        # Hold back trailing whitespace and anything from a possible closing fence
+        cut = len(self._held.rstrip())
+        if self._fenced:
+            fence = self._held.rfind("```")
+            if fence == -1:
+                fence = len(self._held) - _partial_suffix(self._held, "```")
+            cut = min(cut, len(self._held[:fence].rstrip()))
+        out = self._held[:cut]
+        self._held = self._held[cut:]
+        return out
+
+
 def resolve_provider_model(selected: str, mapping: Dict[str, str]) -> str:
     """Resolve a frontend-provided model to a provider id.
     - If `selected` is already a full provider id (contains a slash), return it
@@ -44,64 +236,185 @@ def resolve_provider_model(selected: str, mapping: Dict[str, str]) -> str:
     return mapping.get(selected, mapping["DEEPSEEK_R1_0528"])
 
 
+def build_tailoring_request(resume: str, job_description: str, model: str | None = "DEEPSEEK_R1_0528") -> Tuple[str, List[Dict[str, str]]]:
+    """
+    Run the RAG steps for a tailoring call and return (provider_model, messages)
+    """
+    # Parse resume sections
+    sections = analysis_cache.resume_sections(resume)
+    section_dicts = [section.dict() for section in sections]
+
+    # Rank sections against the job description in memory
+    relevant_sections = rag_service.rank_sections(
+        section_dicts, job_description)
+
+    # Persisting to the vector DB is opt-in (deduplicated by content hash)
+    if settings.rag_persist:
+        rag_service.persist_request(resume, section_dicts, job_description)
+
+    # Extract job keywords
+    job_keywords = analysis_cache.job_keywords(job_description)
+
+    # Create enhanced prompt with RAG context, within the model's token budget
+    provider_model = resolve_provider_model(model or "", model_mapping)
+    with span("prompt_build"):
+        prompt, report = assemble_tailoring_prompt(
+            resume, job_description, relevant_sections, job_keywords,
+            provider_model, render_tailoring_prompt)
+    prompt_stats.record(report)
+    logger.info(
+        f"Tailoring prompt for {provider_model}: {report.prompt_tokens} tokens "
+        f"(budget {report.budget}, saved {report.tokens_saved}, "
+        f"{report.sections_included} sections)")
+
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+    return provider_model, messages
+
+
+def _cached_tailoring(resume: str, job_description: str, provider_model: str, messages: List[Dict[str, str]]) -> str | None:
+    """
+    Look up a previous completion for this requested model and prompt (or a
+    near-duplicate job); entries are keyed by the requested model even when
+    the router had a fallback model answer, so repeats hit while the
+    primary is failing
+    """
+    return llm_cache.get(provider_model, messages, resume,
+                         lambda: rag_service.embeddings.embed(job_description))
+
+
+def _remember_tailoring(resume: str, job_description: str, provider_model: str, messages: List[Dict[str, str]], tailored_resume: str) -> None:
+    """
+    Cache a completion unless it has validation errors `resume` does not,
+    so a hit never hands back LaTeX that has to be repaired again
+    """
+    if tailored_resume and not new_validation_errors(resume, tailored_resume):
+        llm_cache.put(provider_model, messages, resume,
+                      lambda: rag_service.embeddings.embed(job_description), tailored_resume)
+
+
+def looks_like_latex(text: str) -> bool:
+    """Minimal check that a completion is a LaTeX resume rather than prose"""
+    return bool(text) and ("\\begin{document}" in text or "\\section" in text)
+
+
+@contextmanager
+def _llm_call(model: str):
+    """
+    Time one completion attempt as the `llm` stage and per model; attempts
+    abandoned by the router (lost hedges) or the client count as cancelled
+    """
+    started = time.perf_counter()
+    outcome = "cancelled"
+    try:
+        with span("llm"):
+            yield
+        outcome = "ok"
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        llm_request_seconds.labels(model=model, outcome=outcome).observe(time.perf_counter() - started)
+
+
+def _record_usage(model: str, usage) -> None:
+    if usage is not None:
+        record_llm_usage(model, usage.prompt_tokens, usage.completion_tokens)
+
+
+def complete_tailoring(provider_model: str, messages: List[Dict[str, str]], validate=looks_like_latex) -> Tuple[str, str]:
+    """
+    Blocking completion through the model router; returns the model that
+    answered (a fallback, possibly) and its sanitized text
+    """
+    def call(model: str) -> str:
+        with _llm_call(model):
+            completion = get_client().chat.completions.create(
+                extra_headers=EXTRA_HEADERS,
+                model=model,
+                messages=messages
+            )
+        _record_usage(model, completion.usage)
+        # Sanitize model output to remove any chain-of-thought blocks
+        return sanitize_model_output(completion.choices[0].message.content.strip())
+
+    if not settings.router_enabled:
+        return provider_model, call(provider_model)
+    return model_router.complete_sync(provider_model, call, validate)
+
+
+async def complete_tailoring_async(provider_model: str, messages: List[Dict[str, str]], validate=looks_like_latex) -> Tuple[str, str]:
+    """
+    Async completion through the model router, hedged against a second
+    model when the first is slower than its p95; returns the model that
+    answered and its sanitized text
+    """
+    async def call(model: str) -> str:
+        with _llm_call(model):
+            completion = await get_async_client().chat.completions.create(
+                extra_headers=EXTRA_HEADERS,
+                model=model,
+                messages=messages
+            )
+        _record_usage(model, completion.usage)
+        return sanitize_model_output(completion.choices[0].message.content.strip())
+
+    if not settings.router_enabled:
+        return provider_model, await call(provider_model)
+    return await model_router.complete(provider_model, call, validate)
+
+
 def tailor_resume(resume: str, job_description: str, model: str | None = "DEEPSEEK_R1_0528") -> str:
     """
     Tailor resume using RAG and AI
     """
     try:
-        # Generate unique IDs
-        resume_id = str(uuid.uuid4())
-        job_id = str(uuid.uuid4())
-
-        # Parse resume sections
-        sections = parse_latex_resume(resume)
-
-        # Store resume sections in vector DB
-        section_dicts = [section.dict() for section in sections]
-        rag_service.store_resume_sections(resume_id, section_dicts)
-
-        # Store job description
-        rag_service.store_job_description(job_id, job_description)
-
-        # Find relevant sections
-        relevant_sections = rag_service.find_relevant_sections(
-            job_description, resume_id)
-
-        # Extract job keywords
-        job_keywords = rag_service.extract_job_keywords(job_description)
-
-        # Create enhanced prompt with RAG context
-        prompt = create_tailoring_prompt(
-            resume, job_description, relevant_sections, job_keywords)
-
-        # Generate tailored resume
-        # Friendly keys → provider model ids (extend easily here)
-        model_mapping = {
-            "DEEPSEEK_R1_0528": "deepseek/deepseek-r1-0528:free",
-            "DEEPSEEK_V3_0324": "deepseek/deepseek-chat-v3-0324:free",
-            "QWEN3_235B_A22B": "qwen/qwen3-235b-a22b:free",
-            "Z.AI_GLM_4_5_AIR": "z-ai/glm-4.5-air:free",
-            "DeepSeek R1T2": "tngtech/deepseek-r1t2-chimera:free",
-            "MICROSOFT_MAI_DS_R1": "microsoft/mai-ds-r1:free",
-            "MOONSHOTAI_KIMI_VL_A3B_THINKING": "moonshotai/kimi-vl-a3b-thinking:free",
-        }
-
-        provider_model = resolve_provider_model(model or "", model_mapping)
-
-        completion = client.chat.completions.create(
-            extra_headers={
-                "X-Title": "Resume Tailor AI",
-            },
-            model=provider_model,
-            messages=[
-                {"role": "system", "content": "You are a professional resume writer specializing in LaTeX formatting. Always preserve LaTeX syntax and formatting. Output only the final LaTeX content of the resume without any analysis, commentary, chain-of-thought, or <think>...</think> blocks. Do not use code fences. If you need to include any notes, put them after \\end{document}."},
-                {"role": "user", "content": prompt}
-            ]
-        )
+        provider_model, messages = build_tailoring_request(
+            resume, job_description, model)
 
-        # Sanitize model output to remove any chain-of-thought blocks
-        tailored_resume = sanitize_model_output(
-            completion.choices[0].message.content.strip())
+        cached = _cached_tailoring(resume, job_description, provider_model, messages)
+        if cached is not None:
+            return cached
+
+        def complete() -> str:
+            # Generate tailored resume, falling back to other models on failure;
+            # cached under the requested model, which is what repeats look up
+            _, tailored_resume = complete_tailoring(provider_model, messages)
+            _remember_tailoring(resume, job_description, provider_model, messages, tailored_resume)
+            return tailored_resume
+
+        # Identical requests already in flight share that LLM call
+        return tailor_flights.call(flight_key("full", provider_model, resume, job_description), complete)
+
+    except Exception as e:
+        logger.error(f"Error tailoring resume: {str(e)}")
+        raise
+
+
+async def tailor_resume_async(resume: str, job_description: str, model: str | None = "DEEPSEEK_R1_0528",
+                              finish: Callable[[str], Awaitable[str]] | None = None) -> str:
+    """
+    Asyncio variant of `tailor_resume`: the LLM call runs on the shared async
+    client, so waiting on the provider does not hold a worker thread.
+    `finish` (e.g. a repair step) is applied to a new completion before it
+    is cached, so the finished result is what later hits return
+    """
+    try:
+        provider_model, messages = await io_executor.run(
+            build_tailoring_request, resume, job_description, model)
+
+        cached = await io_executor.run(
+            _cached_tailoring, resume, job_description, provider_model, messages)
+        if cached is not None:
+            return cached
+
+        _, tailored_resume = await complete_tailoring_async(provider_model, messages)
+        if finish is not None:
+            tailored_resume = await finish(tailored_resume)
+        await io_executor.run(
+            _remember_tailoring, resume, job_description, provider_model, messages, tailored_resume)
         return tailored_resume
 
     except Exception as e:
@@ -109,12 +422,99 @@ def tailor_resume(resume: str, job_description: str, model: str | None = "DEEPSE
         raise
 
 
-def create_tailoring_prompt(resume: str, job_description: str, relevant_sections: list, job_keywords: list) -> str:
+async def stream_tailored_resume(resume: str, job_description: str, model: str | None = "DEEPSEEK_R1_0528") -> AsyncIterator[str]:
+    """
+    Stream sanitized LaTeX as the model produces it.
+    Closing the generator early (e.g. client disconnect) closes the upstream stream.
+    A cached result is yielded as a single chunk.
+    """
+    provider_model, messages = await io_executor.run(
+        build_tailoring_request, resume, job_description, model)
+
+    cached = await io_executor.run(
+        _cached_tailoring, resume, job_description, provider_model, messages)
+    if cached is not None:
+        yield cached
+        return
+
+    # A stream cannot be hedged once it has started emitting, so only pick
+    # the preferred model or, if its breaker is open, the fastest healthy one
+    stream_model = provider_model
+    if settings.router_enabled:
+        stream_model = model_router.reserve(provider_model)
+        if stream_model is None:
+            raise RuntimeError("No model available: every circuit breaker is open")
+    started = time.monotonic()
+    # Left as None when the client goes away mid-stream: that says nothing about the model
+    latency, ok = None, False
+    sanitizer = StreamingSanitizer()
+    parts = []
+    usage = None
+    first_token = True
+    try:
+        with _llm_call(stream_model):
+            stream = await get_async_client().chat.completions.create(
+                extra_headers=EXTRA_HEADERS,
+                model=stream_model,
+                messages=messages,
+                stream=True
+            )
+            try:
+                async for chunk in stream:
+                    # Providers that report usage do so on a final, choice-less chunk
+                    usage = getattr(chunk, "usage", None) or usage
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        if first_token:
+                            first_token = False
+                            llm_ttft_seconds.labels(model=stream_model).observe(time.monotonic() - started)
+                        text = sanitizer.feed(delta)
+                        if text:
+                            parts.append(text)
+                            yield text
+                tail = sanitizer.finish()
+                if tail:
+                    parts.append(tail)
+                    yield tail
+            finally:
+                await stream.close()
+        latency, ok = time.monotonic() - started, True
+    except Exception:
+        latency = time.monotonic() - started
+        raise
+    finally:
+        if settings.router_enabled:
+            model_router.release(stream_model, latency, ok)
+    if usage is not None:
+        _record_usage(stream_model, usage)
+    else:
+        record_llm_usage(stream_model, sum(count_tokens(m["content"]) for m in messages),
+                         count_tokens("".join(parts)))
+
+    # Only reached when the stream completed without the client going away
+    await io_executor.run(
+        _remember_tailoring, resume, job_description, provider_model, messages, "".join(parts))
+
+
+def create_tailoring_prompt(resume: str, job_description: str, relevant_sections: list, job_keywords: list, model: str | None = "DEEPSEEK_R1_0528") -> str:
+    """
+    Create a comprehensive prompt for resume tailoring, trimmed to the
+    token budget of `model`
+    """
+    provider_model = resolve_provider_model(model or "", model_mapping)
+    prompt, _ = assemble_tailoring_prompt(
+        resume, job_description, relevant_sections, job_keywords,
+        provider_model, render_tailoring_prompt)
+    return prompt
+
+
+def render_tailoring_prompt(resume: str, job_description: str, relevant_context: List[str], job_keywords: list) -> str:
     """
-    Create a comprehensive prompt for resume tailoring
+    Fill the tailoring template with already-selected context lines
     """
-    relevant_context = "\n".join(
-        [f"- {section['section_type']}: {section['content'][:200]}..." for section in relevant_sections[:3]])
+    relevant_context = "\n".join(relevant_context)
 
     prompt = f"""
 You are a professional resume writer. Tailor the following LaTeX resume to better match the job description.
@@ -146,38 +546,35 @@ TAILORED RESUME:
 
 def analyze_resume_job_match(resume: str, job_description: str) -> dict:
     """
-    Analyze how well resume matches job description
+    Analyze how well resume matches job description: keyword overlap plus
+    per-requirement semantic/TF-IDF coverage (see match_scoring)
     """
     try:
-        # Extract keywords from both
-        resume_sections = parse_latex_resume(resume)
-        job_keywords = rag_service.extract_job_keywords(job_description)
-
-        # Count keyword matches
-        resume_keywords = []
-        for section in resume_sections:
-            resume_keywords.extend(section.keywords)
-
-        resume_keywords = [kw.lower() for kw in resume_keywords]
-        job_keywords = [kw.lower() for kw in job_keywords]
-
-        matches = set(resume_keywords) & set(job_keywords)
-        match_percentage = len(matches) / \
-            len(job_keywords) * 100 if job_keywords else 0
-
-        return {
-            "match_percentage": match_percentage,
-            "matching_keywords": list(matches),
-            "missing_keywords": [kw for kw in job_keywords if kw not in resume_keywords],
-            "suggested_improvements": generate_improvement_suggestions(matches, job_keywords)
-        }
+        result = score_resume_against_job(resume, job_description)
+        uncovered = [item["requirement"] for item in result["requirement_coverage"] if not item["covered"]]
+        result["suggested_improvements"] = generate_improvement_suggestions(
+            set(result["matching_keywords"]),
+            result["matching_keywords"] + result["missing_keywords"],
+            uncovered)
+        return result
 
     except Exception as e:
         logger.error(f"Error analyzing resume-job match: {str(e)}")
         return {"error": "Failed to analyze match"}
 
 
-def generate_improvement_suggestions(matches: set, job_keywords: list) -> list:
+async def analyze_resume_job_match_async(resume: str, job_description: str) -> dict:
+    """
+    `analyze_resume_job_match` on the I/O pool, which embeds there and hands
+    the scoring to the CPU pool; concurrent calls for the same pair share
+    one run, so callers must treat the result as read-only
+    """
+    return await analyze_flights.run(
+        flight_key(resume, job_description),
+        lambda: io_executor.run(analyze_resume_job_match, resume, job_description))
+
+
+def generate_improvement_suggestions(matches: set, job_keywords: list, uncovered_requirements: list | None = None) -> list:
     """
     Generate specific improvement suggestions
     """
@@ -188,6 +585,10 @@ def generate_improvement_suggestions(matches: set, job_keywords: list) -> list:
         suggestions.append(
             f"Add these keywords to your resume: {', '.join(missing[:5])}")
 
+    if uncovered_requirements:
+        suggestions.append(
+            f"Show evidence for: {'; '.join(uncovered_requirements[:2])}")
+
     if len(matches) < len(job_keywords) * 0.5:
         suggestions.append(
             "Consider adding more relevant experience or skills")
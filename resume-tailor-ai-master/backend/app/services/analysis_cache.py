@@ -0,0 +1,74 @@
+import hashlib
+import logging
+from typing import Dict, List
+
+from app.core.config import settings
+from app.core.executors import cpu_executor
+from app.core.metrics import span
+from app.schemas.resume import ResumeSection
+from app.services.keyword_matcher import find_skills
+from app.services.latex_parser import parse_latex_resume
+from app.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+def _content_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _analyze(stage: str, fn, text: str):
+    # Timed here: spans recorded inside a pool process never reach this one
+    with span(stage):
+        return cpu_executor.call(fn, text)
+
+
+class DocumentAnalysisCache:
+    """
+    Memoizes per-document analysis by content hash.
+
+    A resume is parsed once (sections plus their extracted keywords) and a
+    job description has its keywords extracted once, no matter how many
+    endpoints or service functions ask for them within the TTL. Misses are
+    computed on the CPU process pool, so call these from a worker thread,
+    never directly on the event loop. Cached values are shared, so callers
+    must treat them as read-only.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.resumes = TTLCache(max_entries, ttl)
+        self.jobs = TTLCache(max_entries, ttl)
+
+    def resume_sections(self, resume: str) -> List[ResumeSection]:
+        """Parsed sections of `resume`, as returned by parse_latex_resume."""
+        sections = self.resumes.get_or_compute(
+            _content_key(resume), lambda: _analyze("parse_resume", parse_latex_resume, resume))
+        return list(sections)
+
+    def resume_keywords(self, resume: str) -> List[str]:
+        """All section keywords of `resume`, in section order."""
+        keywords = []
+        for section in self.resume_sections(resume):
+            keywords.extend(section.keywords)
+        return keywords
+
+    def job_keywords(self, job_description: str) -> List[str]:
+        """Keywords of `job_description`, as returned by extract_job_keywords."""
+        keywords = self.jobs.get_or_compute(
+            _content_key(job_description),
+            lambda: _analyze("extract_job_keywords", find_skills, job_description))
+        return list(keywords)
+
+    def clear(self) -> None:
+        self.resumes.clear()
+        self.jobs.clear()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {"resumes": self.resumes.stats(), "jobs": self.jobs.stats()}
+
+
+# Global analysis cache instance
+analysis_cache = DocumentAnalysisCache(
+    max_entries=settings.analysis_cache_max_entries,
+    ttl=settings.analysis_cache_ttl_seconds,
+)
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from app.core.admission import admission_controller
+from app.core.config import settings
+from app.core.executors import io_executor
+from app.schemas.tailor import BatchJobStatus, BatchTailorRequest, BatchTailorResult
+from app.services.ai_service import analyze_resume_job_match_async
+from app.services.analysis_cache import analysis_cache
+from app.services.rag_service import rag_service
+from app.services.section_tailoring import tailor_resume_checked_async
+from app.utils.single_flight import flight_key, tailor_flights
+
+logger = logging.getLogger(__name__)
+
+
+class BatchJob:
+    """State of one batch tailoring job; progress changes notify `changed`."""
+
+    def __init__(self, items: List[Tuple[str, str]], model: Optional[str], concurrency: int,
+                 client: Optional[str] = None):
+        self.job_id = str(uuid.uuid4())
+        self.items = items
+        self.model = model
+        self.concurrency = concurrency
+        self.client = client  # charged for every item by admission control; None: not admission-controlled
+        self.status = "pending"
+        self.results: Dict[int, BatchTailorResult] = {}
+        self.finished_at: Optional[float] = None
+        self.changed = asyncio.Condition()
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status == "completed"
+
+    def snapshot(self) -> BatchJobStatus:
+        """Current status with every finished result so far."""
+        results = sorted(self.results.values(), key=lambda r: r.index)
+        return BatchJobStatus(
+            job_id=self.job_id,
+            status=self.status,
+            total=len(self.items),
+            completed=sum(1 for r in results if r.status == "completed"),
+            failed=sum(1 for r in results if r.status == "failed"),
+            results=results,
+        )
+
+    async def notify(self) -> None:
+        async with self.changed:
+            self.changed.notify_all()
+
+
+def _expand_items(request: BatchTailorRequest) -> List[Tuple[str, str]]:
+    items = [(pair.resume, pair.job_description) for pair in request.pairs]
+    if request.resume is not None:
+        items.extend((request.resume, job) for job in request.job_descriptions)
+    return items
+
+
+def _prepare_shared_work(items: List[Tuple[str, str]]) -> None:
+    """
+    Parse each distinct resume once and embed every section and job
+    description in a single batch, so the per-item tailoring calls that
+    follow are served from the analysis and embedding caches.
+    """
+    texts: Dict[str, None] = {}
+    for resume in dict.fromkeys(resume for resume, _ in items):
+        for section in analysis_cache.resume_sections(resume):
+            texts.setdefault(section.content)
+    for _, job_description in items:
+        analysis_cache.job_keywords(job_description)
+        texts.setdefault(job_description)
+    if texts:
+        rag_service.embed_texts(list(texts))
+
+
+class BatchJobManager:
+    """In-process registry of batch jobs, dropped `ttl` seconds after they finish."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._jobs: Dict[str, BatchJob] = {}
+
+    def submit(self, request: BatchTailorRequest, client: Optional[str] = None) -> BatchJob:
+        items = _expand_items(request)
+        if not items:
+            raise ValueError("Provide a resume with job_descriptions, or pairs.")
+        if len(items) > settings.batch_max_items:
+            raise ValueError(f"A batch may contain at most {settings.batch_max_items} items.")
+
+        concurrency = min(request.concurrency or settings.batch_concurrency,
+                          settings.batch_max_concurrency)
+        job = BatchJob(items, request.model, max(1, concurrency), client)
+        self._expire()
+        self._jobs[job.job_id] = job
+        job.task = asyncio.create_task(self._run(job))
+        return job
+
+    def get(self, job_id: str) -> Optional[BatchJob]:
+        self._expire()
+        return self._jobs.get(job_id)
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at is not None and now - job.finished_at > self.ttl:
+                del self._jobs[job_id]
+
+    async def _run(self, job: BatchJob) -> None:
+        job.status = "running"
+        await job.notify()
+        try:
+            await io_executor.run(_prepare_shared_work, job.items)
+        except Exception as e:
+            # Not fatal: each item falls back to doing its own parse/embedding
+            logger.error(f"Error preparing batch {job.job_id}: {str(e)}")
+
+        semaphore = asyncio.Semaphore(job.concurrency)
+
+        async def run_item(index: int, resume: str, job_description: str) -> None:
+            async with semaphore:
+                units = 0
+                try:
+                    if job.client is not None:
+                        # Each item is a tailoring request of the submitting client:
+                        # it waits for that client's rate and a share of capacity
+                        units = await admission_controller.admit_background(job.client, "expensive")
+                    # Same key as a "full" request to POST /tailor, so the two coalesce
+                    tailored = await tailor_flights.run(
+                        flight_key("full", job.model, resume, job_description),
+                        lambda: tailor_resume_checked_async(resume, job_description, job.model))
+                    analysis = await analyze_resume_job_match_async(resume, job_description)
+                    result = BatchTailorResult(
+                        index=index, status="completed",
+                        tailored_resume=tailored, analysis=analysis)
+                except Exception as e:
+                    logger.error(f"Batch {job.job_id} item {index} failed: {str(e)}")
+                    result = BatchTailorResult(
+                        index=index, status="failed", error="Failed to tailor resume.")
+                finally:
+                    if units:
+                        admission_controller.release(units)
+            job.results[index] = result
+            await job.notify()
+
+        await asyncio.gather(*(
+            run_item(i, resume, job_description)
+            for i, (resume, job_description) in enumerate(job.items)))
+        job.status = "completed"
+        job.finished_at = time.monotonic()
+        await job.notify()
+        logger.info(f"Batch {job.job_id} finished {len(job.items)} items")
+
+
+# Global batch job manager
+batch_manager = BatchJobManager(ttl=settings.batch_job_ttl_seconds)
@@ -0,0 +1,190 @@
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def text_hash(text: str) -> str:
+    """Stable key for an input text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize each row so dot products are cosine similarities."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def cosine_top_k(matrix: np.ndarray, query: np.ndarray, k: int):
+    """
+    Indices and cosine scores of the `k` rows of `matrix` closest to `query`,
+    best first. Both inputs are normalized here.
+    """
+    if len(matrix) == 0 or k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    scores = normalize_rows(matrix) @ normalize_rows(query)
+    k = min(k, len(scores))
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top])]
+    return top, scores[top]
+
+
+class DiskEmbeddingStore:
+    """
+    Append-only on-disk vector store.
+
+    Vectors live in a raw float32 file read through `np.memmap`; the index
+    file holds one text hash per line, so line N names row N. A crash
+    between the two appends is tolerated by trusting only the rows present
+    in both files.
+    """
+
+    def __init__(self, path: str, dim: int):
+        self.dim = dim
+        self.root = Path(path)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = self.root / "embeddings.f32"
+        self.index_path = self.root / "embeddings.idx"
+
+        self._rows: Dict[str, int] = {}
+        self._mmap: Optional[np.memmap] = None
+        self._load()
+
+    def _load(self) -> None:
+        hashes = []
+        if self.index_path.exists():
+            hashes = self.index_path.read_text(encoding="utf-8").split()
+        row_bytes = self.dim * 4
+        stored_rows = self.vectors_path.stat().st_size // row_bytes if self.vectors_path.exists() else 0
+        count = min(len(hashes), stored_rows)
+
+        # Drop any torn tail so both files agree again
+        if count != len(hashes):
+            self.index_path.write_text("".join(f"{h}\n" for h in hashes[:count]), encoding="utf-8")
+        if self.vectors_path.exists() and count * row_bytes != self.vectors_path.stat().st_size:
+            os.truncate(self.vectors_path, count * row_bytes)
+
+        self._rows = {h: i for i, h in enumerate(hashes[:count])}
+
+    def _view(self) -> np.memmap:
+        if self._mmap is None or self._mmap.shape[0] != len(self._rows):
+            self._mmap = np.memmap(self.vectors_path, dtype=np.float32, mode="r",
+                                   shape=(len(self._rows), self.dim))
+        return self._mmap
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        row = self._rows.get(key)
+        if row is None:
+            return None
+        return np.array(self._view()[row])
+
+    def add(self, keys: List[str], vectors: np.ndarray) -> None:
+        new = [(k, v) for k, v in zip(keys, vectors) if k not in self._rows]
+        if not new:
+            return
+        block = np.asarray([v for _, v in new], dtype=np.float32)
+        with open(self.vectors_path, "ab") as fh:
+            fh.write(block.tobytes())
+        with open(self.index_path, "a", encoding="utf-8") as fh:
+            fh.write("".join(f"{k}\n" for k, _ in new))
+        for k, _ in new:
+            self._rows[k] = len(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+class EmbeddingService:
+    """
+    Batched, memoized sentence embeddings.
+
+    All cache misses in a call are encoded with a single
+    `SentenceTransformer.encode` call. Vectors are kept in a bounded LRU
+    keyed by text hash and, when `store_path` is set, persisted to a
+    DiskEmbeddingStore so repeat documents survive restarts.
+    """
+
+    def __init__(self, model, cache_size: int = 4096, store_path: str = "", batch_size: int = 32):
+        self.model = model
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self.dim = model.get_sentence_embedding_dimension()
+
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "encode_calls": 0}
+
+        self.store: Optional[DiskEmbeddingStore] = None
+        if store_path:
+            try:
+                self.store = DiskEmbeddingStore(store_path, self.dim)
+            except OSError as e:
+                logger.error(f"Error opening embedding store: {str(e)}")
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self._cache[key] = vector
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def embed_many(self, texts: List[str]) -> np.ndarray:
+        """Return a (len(texts), dim) float32 array, encoding only unseen texts."""
+        keys = [text_hash(t) for t in texts]
+        result = np.zeros((len(texts), self.dim), dtype=np.float32)
+        missing: Dict[str, List[int]] = {}
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._cache.get(key)
+                if vector is not None:
+                    self._cache.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                elif self.store is not None and (vector := self.store.get(key)) is not None:
+                    self._remember(key, vector)
+                    self._stats["disk_hits"] += 1
+                if vector is not None:
+                    result[i] = vector
+                else:
+                    missing.setdefault(key, []).append(i)
+
+        if missing:
+            # One batched forward pass for every distinct unseen text
+            batch_keys = list(missing)
+            batch_texts = [texts[missing[k][0]] for k in batch_keys]
+            encoded = np.asarray(
+                self.model.encode(batch_texts, batch_size=self.batch_size, convert_to_numpy=True),
+                dtype=np.float32,
+            )
+            with self._lock:
+                self._stats["encode_calls"] += 1
+                self._stats["misses"] += len(batch_keys)
+                for key, vector in zip(batch_keys, encoded):
+                    self._remember(key, vector)
+                    for i in missing[key]:
+                        result[i] = vector
+                if self.store is not None:
+                    try:
+                        self.store.add(batch_keys, encoded)
+                    except OSError as e:
+                        logger.error(f"Error persisting embeddings: {str(e)}")
+
+        return result
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.embed_many([text])[0]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                **self._stats,
+                "cached": len(self._cache),
+                "stored": len(self.store) if self.store is not None else 0,
+            }
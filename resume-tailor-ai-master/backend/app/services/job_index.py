@@ -0,0 +1,360 @@
+import json
+import logging
+import math
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.embedding_service import normalize_rows
+
+logger = logging.getLogger(__name__)
+
+Metadata = Dict[str, object]
+
+
+def kmeans(vectors: np.ndarray, k: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """Spherical k-means on unit vectors; returns (k, dim) unit centroids."""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), size=k, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = assign_to_centroids(vectors, centroids)
+        order = np.argsort(assignment, kind="stable")
+        counts = np.bincount(assignment, minlength=k)
+        empty = counts == 0
+        sums = np.zeros_like(centroids)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        sums[~empty] = np.add.reduceat(vectors[order], starts[~empty], axis=0)
+        # Re-seed empty clusters from random points so every list stays useful
+        sums[empty] = vectors[rng.choice(len(vectors), size=int(empty.sum()))]
+        centroids = normalize_rows(sums)
+    return centroids
+
+
+def assign_to_centroids(vectors: np.ndarray, centroids: np.ndarray, chunk: int = 65536) -> np.ndarray:
+    """Index of the closest centroid for every row, computed in chunks."""
+    out = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), chunk):
+        block = np.asarray(vectors[start:start + chunk], dtype=np.float32)
+        out[start:start + chunk] = (block @ centroids.T).argmax(axis=1)
+    return out
+
+
+class IVFIndex:
+    """
+    Inverted-file approximate index: rows are bucketed by their nearest
+    k-means centroid and a query only scores the rows in its `nprobe`
+    closest buckets.
+    """
+
+    def __init__(self, centroids: np.ndarray, assignment: np.ndarray):
+        self.centroids = centroids
+        self.trained_rows = len(assignment)
+        order = np.argsort(assignment, kind="stable")
+        bounds = np.searchsorted(assignment[order], np.arange(len(centroids) + 1))
+        self.lists: List[List[int]] = [order[bounds[i]:bounds[i + 1]].tolist() for i in range(len(centroids))]
+        self._arrays: Dict[int, np.ndarray] = {}
+
+    @classmethod
+    def train(cls, vectors: np.ndarray, nlist: int, sample_size: int, seed: int = 0) -> "IVFIndex":
+        rng = np.random.default_rng(seed)
+        sample_rows = np.sort(rng.choice(len(vectors), size=min(sample_size, len(vectors)), replace=False))
+        sample = np.asarray(vectors[sample_rows], dtype=np.float32)
+        centroids = kmeans(sample, min(nlist, len(sample)), seed=seed)
+        return cls(centroids, assign_to_centroids(vectors, centroids))
+
+    def add(self, rows: Iterable[int], vectors: np.ndarray) -> None:
+        for row, bucket in zip(rows, assign_to_centroids(vectors, self.centroids)):
+            self.lists[bucket].append(int(row))
+            self._arrays.pop(int(bucket), None)
+
+    def candidates(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        scores = self.centroids @ query
+        nprobe = min(nprobe, len(scores))
+        probe = np.argpartition(-scores, nprobe - 1)[:nprobe]
+        arrays = []
+        for bucket in probe:
+            array = self._arrays.get(int(bucket))
+            if array is None:
+                array = self._arrays[int(bucket)] = np.asarray(self.lists[bucket], dtype=np.int64)
+            arrays.append(array)
+        return np.concatenate(arrays) if arrays else np.empty(0, dtype=np.int64)
+
+
+class JobIndex:
+    """
+    Persistent vector index of job postings.
+
+    Unit-normalized float32 vectors are appended to `vectors.f32` and read
+    through `np.memmap`; `meta.jsonl` holds one record per row (id plus
+    metadata) and `deleted.txt` the rows deleted since. Re-inserting an id
+    supersedes its earlier row; `compact` drops dead rows from disk.
+    Metadata filters use an inverted index of (field, value) -> rows.
+
+    Search is exact brute force below `approx_threshold` live rows and an
+    IVF index above it, built lazily and rebuilt once the collection has
+    doubled since training; inserts after training go straight into their
+    bucket, deletes are masked out at query time.
+    """
+
+    def __init__(self, path: str, dim: int, approx_threshold: int = 20000, nprobe: int = 16):
+        self.root = Path(path)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.dim = dim
+        self.approx_threshold = approx_threshold
+        self.nprobe = nprobe
+        self.vectors_path = self.root / "vectors.f32"
+        self.meta_path = self.root / "meta.jsonl"
+        self.deleted_path = self.root / "deleted.txt"
+
+        self._lock = threading.RLock()
+        self._ids: List[str] = []
+        self._meta: List[Metadata] = []
+        self._row_of: Dict[str, int] = {}
+        self._alive = np.zeros(0, dtype=bool)
+        self._postings: Dict[Tuple[str, object], List[int]] = {}
+        self._mmap: Optional[np.memmap] = None
+        self._ivf: Optional[IVFIndex] = None
+        self._load()
+
+    # -- persistence -------------------------------------------------------
+
+    def _load(self) -> None:
+        records = []
+        torn = False
+        if self.meta_path.exists():
+            with open(self.meta_path, encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        torn = True  # torn final line
+                        break
+        row_bytes = self.dim * 4
+        stored_rows = self.vectors_path.stat().st_size // row_bytes if self.vectors_path.exists() else 0
+        count = min(len(records), stored_rows)
+
+        # Drop any torn tail so both files agree again
+        if torn or count != len(records):
+            with open(self.meta_path, "w", encoding="utf-8") as fh:
+                fh.writelines(json.dumps(r) + "\n" for r in records[:count])
+        if self.vectors_path.exists() and count * row_bytes != self.vectors_path.stat().st_size:
+            os.truncate(self.vectors_path, count * row_bytes)
+
+        self._alive = np.zeros(count, dtype=bool)
+        for record in records[:count]:
+            self._append_row(record["id"], record.get("metadata", {}))
+
+        if self.deleted_path.exists():
+            for token in self.deleted_path.read_text(encoding="utf-8").split():
+                row = int(token)
+                if row < count:
+                    self._alive[row] = False
+                    if self._row_of.get(self._ids[row]) == row:
+                        del self._row_of[self._ids[row]]
+        self._mmap = None
+
+    def _append_row(self, job_id: str, metadata: Metadata) -> int:
+        row = len(self._ids)
+        previous = self._row_of.get(job_id)
+        if previous is not None:
+            self._alive[previous] = False
+        self._ids.append(job_id)
+        self._meta.append(metadata)
+        self._row_of[job_id] = row
+        if row >= len(self._alive):
+            self._alive = np.concatenate([self._alive, np.zeros(max(1024, row), dtype=bool)])
+        self._alive[row] = True
+        for field, value in metadata.items():
+            if isinstance(value, (str, int, float, bool)):
+                self._postings.setdefault((field, value), []).append(row)
+        return row
+
+    def _vectors(self) -> np.ndarray:
+        rows = len(self._ids)
+        if rows == 0:
+            return np.empty((0, self.dim), dtype=np.float32)
+        if self._mmap is None or self._mmap.shape[0] != rows:
+            self._mmap = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+        return self._mmap
+
+    # -- mutation ----------------------------------------------------------
+
+    def upsert(self, ids: List[str], vectors: np.ndarray, metadatas: Optional[List[Metadata]] = None) -> None:
+        """Insert or replace jobs; `vectors` is (len(ids), dim) and is normalized here."""
+        if not ids:
+            return
+        vectors = normalize_rows(np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.dim))
+        metadatas = metadatas or [{} for _ in ids]
+        with self._lock:
+            with open(self.vectors_path, "ab") as fh:
+                fh.write(vectors.tobytes())
+            with open(self.meta_path, "a", encoding="utf-8") as fh:
+                fh.writelines(json.dumps({"id": job_id, "metadata": meta}) + "\n"
+                              for job_id, meta in zip(ids, metadatas))
+            rows = [self._append_row(job_id, meta) for job_id, meta in zip(ids, metadatas)]
+            self._mmap = None
+            if self._ivf is not None:
+                self._ivf.add(rows, vectors)
+
+    def delete(self, ids: List[str]) -> int:
+        """Remove jobs by id; returns how many existed."""
+        with self._lock:
+            rows = [self._row_of.pop(job_id) for job_id in ids if job_id in self._row_of]
+            if not rows:
+                return 0
+            self._alive[rows] = False
+            with open(self.deleted_path, "a", encoding="utf-8") as fh:
+                fh.writelines(f"{row}\n" for row in rows)
+            return len(rows)
+
+    def compact(self) -> None:
+        """Rewrite the files without deleted or replaced rows."""
+        with self._lock:
+            live = np.flatnonzero(self._alive[:len(self._ids)])
+            vectors = np.array(self._vectors()[live]) if len(live) else np.empty((0, self.dim), np.float32)
+            records = [{"id": self._ids[r], "metadata": self._meta[r]} for r in live]
+            tmp_vectors = self.vectors_path.with_suffix(".tmp")
+            tmp_meta = self.meta_path.with_suffix(".tmp")
+            tmp_vectors.write_bytes(vectors.tobytes())
+            with open(tmp_meta, "w", encoding="utf-8") as fh:
+                fh.writelines(json.dumps(r) + "\n" for r in records)
+            self._mmap = None
+            os.replace(tmp_vectors, self.vectors_path)
+            os.replace(tmp_meta, self.meta_path)
+            self.deleted_path.unlink(missing_ok=True)
+
+            self._ids, self._meta, self._row_of, self._postings = [], [], {}, {}
+            self._alive = np.zeros(len(records), dtype=bool)
+            for record in records:
+                self._append_row(record["id"], record["metadata"])
+            self._ivf = None
+
+    # -- search ------------------------------------------------------------
+
+    def _filter_mask(self, filters: Optional[Dict[str, object]]) -> np.ndarray:
+        """
+        Live rows matching every filter; a filter value is one value or a
+        list of accepted values.
+        """
+        mask = self._alive[:len(self._ids)].copy()
+        for field, accepted in (filters or {}).items():
+            values = accepted if isinstance(accepted, (list, tuple, set)) else [accepted]
+            field_mask = np.zeros(len(mask), dtype=bool)
+            for value in values:
+                field_mask[self._postings.get((field, value), [])] = True
+            mask &= field_mask
+        return mask
+
+    def _ensure_ivf(self, live: int) -> Optional[IVFIndex]:
+        if live < self.approx_threshold:
+            return None
+        rows = len(self._ids)
+        if self._ivf is None or rows > 2 * self._ivf.trained_rows:
+            nlist = max(16, int(4 * math.sqrt(live)))
+            self._ivf = IVFIndex.train(self._vectors(), nlist=nlist, sample_size=nlist * 32)
+            logger.info(f"Trained job IVF index: {nlist} lists over {rows} rows")
+        return self._ivf
+
+    def search(self, query: np.ndarray, top_k: int = 10, filters: Optional[Dict[str, object]] = None,
+               exact: Optional[bool] = None) -> List[Dict[str, object]]:
+        """
+        Best `top_k` live jobs by cosine similarity to `query`, best first.
+        `exact=None` picks brute force or IVF by collection size.
+        """
+        if top_k < 1:
+            raise ValueError(f"top_k must be at least 1, got {top_k}")
+        query = normalize_rows(np.asarray(query, dtype=np.float32).reshape(self.dim))
+        with self._lock:
+            mask = self._filter_mask(filters)
+            live = int(self._alive[:len(self._ids)].sum())
+            ivf = None if exact else self._ensure_ivf(live)
+            vectors = self._vectors()
+            ids, meta = self._ids, self._meta
+
+            if ivf is not None:
+                candidates = ivf.candidates(query, self.nprobe)
+                candidates = candidates[mask[candidates]]
+            elif filters:
+                candidates = np.flatnonzero(mask)
+            else:
+                candidates = None  # every live row: score the whole matrix
+
+        if candidates is None:
+            scores = np.asarray(vectors @ query)
+            scores[~mask] = -np.inf
+            rows = np.arange(len(scores))
+        else:
+            candidates = np.sort(candidates)  # sequential reads from the memmap
+            scores = np.asarray(vectors[candidates] @ query) if len(candidates) else np.empty(0, np.float32)
+            rows = candidates
+
+        k = min(top_k, int(np.isfinite(scores).sum()))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [{"id": ids[rows[i]], "score": float(scores[i]), "metadata": meta[rows[i]]} for i in top]
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            live = int(self._alive[:len(self._ids)].sum())
+            return {
+                "jobs": live,
+                "rows": len(self._ids),
+                "deleted_rows": len(self._ids) - live,
+                "dim": self.dim,
+                "bytes": self.vectors_path.stat().st_size if self.vectors_path.exists() else 0,
+                "ivf_lists": len(self._ivf.centroids) if self._ivf is not None else 0,
+                "mode": "ivf" if live >= self.approx_threshold else "exact",
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._alive[:len(self._ids)].sum())
+
+
+_job_index: Optional[JobIndex] = None
+_job_index_lock = threading.Lock()
+
+
+def get_job_index() -> JobIndex:
+    """Shared job index, opened on first use with the embedding model's dimension."""
+    global _job_index
+    if _job_index is None:
+        with _job_index_lock:
+            if _job_index is None:
+                from app.services.rag_service import rag_service
+                _job_index = JobIndex(
+                    settings.job_index_path,
+                    dim=rag_service.embeddings.dim,
+                    approx_threshold=settings.job_index_approx_threshold,
+                    nprobe=settings.job_index_nprobe,
+                )
+    return _job_index
+
+
+def resume_query_vector(resume: str) -> np.ndarray:
+    """
+    Query vector for a resume: the mean of its unit section embeddings, so
+    every section counts rather than only the text that fits the model's
+    input window.
+    """
+    from app.services.analysis_cache import analysis_cache
+    from app.services.rag_service import rag_service
+
+    texts = [section.content for section in analysis_cache.resume_sections(resume)] or [resume]
+    return normalize_rows(normalize_rows(rag_service.embeddings.embed_many(texts)).mean(axis=0))
+
+
+def index_jobs(jobs: List[Tuple[str, str, Metadata]]) -> None:
+    """Embed (id, description, metadata) postings in one batch and upsert them."""
+    from app.services.rag_service import rag_service
+
+    if not jobs:
+        return
+    vectors = rag_service.embeddings.embed_many([description for _, description, _ in jobs])
+    get_job_index().upsert([job_id for job_id, _, _ in jobs], vectors, [meta for _, _, meta in jobs])
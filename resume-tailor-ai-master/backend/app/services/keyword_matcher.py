@@ -0,0 +1,149 @@
+import logging
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Tokens keep the punctuation that is part of skill names (c++, c#, node.js);
+# "/" and "&" are standalone tokens so "ci/cd" and "r&d" can be matched too.
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*|[/&]")
+
+_TERMINAL = "$"
+
+# canonical name -> aliases; canonical names keep their display casing
+DEFAULT_SKILLS: Dict[str, List[str]] = {
+    "Python": [],
+    "JavaScript": [],
+    "Java": [],
+    "C++": [],
+    "SQL": [],
+    "React": ["reactjs", "react.js"],
+    "Node.js": ["nodejs", "node js"],
+    "AWS": ["amazon web services"],
+    "Docker": [],
+    "Kubernetes": ["k8s"],
+    "Git": [],
+    "MongoDB": ["mongo"],
+    "PostgreSQL": ["postgres"],
+    "Machine Learning": ["ml"],
+    "AI": ["artificial intelligence"],
+    "Data Science": [],
+    "Web Development": [],
+    "Agile": [],
+    "Scrum": [],
+    "DevOps": [],
+    "CI/CD": ["cicd", "ci cd"],
+    "REST API": ["rest apis", "restful api", "restful apis"],
+    "GraphQL": [],
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens used by both the vocabulary and the scanned text."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class KeywordMatcher:
+    """
+    Precompiled multi-term matcher over a token trie.
+
+    Every alias is tokenized once at build time into a trie whose leaves
+    hold the canonical skill. Matching tokenizes the text once and walks the
+    trie from each token, taking the longest match and skipping past it, so
+    a scan is linear in the text length (times the longest term in tokens)
+    and independent of vocabulary size. Matches always fall on word
+    boundaries: "java" never matches inside "javascript".
+    """
+
+    def __init__(self, skills: Dict[str, Iterable[str]]):
+        self._root: Dict = {}
+        self.max_terms = 0
+        self.canonical_names: List[str] = []
+        for canonical, aliases in skills.items():
+            self.canonical_names.append(canonical)
+            for alias in [canonical, *aliases]:
+                self._add(alias, canonical)
+
+    def _add(self, term: str, canonical: str) -> None:
+        tokens = tokenize(term)
+        if not tokens:
+            return
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node[_TERMINAL] = canonical
+        self.max_terms = max(self.max_terms, len(tokens))
+
+    def __len__(self) -> int:
+        return len(self.canonical_names)
+
+    def find_all(self, text: str) -> List[str]:
+        """Canonical skills found in `text`, in order of first occurrence, without duplicates."""
+        tokens = tokenize(text)
+        root = self._root
+        found: Dict[str, None] = {}
+        i = 0
+        n = len(tokens)
+        while i < n:
+            node = root.get(tokens[i])
+            if node is None:
+                i += 1
+                continue
+            match = node.get(_TERMINAL)
+            match_end = i + 1
+            j = i + 1
+            while j < n:
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+                if _TERMINAL in node:
+                    match = node[_TERMINAL]
+                    match_end = j
+            if match is not None:
+                found.setdefault(match)
+                i = match_end
+            else:
+                i += 1
+        return list(found)
+
+
+def load_skill_taxonomy(path: str) -> Dict[str, List[str]]:
+    """
+    Load a skills file with one skill per line: `Canonical | alias | alias`.
+    Blank lines and lines starting with `#` are ignored.
+    """
+    skills: Dict[str, List[str]] = {}
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            names = [name.strip() for name in line.split("|") if name.strip()]
+            if names:
+                skills.setdefault(names[0], []).extend(names[1:])
+    return skills
+
+
+@lru_cache(maxsize=1)
+def get_keyword_matcher(taxonomy_path: Optional[str] = None) -> KeywordMatcher:
+    """Shared matcher built from `taxonomy_path` (or settings), else the default skills."""
+    path = taxonomy_path if taxonomy_path is not None else settings.skill_taxonomy_path
+    skills = DEFAULT_SKILLS
+    if path:
+        try:
+            skills = {**DEFAULT_SKILLS, **load_skill_taxonomy(path)}
+        except OSError as e:
+            logger.error(f"Error loading skill taxonomy {Path(path)}: {str(e)}")
+    matcher = KeywordMatcher(skills)
+    logger.info(f"Keyword matcher built with {len(matcher)} skills")
+    return matcher
+
+
+def find_skills(text: str) -> List[str]:
+    """Lowercased canonical skills in `text`; picklable for process pools."""
+    return [skill.lower() for skill in get_keyword_matcher().find_all(text)]
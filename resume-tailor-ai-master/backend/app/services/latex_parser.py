@@ -1,57 +1,194 @@
 import re
-from typing import List
+from dataclasses import dataclass
+from typing import List, Optional
 from app.schemas.resume import ResumeSection
+from app.services.keyword_matcher import get_keyword_matcher
+
+# One alternation covers every structural marker, so the document is scanned once
+_MARKER_PATTERN = re.compile(
+    r'\\(?:(?P<level>sub)?section\*?\s*(?:\[[^\]]*\])?\s*\{'
+    r'|(?P<begin>begin\{document\})'
+    r'|(?P<end>end\{document\})'
+    r'|(?P<maketitle>maketitle)(?![a-zA-Z]))'
+)
+
+
+@dataclass(frozen=True)
+class SectionSpan:
+    """
+    Offsets of one section inside the source document.
+
+    `source[start:end]` is the section including its heading.
+    """
+    section_type: str
+    title: str
+    level: int  # 1 for \section, 2 for \subsection
+    start: int
+    end: int
+
+
+@dataclass(frozen=True)
+class LatexIndex:
+    """Section offsets plus document body bounds for a LaTeX source."""
+    sections: List[SectionSpan]
+    body_start: Optional[int]  # just after \begin{document}
+    body_end: Optional[int]  # at \end{document}
+    title_end: Optional[int]  # just after \maketitle
+
+
+def _is_commented(text: str, pos: int) -> bool:
+    """True when `pos` sits after an unescaped % on its line."""
+    line_start = text.rfind('\n', 0, pos) + 1
+    i = text.find('%', line_start, pos)
+    while i != -1:
+        backslashes = 0
+        while i - backslashes - 1 >= line_start and text[i - backslashes - 1] == '\\':
+            backslashes += 1
+        if backslashes % 2 == 0:
+            return True
+        i = text.find('%', i + 1, pos)
+    return False
+
+
+def _find_closing_brace(text: str, pos: int) -> int:
+    """Given `pos` just after an opening brace, return the index of its closing brace."""
+    depth = 1
+    i = pos
+    n = len(text)
+    while i < n:
+        ch = text[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return n
+
+
+def normalize_section_type(title: str) -> str:
+    """'Work Experience' -> 'work_experience'; LaTeX commands are dropped."""
+    plain = re.sub(r'\\[a-zA-Z]+\*?', ' ', title)
+    return re.sub(r'[^a-z0-9]+', '_', plain.lower()).strip('_') or 'section'
+
+
+def index_latex_sections(latex_content: str) -> LatexIndex:
+    """
+    Find every \\section/\\subsection boundary in a single pass.
+
+    Section names are arbitrary; each span runs to the next heading of the
+    same or a higher level, or to \\end{document}. When the source has a
+    \\begin{document}, headings outside the body (e.g. inside preamble
+    macro definitions) are ignored.
+    """
+    body_start = body_end = title_end = None
+    headings = []  # (level, start, title)
+
+    for match in _MARKER_PATTERN.finditer(latex_content):
+        if _is_commented(latex_content, match.start()):
+            continue
+        if match.group('begin'):
+            if body_start is None:
+                body_start = match.end()
+        elif match.group('end'):
+            # TeX stops reading at the first \end{document} of the body
+            if body_start is not None and body_end is None:
+                body_end = match.start()
+        elif match.group('maketitle'):
+            # A preamble \renewcommand{\maketitle} is not the title
+            if title_end is None and body_start is not None:
+                title_end = match.end()
+        else:
+            close = _find_closing_brace(latex_content, match.end())
+            title = latex_content[match.end():close].strip()
+            level = 2 if match.group('level') else 1
+            headings.append((level, match.start(), title))
+
+    doc_end = body_end if body_end is not None else len(latex_content)
+    if body_start is not None:
+        headings = [h for h in headings if body_start <= h[1] < doc_end]
+
+    # Walk headings backwards, remembering the next start seen at each level
+    ends = [doc_end] * len(headings)
+    next_at_level = {1: doc_end, 2: doc_end}
+    for i in range(len(headings) - 1, -1, -1):
+        level, start, _ = headings[i]
+        ends[i] = next_at_level[level] if level == 2 else next_at_level[1]
+        if level == 1:
+            next_at_level[1] = start
+            next_at_level[2] = start
+        else:
+            next_at_level[2] = start
+
+    sections = [
+        SectionSpan(
+            section_type=normalize_section_type(title),
+            title=title,
+            level=level,
+            start=start,
+            end=max(start, min(end, doc_end)),
+        )
+        for (level, start, title), end in zip(headings, ends)
+    ]
+
+    return LatexIndex(sections=sections, body_start=body_start,
+                      body_end=body_end, title_end=title_end)
+
 
 def parse_latex_resume(latex_content: str) -> List[ResumeSection]:
     """
     Parse LaTeX resume content into structured sections
+
+    Every top-level \\section becomes one section (falling back to
+    \\subsection when there are none); text between \\begin{document}
+    (or \\maketitle) and the first section becomes `personal_info`.
     """
     sections = []
-    
-    # Define section patterns
-    section_patterns = {
-        'personal_info': r'\\begin\{document\}.*?\\maketitle(.*?)(?=\\section|\\subsection|$)',
-        'education': r'\\section\{Education\}.*?(?=\\section|\\subsection|$)',
-        'experience': r'\\section\{Experience\}.*?(?=\\section|\\subsection|$)',
-        'skills': r'\\section\{Skills\}.*?(?=\\section|\\subsection|$)',
-        'projects': r'\\section\{Projects\}.*?(?=\\section|\\subsection|$)',
-        'certifications': r'\\section\{Certifications\}.*?(?=\\section|\\subsection|$)',
-        'awards': r'\\section\{Awards\}.*?(?=\\section|\\subsection|$)',
-        'publications': r'\\section\{Publications\}.*?(?=\\section|\\subsection|$)',
-        'languages': r'\\section\{Languages\}.*?(?=\\section|\\subsection|$)',
-        'interests': r'\\section\{Interests\}.*?(?=\\section|\\subsection|$)',
-    }
-    
-    # Extract sections
-    for section_type, pattern in section_patterns.items():
-        matches = re.findall(pattern, latex_content, re.DOTALL | re.IGNORECASE)
-        if matches:
-            content = matches[0].strip()
+    index = index_latex_sections(latex_content)
+
+    top_level = [span for span in index.sections if span.level == 1] or index.sections
+
+    if top_level and index.body_start is not None:
+        header_start = max(index.body_start, index.title_end or 0)
+        if header_start < top_level[0].start:
+            content = latex_content[header_start:top_level[0].start].strip()
             if content:
-                # Extract keywords from content
-                keywords = extract_keywords(content)
                 sections.append(ResumeSection(
-                    section_type=section_type,
+                    section_type='personal_info',
                     content=content,
-                    keywords=keywords
+                    keywords=extract_keywords(content)
                 ))
-    
+
+    # Extract sections
+    for span in top_level:
+        content = latex_content[span.start:span.end].strip()
+        if content:
+            # Extract keywords from content
+            keywords = extract_keywords(content)
+            sections.append(ResumeSection(
+                section_type=span.section_type,
+                content=content,
+                keywords=keywords
+            ))
+
     # If no structured sections found, try to extract any content
-    if not sections:
+    if not sections and index.body_start is not None and index.body_end is not None:
         # Extract content between \begin{document} and \end{document}
-        doc_match = re.search(r'\\begin\{document\}(.*?)\\end\{document\}', latex_content, re.DOTALL)
-        if doc_match:
-            content = doc_match.group(1).strip()
+        content = latex_content[index.body_start:index.body_end].strip()
+        if content:
             keywords = extract_keywords(content)
             sections.append(ResumeSection(
                 section_type='general',
                 content=content,
                 keywords=keywords
             ))
-    
+
     return sections
 
-#TODO: Need to improve the keywords list dynamically rather than hardcoding it
 def extract_keywords(content: str) -> List[str]:
     """
     Extract potential keywords from LaTeX content
@@ -60,20 +197,10 @@ def extract_keywords(content: str) -> List[str]:
     clean_content = re.sub(r'\\[a-zA-Z]+(\{[^}]*\})?', '', content)
     clean_content = re.sub(r'\\[a-zA-Z]+', '', clean_content)
     
-    # Extract words that might be skills/technologies
-    words = re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b', clean_content)
-    
-    # Filter for likely technical terms
-    technical_terms = [
-        'Python', 'JavaScript', 'React', 'Node.js', 'Java', 'C++', 'SQL',
-        'AWS', 'Docker', 'Kubernetes', 'Git', 'MongoDB', 'PostgreSQL',
-        'Machine Learning', 'AI', 'Data Science', 'Web Development',
-        'Agile', 'Scrum', 'DevOps', 'CI/CD', 'REST API', 'GraphQL'
-    ]
-    
-    keywords = [word for word in words if any(term.lower() in word.lower() for term in technical_terms)]
+    # Match against the shared skills vocabulary in one pass
+    keywords = get_keyword_matcher().find_all(clean_content)
     
-    return list(set(keywords))[:10]  # Limit to 10 keywords
+    return keywords[:10]  # Limit to 10 keywords
 
 def clean_latex_content(content: str) -> str:
     """
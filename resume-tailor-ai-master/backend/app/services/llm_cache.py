@@ -0,0 +1,115 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.embedding_service import normalize_rows
+from app.utils.ttl_cache import TTLCache
+
+
+def prompt_key(provider_model: str, messages: List[Dict[str, str]]) -> str:
+    """Hash of the resolved model plus the exact messages sent to it."""
+    payload = json.dumps([provider_model, messages], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Cache of sanitized tailoring completions.
+
+    The exact tier is keyed by `prompt_key`, so it only hits for an
+    identical model and prompt. The optional semantic tier groups results
+    by (model, resume hash) and reuses one when the new job description's
+    embedding is within `threshold` cosine similarity of a cached one.
+    Both tiers are bounded and expire entries after `ttl` seconds.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, semantic: bool, threshold: float,
+                 per_resume: int = 16):
+        self.exact = TTLCache(max_entries, ttl)
+        self.semantic = semantic
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_groups = max_entries
+        self.per_resume = per_resume
+
+        self._lock = threading.Lock()
+        # (model, resume hash) -> [(stored_at, normalized job vector, response)]
+        self._groups: "OrderedDict[Tuple[str, str], List[Tuple[float, np.ndarray, str]]]" = OrderedDict()
+        self._stats = {"semantic_hits": 0, "semantic_misses": 0}
+
+    @staticmethod
+    def _group_key(provider_model: str, resume: str) -> Tuple[str, str]:
+        return provider_model, hashlib.sha256(resume.encode("utf-8")).hexdigest()
+
+    def get(self, provider_model: str, messages: List[Dict[str, str]], resume: str,
+            job_vector: Callable[[], np.ndarray]) -> Optional[str]:
+        """
+        Cached response for this request, or None. `job_vector` is only
+        called when the semantic tier is consulted.
+        """
+        response = self.exact.get(prompt_key(provider_model, messages))
+        if response is not None or not self.semantic:
+            return response
+
+        group_key = self._group_key(provider_model, resume)
+        with self._lock:
+            has_group = group_key in self._groups
+        if not has_group:
+            with self._lock:
+                self._stats["semantic_misses"] += 1
+            return None
+
+        query = normalize_rows(job_vector())
+        now = time.monotonic()
+        with self._lock:
+            entries = [e for e in self._groups.get(group_key, []) if now - e[0] <= self.ttl]
+            best = None
+            best_score = self.threshold
+            for _, vector, cached in entries:
+                score = float(vector @ query)
+                if score >= best_score:
+                    best, best_score = cached, score
+            if entries:
+                self._groups[group_key] = entries
+                self._groups.move_to_end(group_key)
+            else:
+                self._groups.pop(group_key, None)
+            self._stats["semantic_hits" if best is not None else "semantic_misses"] += 1
+            return best
+
+    def put(self, provider_model: str, messages: List[Dict[str, str]], resume: str,
+            job_vector: Callable[[], np.ndarray], response: str) -> None:
+        self.exact.put(prompt_key(provider_model, messages), response)
+        if not self.semantic:
+            return
+
+        vector = normalize_rows(job_vector())
+        group_key = self._group_key(provider_model, resume)
+        with self._lock:
+            entries = self._groups.setdefault(group_key, [])
+            entries.append((time.monotonic(), vector, response))
+            del entries[:-self.per_resume]
+            self._groups.move_to_end(group_key)
+            while len(self._groups) > self.max_groups:
+                self._groups.popitem(last=False)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            semantic = {**self._stats, "groups": len(self._groups), "enabled": self.semantic,
+                        "threshold": self.threshold}
+        return {"exact": self.exact.stats(), "semantic": semantic}
+
+
+# Global LLM response cache
+llm_cache = LLMResponseCache(
+    max_entries=settings.llm_cache_max_entries,
+    ttl=settings.llm_cache_ttl_seconds,
+    semantic=settings.llm_cache_semantic,
+    threshold=settings.llm_cache_semantic_threshold,
+)
@@ -0,0 +1,227 @@
+import logging
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.executors import cpu_executor
+from app.services.analysis_cache import analysis_cache
+from app.services.embedding_service import normalize_rows
+from app.services.keyword_matcher import get_keyword_matcher
+from app.services.latex_parser import clean_latex_content
+from app.services.prompt_builder import dedupe_job_description
+from app.services.rag_service import rag_service
+
+logger = logging.getLogger(__name__)
+
+_BULLET = re.compile(r'^\s*(?:[-*\u2022\u25cf\u25aa]|\d+[.)])\s*')
+_SENTENCE_END = re.compile(r'(?<=[.;!?])\s+(?=[A-Z])')
+_LATEX_COMMAND = re.compile(r'\\[a-zA-Z]+\*?(?:\[[^\]]*\])?')
+
+
+def extract_requirements(job_description: str, limit: Optional[int] = None) -> List[str]:
+    """
+    Split a job description into requirement statements: one per bullet or
+    sentence, boilerplate and duplicates removed, in posting order.
+    """
+    limit = limit or settings.match_max_requirements
+    requirements: Dict[str, None] = {}
+    for line in dedupe_job_description(job_description).splitlines():
+        for sentence in _SENTENCE_END.split(_BULLET.sub('', line).strip()):
+            sentence = sentence.strip()
+            if len(sentence.split()) >= 3:
+                requirements.setdefault(sentence)
+    if not requirements and job_description.strip():
+        requirements.setdefault(job_description.strip())
+    return list(requirements)[:limit]
+
+
+def _plain(latex: str) -> str:
+    """Section text without LaTeX markup, for the lexical signal."""
+    return clean_latex_content(_LATEX_COMMAND.sub(' ', latex)).replace('{', ' ').replace('}', ' ')
+
+
+def _tfidf_similarity(rows: List[str], columns: List[str]) -> np.ndarray:
+    """(len(rows), len(columns)) cosine similarity of TF-IDF vectors fit on both."""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    try:
+        matrix = TfidfVectorizer(sublinear_tf=True, stop_words='english').fit_transform(rows + columns)
+    except ValueError:
+        # Only stop words / no tokens at all
+        return np.zeros((len(rows), len(columns)), dtype=np.float32)
+    # Rows are L2-normalized by the vectorizer, so the product is cosine similarity
+    return np.asarray((matrix[:len(rows)] @ matrix[len(rows):].T).todense(), dtype=np.float32)
+
+
+@dataclass
+class KeywordOverlap:
+    matching: List[str]
+    missing: List[str]
+    percentage: float
+
+
+def keyword_overlap(resume_keywords: List[str], job_keywords: List[str]) -> KeywordOverlap:
+    """Set-based keyword match; `missing` keeps the job's keyword order."""
+    resume_set = {kw.lower() for kw in resume_keywords}
+    job_ordered = list(dict.fromkeys(kw.lower() for kw in job_keywords))
+    matching = [kw for kw in job_ordered if kw in resume_set]
+    missing = [kw for kw in job_ordered if kw not in resume_set]
+    percentage = len(matching) / len(job_ordered) * 100 if job_ordered else 0.0
+    return KeywordOverlap(matching=matching, missing=missing, percentage=percentage)
+
+
+def _requirement_coverage(section_texts: List[str], requirements: List[str], vectors: np.ndarray,
+                          semantic_weight: float, threshold: float):
+    """
+    Best section, coverage and covered flag per requirement plus the
+    weighted coverage score, from the embeddings of sections then
+    requirements. Pure, so it can run in a pool process.
+    """
+    vectors = normalize_rows(vectors)
+    semantic = vectors[:len(section_texts)] @ vectors[len(section_texts):].T
+    lexical = _tfidf_similarity([_plain(text) for text in section_texts], requirements)
+    combined = semantic_weight * np.clip(semantic, 0.0, 1.0) + (1.0 - semantic_weight) * lexical
+
+    coverage = combined.max(axis=0)
+    # Requirements naming known skills matter more than generic ones
+    matcher = get_keyword_matcher()
+    weights = np.array([1.0 + len(matcher.find_all(r)) for r in requirements], dtype=np.float32)
+    coverage_score = float(np.dot(weights, np.minimum(coverage / threshold, 1.0)) / weights.sum() * 100)
+    return combined.argmax(axis=0), coverage, coverage >= threshold, coverage_score
+
+
+def score_resume_against_job(resume: str, job_description: str) -> Dict[str, object]:
+    """
+    Score one resume against one job description.
+
+    Every section and requirement is embedded in one batch and compared in
+    a single (sections x requirements) matmul; that semantic similarity is
+    blended with TF-IDF similarity (`settings.match_semantic_weight`). A
+    requirement's coverage is its best section score, and requirements that
+    name known skills weigh more. The returned
+    `match_percentage` blends weighted coverage with keyword overlap
+    (`settings.match_keyword_weight`). Call it from a worker thread: the
+    embedding model runs there and the scoring on the CPU process pool.
+    """
+    sections = analysis_cache.resume_sections(resume)
+    requirements = extract_requirements(job_description)
+    job_keywords = analysis_cache.job_keywords(job_description)
+    overlap = keyword_overlap(analysis_cache.resume_keywords(resume), job_keywords)
+
+    coverage_items = []
+    coverage_score = 0.0
+    if sections and requirements:
+        # The model runs here, on the calling thread; the scoring maths is
+        # pure CPU work and goes to the process pool
+        section_texts = [s.content for s in sections]
+        vectors = rag_service.embeddings.embed_many(section_texts + requirements)
+        best_section, coverage, covered, coverage_score = cpu_executor.call(
+            _requirement_coverage, section_texts, requirements, vectors,
+            settings.match_semantic_weight, settings.match_coverage_threshold)
+
+        coverage_items = [
+            {
+                "requirement": requirement,
+                "coverage": round(float(coverage[i]), 4),
+                "covered": bool(covered[i]),
+                "best_section": sections[int(best_section[i])].section_type,
+            }
+            for i, requirement in enumerate(requirements)
+        ]
+
+    if job_keywords and coverage_items:
+        kw = settings.match_keyword_weight
+        match_percentage = kw * overlap.percentage + (1.0 - kw) * coverage_score
+    elif coverage_items:
+        match_percentage = coverage_score
+    else:
+        match_percentage = overlap.percentage
+
+    return {
+        "match_percentage": match_percentage,
+        "keyword_match_percentage": overlap.percentage,
+        "requirement_coverage_percentage": coverage_score,
+        "matching_keywords": overlap.matching,
+        "missing_keywords": overlap.missing,
+        "requirement_coverage": coverage_items,
+    }
+
+
+def _job_scores(resume: str, section_count: int, job_descriptions: List[str], vectors: np.ndarray,
+                semantic_weight: float, keyword_weight: float):
+    """
+    Score, semantic, lexical and keyword-coverage arrays over the jobs, from
+    the embeddings of the resume's `section_count` sections then the jobs.
+    Pure, so it can run in a pool process.
+    """
+    vectors = normalize_rows(vectors)
+    section_vectors, job_vectors = vectors[:section_count], vectors[section_count:]
+
+    # Semantic: how well the resume's best sections fit each job
+    sims = np.clip(section_vectors @ job_vectors.T, 0.0, 1.0)  # (sections, jobs)
+    top = min(3, sims.shape[0])
+    semantic = np.sort(sims, axis=0)[-top:].mean(axis=0)
+
+    lexical = _tfidf_similarity([_plain(resume)], job_descriptions)[0]
+
+    # Keyword coverage: share of each job's skills present in the resume
+    matcher = get_keyword_matcher()
+    resume_skills = {kw.lower() for kw in matcher.find_all(_plain(resume))}
+    vocabulary: Dict[str, int] = {}
+    rows, cols = [], []
+    for j, job in enumerate(job_descriptions):
+        for kw in set(k.lower() for k in matcher.find_all(job)):
+            rows.append(j)
+            cols.append(vocabulary.setdefault(kw, len(vocabulary)))
+    incidence = np.zeros((len(job_descriptions), max(1, len(vocabulary))), dtype=np.float32)
+    incidence[rows, cols] = 1.0
+    resume_vector = np.zeros(incidence.shape[1], dtype=np.float32)
+    for kw, col in vocabulary.items():
+        if kw in resume_skills:
+            resume_vector[col] = 1.0
+    job_skill_counts = incidence.sum(axis=1)
+    keyword = np.divide(incidence @ resume_vector, job_skill_counts,
+                        out=np.zeros(len(job_descriptions), dtype=np.float32), where=job_skill_counts > 0)
+
+    similarity = semantic_weight * semantic + (1.0 - semantic_weight) * lexical
+    scores = (keyword_weight * keyword + (1.0 - keyword_weight) * similarity) * 100
+    return scores, semantic, lexical, keyword
+
+
+def rank_jobs_for_resume(resume: str, job_descriptions: List[str], top_k: Optional[int] = None) -> List[Dict[str, object]]:
+    """
+    Score one resume against many job descriptions in a single pass.
+
+    Jobs are embedded in batches (and cached), then scored with one
+    (sections x jobs) matmul, one TF-IDF product and one keyword-incidence
+    product, so thousands of postings cost a few matrix operations rather
+    than a per-job loop. Returns the best `top_k` (default all) as dicts
+    with `index`, `score` and its components, best first. Like
+    `score_resume_against_job`, call it from a worker thread.
+    """
+    if top_k is not None and top_k < 1:
+        raise ValueError(f"top_k must be at least 1, got {top_k}")
+    if not job_descriptions:
+        return []
+    sections = analysis_cache.resume_sections(resume)
+    section_texts = [s.content for s in sections] or [resume]
+    vectors = rag_service.embeddings.embed_many(section_texts + list(job_descriptions))
+    scores, semantic, lexical, keyword = cpu_executor.call(
+        _job_scores, resume, len(section_texts), list(job_descriptions), vectors,
+        settings.match_semantic_weight, settings.match_keyword_weight)
+
+    k = len(scores) if top_k is None else min(top_k, len(scores))
+    order = np.argsort(-scores, kind='stable')[:k]
+    return [
+        {
+            "index": int(j),
+            "score": float(scores[j]),
+            "semantic": float(semantic[j]),
+            "lexical": float(lexical[j]),
+            "keyword_coverage": float(keyword[j]),
+        }
+        for j in order
+    ]
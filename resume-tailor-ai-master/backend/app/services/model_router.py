@@ -0,0 +1,290 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ModelHealth:
+    """
+    Rolling latency/error window and circuit breaker for one provider model.
+
+    The breaker opens after `failure_threshold` consecutive failures, or
+    when the windowed error rate reaches `error_rate_threshold`. After
+    `cooldown` seconds it lets a single probe request through (half-open);
+    the probe's outcome closes or re-opens it.
+    """
+
+    def __init__(self, window: int, failure_threshold: int, error_rate_threshold: float, cooldown: float):
+        self.latencies: deque = deque(maxlen=window)  # seconds, successful calls only
+        self.outcomes: deque = deque(maxlen=window)  # True for success
+        self.failure_threshold = failure_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.cooldown = cooldown
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+        self.in_flight = 0
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return 1.0 - sum(self.outcomes) / len(self.outcomes)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def state(self, now: float) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if now - self.opened_at >= self.cooldown and not self.probing:
+            return "half_open"
+        return "open"
+
+    def acquire(self, now: float) -> bool:
+        """Whether a request may be sent now; claims the probe when half-open."""
+        state = self.state(now)
+        if state == "half_open":
+            self.probing = True
+        return state != "open"
+
+    def record_success(self, latency: float) -> None:
+        self.latencies.append(latency)
+        self.outcomes.append(True)
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self, now: float) -> None:
+        self.outcomes.append(False)
+        self.consecutive_failures += 1
+        min_samples = max(self.failure_threshold, self.outcomes.maxlen // 5)
+        if (self.probing
+                or self.consecutive_failures >= self.failure_threshold
+                or (len(self.outcomes) >= min_samples and self.error_rate >= self.error_rate_threshold)):
+            if self.opened_at is None or self.probing:
+                logger.warning(f"Opening circuit breaker after {self.consecutive_failures} consecutive failures")
+            self.opened_at = now
+        self.probing = False
+
+    def release_probe(self) -> None:
+        """A probe that was cancelled says nothing about the model."""
+        self.probing = False
+
+
+class ModelRouter:
+    """
+    Latency-aware routing over a pool of provider models.
+
+    `complete` starts the preferred model; if it has not answered within
+    its p95 latency (clamped to [hedge_min, hedge_max]) a hedged request is
+    sent to the fastest healthy alternative, and a failed or invalid result
+    immediately falls back to the next candidate. The first valid result
+    wins and every other in-flight request is cancelled. Models with an
+    open circuit breaker are skipped.
+    """
+
+    def __init__(self, models: List[str], hedging: bool = True, default_delay: float = 20.0,
+                 hedge_min: float = 2.0, hedge_max: float = 60.0, max_attempts: int = 3,
+                 max_parallel: int = 2, window: int = 50, failure_threshold: int = 3,
+                 error_rate_threshold: float = 0.5, cooldown: float = 30.0):
+        self.models = list(dict.fromkeys(models))
+        self.hedging = hedging
+        self.default_delay = default_delay
+        self.hedge_min = hedge_min
+        self.hedge_max = hedge_max
+        self.max_attempts = max(1, max_attempts)
+        self.max_parallel = max(1, max_parallel)
+        self._health_args = (window, failure_threshold, error_rate_threshold, cooldown)
+
+        self._lock = threading.Lock()
+        self._health: Dict[str, ModelHealth] = {}
+        self._stats = {"requests": 0, "hedges": 0, "rerouted": 0, "fallbacks": 0,
+                       "cancelled": 0, "exhausted": 0}
+
+    def _get(self, model: str) -> ModelHealth:
+        health = self._health.get(model)
+        if health is None:
+            health = self._health[model] = ModelHealth(*self._health_args)
+        return health
+
+    def candidates(self, preferred: str) -> List[str]:
+        """
+        `preferred` followed by the other models, fastest p95 first, without
+        any whose breaker is open (so possibly empty).
+        """
+        now = time.monotonic()
+        with self._lock:
+            def rank(model: str) -> float:
+                p95 = self._get(model).percentile(0.95)
+                return p95 if p95 is not None else self.default_delay
+
+            others = sorted((m for m in self.models if m != preferred), key=rank)
+            ordered = [preferred] + others
+            return [m for m in ordered if self._get(m).state(now) != "open"]
+
+    def hedge_delay(self, model: str) -> float:
+        with self._lock:
+            p95 = self._get(model).percentile(0.95)
+        delay = p95 if p95 is not None else self.default_delay
+        return min(max(delay, self.hedge_min), self.hedge_max)
+
+    def _acquire(self, model: str) -> bool:
+        with self._lock:
+            health = self._get(model)
+            allowed = health.acquire(time.monotonic())
+            if allowed:
+                health.in_flight += 1
+            return allowed
+
+    def _finish(self, model: str, latency: Optional[float], ok: bool) -> None:
+        """Record an attempt; `latency` None means it was cancelled."""
+        with self._lock:
+            health = self._get(model)
+            health.in_flight -= 1
+            if latency is None:
+                health.release_probe()
+            elif ok:
+                health.record_success(latency)
+            else:
+                health.record_failure(time.monotonic())
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    async def complete(self, preferred: str, call: Callable[[str], Awaitable[str]],
+                       validate: Callable[[str], bool]) -> Tuple[str, str]:
+        """
+        Run `call(model)` with hedging and fallback; return (model, text) for
+        the first result that passes `validate`. Raises the last error when
+        every candidate fails.
+        """
+        self._count("requests")
+        queue = self.candidates(preferred)[:self.max_attempts]
+        pending: Dict[asyncio.Task, Tuple[str, float]] = {}
+        first_model = None
+        last_error: Exception = RuntimeError("No model available: every circuit breaker is open")
+        last_launch = 0.0
+
+        def launch() -> bool:
+            nonlocal first_model, last_launch
+            while queue:
+                model = queue.pop(0)
+                if not self._acquire(model):
+                    continue
+                last_launch = time.monotonic()
+                pending[asyncio.ensure_future(call(model))] = (model, last_launch)
+                first_model = first_model or model
+                return True
+            return False
+
+        launch()
+        try:
+            while pending:
+                timeout = None
+                if self.hedging and queue and len(pending) < self.max_parallel:
+                    newest = max(pending.values(), key=lambda v: v[1])[0]
+                    timeout = max(0.0, last_launch + self.hedge_delay(newest) - time.monotonic())
+
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    if launch():
+                        self._count("hedges")
+                    continue
+
+                for task in done:
+                    model, started = pending.pop(task)
+                    latency = time.monotonic() - started
+                    try:
+                        text = task.result()
+                        if not validate(text):
+                            raise ValueError(f"{model} returned output that is not valid LaTeX")
+                    except Exception as e:
+                        self._finish(model, latency, ok=False)
+                        logger.warning(f"Model {model} failed after {latency:.1f}s: {str(e)}")
+                        last_error = e
+                        continue
+                    self._finish(model, latency, ok=True)
+                    if model != first_model:
+                        self._count("rerouted")
+                    return model, text
+
+                if not pending:
+                    if not launch():
+                        break
+                    self._count("fallbacks")
+            self._count("exhausted")
+            raise last_error
+        finally:
+            # Cancel the losers; cancelling closes their HTTP streams
+            for task, (model, _) in pending.items():
+                task.cancel()
+                self._finish(model, None, ok=False)
+                self._count("cancelled")
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def complete_sync(self, preferred: str, call: Callable[[str], str],
+                      validate: Callable[[str], bool]) -> Tuple[str, str]:
+        """Blocking variant of `complete`: sequential fallback without hedging."""
+        self._count("requests")
+        last_error: Exception = RuntimeError("No model available: every circuit breaker is open")
+        for attempt, model in enumerate(self.candidates(preferred)[:self.max_attempts]):
+            if not self._acquire(model):
+                continue
+            if attempt:
+                self._count("fallbacks")
+            started = time.monotonic()
+            try:
+                text = call(model)
+                if not validate(text):
+                    raise ValueError(f"{model} returned output that is not valid LaTeX")
+            except Exception as e:
+                self._finish(model, time.monotonic() - started, ok=False)
+                logger.warning(f"Model {model} failed: {str(e)}")
+                last_error = e
+                continue
+            self._finish(model, time.monotonic() - started, ok=True)
+            return model, text
+        self._count("exhausted")
+        raise last_error
+
+    def reserve(self, preferred: str) -> Optional[str]:
+        """
+        Claim the first candidate that may take a request now, for an attempt
+        made outside `complete` (e.g. a streamed completion). A half-open
+        model is claimed as its single probe. Returns None when every
+        breaker is open; otherwise report the outcome with `release`.
+        """
+        for model in self.candidates(preferred):
+            if self._acquire(model):
+                return model
+        return None
+
+    def release(self, model: str, latency: Optional[float], ok: bool) -> None:
+        """Record a `reserve`d attempt; `latency` None means it was abandoned."""
+        self._finish(model, latency, ok)
+
+    def stats(self) -> Dict[str, object]:
+        now = time.monotonic()
+        with self._lock:
+            models = {
+                model: {
+                    "state": health.state(now),
+                    "samples": len(health.outcomes),
+                    "error_rate": health.error_rate,
+                    "p50_seconds": health.percentile(0.5),
+                    "p95_seconds": health.percentile(0.95),
+                    "in_flight": health.in_flight,
+                }
+                for model, health in self._health.items()
+            }
+            return {**self._stats, "hedging": self.hedging, "models": models}
@@ -0,0 +1,250 @@
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Context windows of the providers in ai_service.model_mapping (approximate,
+# as advertised by OpenRouter). Unknown models fall back to the default.
+MODEL_CONTEXT_WINDOWS: Dict[str, int] = {
+    "deepseek/deepseek-r1-0528:free": 163840,
+    "deepseek/deepseek-chat-v3-0324:free": 163840,
+    "qwen/qwen3-235b-a22b:free": 40960,
+    "z-ai/glm-4.5-air:free": 131072,
+    "tngtech/deepseek-r1t2-chimera:free": 163840,
+    "microsoft/mai-ds-r1:free": 163840,
+    "moonshotai/kimi-vl-a3b-thinking:free": 131072,
+}
+DEFAULT_CONTEXT_WINDOW = 32768
+
+# The job description is never cut below this, even for resumes that
+# already fill the budget: without it the model has nothing to tailor to
+MIN_JOB_TOKENS = 512
+
+# Job-posting lines that carry no requirements for the model
+_BOILERPLATE_PATTERNS = [
+    r"equal opportunity employer",
+    r"\beeo\b",
+    r"without regard to (race|color|religion|sex|gender|age|national origin)",
+    r"reasonable accommodations?",
+    r"e-?verify",
+    r"privacy (policy|notice)",
+    r"(recruit|staffing) agenc(y|ies)",
+    r"^\s*(apply now|how to apply|click apply)\b",
+    r"all qualified applicants",
+]
+_BOILERPLATE = re.compile("|".join(_BOILERPLATE_PATTERNS), re.IGNORECASE)
+
+# The prompt before token budgeting carried the top few sections, each cut
+# to a fixed number of characters; savings are measured against that shape
+BASELINE_SECTIONS = 3
+BASELINE_SECTION_CHARS = 200
+
+# Rough BPE stand-in: words, numbers and single punctuation marks
+_APPROX_TOKEN = re.compile(r"[A-Za-z]+|\d{1,3}|[^\sA-Za-z\d]")
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """tiktoken's cl100k encoding if installed and loadable, else None."""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:  # not installed, or no cached BPE file offline
+        logger.info(f"tiktoken unavailable, using approximate token counts: {str(e)}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Prompt tokens for `text`; approximate when tiktoken is unavailable."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    # Long words split into several BPE pieces, so count ~1 token per 4 letters
+    return sum(max(1, len(t) // 4) if t[0].isalpha() else 1 for t in _APPROX_TOKEN.findall(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Longest prefix of `text` (cut at a word boundary) within `max_tokens`."""
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text) <= max_tokens:
+        return text
+    words = text.split()
+    lo, hi = 0, len(words)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if count_tokens(" ".join(words[:mid]) + "...") <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    return " ".join(words[:lo]) + "..." if lo else ""
+
+
+def prompt_budget(provider_model: str, resume_tokens: int) -> int:
+    """
+    Prompt tokens allowed for `provider_model`: the configured cap, or less
+    when the context window must also hold a rewritten resume of about the
+    same length as the original.
+    """
+    window = MODEL_CONTEXT_WINDOWS.get(provider_model, DEFAULT_CONTEXT_WINDOW)
+    reserved_output = max(settings.prompt_min_output_tokens, int(resume_tokens * 1.2))
+    return max(0, min(settings.prompt_token_budget, window - reserved_output))
+
+
+def dedupe_job_description(job_description: str) -> str:
+    """Drop repeated lines and legal/application boilerplate, keeping order."""
+    seen = set()
+    kept = []
+    for line in job_description.splitlines():
+        normalized = " ".join(line.lower().split())
+        if normalized:
+            if normalized in seen or _BOILERPLATE.search(normalized):
+                continue
+            seen.add(normalized)
+        elif kept and not kept[-1].strip():
+            continue  # collapse runs of blank lines
+        kept.append(line.rstrip())
+    return "\n".join(kept).strip()
+
+
+def fit_job_description(job_description: str, job_keywords: List[str], budget: int) -> str:
+    """
+    Keep the job description within `budget` tokens, preferring the lines
+    that mention the most extracted keywords and preserving their order.
+    """
+    if count_tokens(job_description) <= budget:
+        return job_description
+    lines = [line for line in job_description.splitlines() if line.strip()]
+    keywords = [k.lower() for k in job_keywords]
+    scored = sorted(
+        range(len(lines)),
+        key=lambda i: (-sum(k in lines[i].lower() for k in keywords), i),
+    )
+    chosen, used = [], 0
+    for i in scored:
+        cost = count_tokens(lines[i]) + 1
+        if used + cost > budget:
+            continue
+        chosen.append(i)
+        used += cost
+    if not chosen and lines:
+        return truncate_to_tokens(lines[scored[0]], budget)
+    return "\n".join(lines[i] for i in sorted(chosen))
+
+
+@dataclass
+class PromptReport:
+    """
+    Token accounting for one assembled tailoring prompt. `baseline_tokens`
+    is the prompt as built before budgeting: the full job description and
+    the first BASELINE_SECTIONS sections cut to BASELINE_SECTION_CHARS.
+    """
+    provider_model: str
+    budget: int
+    prompt_tokens: int
+    baseline_tokens: int
+    sections_included: int
+    over_budget: bool
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.baseline_tokens - self.prompt_tokens)
+
+
+def assemble_tailoring_prompt(
+    resume: str,
+    job_description: str,
+    relevant_sections: list,
+    job_keywords: list,
+    provider_model: str,
+    render: Callable[[str, str, list, list], str],
+    excerpt_tokens: Optional[int] = None,
+) -> tuple:
+    """
+    Build the tailoring prompt within the model's token budget.
+
+    `render(resume, job_description, relevant_context_lines, job_keywords)`
+    formats the final prompt. The original resume and keyword list are
+    always included; the deduplicated job description gets up to
+    `settings.prompt_job_share` of what remains, and relevant sections are
+    then added best `similarity` first, each as an excerpt of at most
+    `excerpt_tokens`, until the budget is spent.
+
+    Returns (prompt, PromptReport).
+    """
+    excerpt_tokens = excerpt_tokens or settings.prompt_section_excerpt_tokens
+    budget = prompt_budget(provider_model, count_tokens(resume))
+
+    fixed_tokens = count_tokens(render(resume, "", [], job_keywords))
+    remaining = budget - fixed_tokens
+
+    job_text = dedupe_job_description(job_description)
+    job_text = fit_job_description(
+        job_text, job_keywords, max(int(remaining * settings.prompt_job_share), MIN_JOB_TOKENS))
+    remaining -= count_tokens(job_text)
+
+    ranked = sorted(relevant_sections, key=lambda s: s.get("similarity", 0.0), reverse=True)
+    context_lines: List[str] = []
+    for section in ranked:
+        prefix = f"- {section['section_type']} (relevance {section.get('similarity', 0.0):.2f}): "
+        room = min(excerpt_tokens, remaining - count_tokens(prefix) - 1)
+        excerpt = truncate_to_tokens(" ".join(section["content"].split()), room)
+        if not excerpt:
+            break
+        line = prefix + excerpt
+        context_lines.append(line)
+        remaining -= count_tokens(line) + 1
+
+    prompt = render(resume, job_text, context_lines, job_keywords)
+    report = PromptReport(
+        provider_model=provider_model,
+        budget=budget,
+        prompt_tokens=count_tokens(prompt),
+        baseline_tokens=count_tokens(render(resume, job_description, [
+            f"- {s['section_type']}: {s['content'][:BASELINE_SECTION_CHARS]}..."
+            for s in relevant_sections[:BASELINE_SECTIONS]], job_keywords)),
+        sections_included=len(context_lines),
+        over_budget=fixed_tokens > budget,
+    )
+    if report.over_budget:
+        logger.warning(f"Resume alone exceeds the {budget}-token prompt budget for {provider_model}")
+    return prompt, report
+
+
+class PromptStats:
+    """Running totals of prompt tokens sent and saved by the assembler."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {"prompts": 0, "prompt_tokens": 0, "tokens_saved": 0, "over_budget": 0}
+        self.last: Optional[PromptReport] = None
+
+    def record(self, report: PromptReport) -> None:
+        with self._lock:
+            self._stats["prompts"] += 1
+            self._stats["prompt_tokens"] += report.prompt_tokens
+            self._stats["tokens_saved"] += report.tokens_saved
+            self._stats["over_budget"] += int(report.over_budget)
+            self.last = report
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            prompts = self._stats["prompts"]
+            return {
+                **self._stats,
+                "avg_prompt_tokens": self._stats["prompt_tokens"] / prompts if prompts else 0.0,
+                "avg_tokens_saved": self._stats["tokens_saved"] / prompts if prompts else 0.0,
+                "exact_tokenizer": _get_encoding() is not None,
+            }
+
+
+# Global prompt accounting
+prompt_stats = PromptStats()
@@ -1,75 +1,183 @@
-from sentence_transformers import SentenceTransformer
-import chromadb
-from typing import List, Dict
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import os
+import threading
+import time
+from app.core.config import settings
+from app.core.executors import io_executor
+from app.core.metrics import span
+from app.services import vector_maintenance
+from app.services.embedding_service import EmbeddingService, cosine_top_k, text_hash
+from app.services.keyword_matcher import find_skills
 
 logger = logging.getLogger(__name__)
 
+COLLECTION_NAME = "resume_job_matches"
+
 class RAGService:
+    """
+    Embedding model and vector store, both loaded lazily.
+
+    Constructing the service is free: the SentenceTransformer (and torch)
+    is only imported and loaded on first use of `model`/`embeddings`, and
+    ChromaDB is only opened on first use of `collection`. `warm_up` loads
+    both concurrently ahead of traffic.
+    
+    The store is bounded: entries are keyed by content hash so identical
+    documents are stored once, and `run_maintenance` evicts expired and
+    least recently used entries and rebuilds the index after heavy
+    eviction. Writes and compaction are serialized by `_write_lock`.
+    """
+    
     def __init__(self):
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
-        
-        # Create chroma_db directory if it doesn't exist
-        os.makedirs("./chroma_db", exist_ok=True)
+        self._model = None
+        self._embeddings = None
+        self._client = None
+        self._collection = None
+        self._model_lock = threading.Lock()
+        self._store_lock = threading.Lock()
         
-        # Use the new ChromaDB client configuration
-        self.client = chromadb.PersistentClient(path="./chroma_db")
-        self.collection = self.client.get_or_create_collection("resume_job_matches")
+        self._write_lock = threading.Lock()
         
+        self._gc_lock = threading.Lock()
+        self._last_gc = None
+        self._gc_running = False
+        self._evicted_since_compaction = 0
+        self._scan_offset = 0
+    
+    @property
+    def model(self):
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer
+                    model = SentenceTransformer(settings.embedding_model)
+                    self._embeddings = EmbeddingService(
+                        model,
+                        cache_size=settings.embedding_cache_size,
+                        store_path=settings.embedding_store_path,
+                    )
+                    self._model = model
+                    logger.info(f"Embedding model {settings.embedding_model} loaded")
+        return self._model
+    
+    @property
+    def embeddings(self) -> EmbeddingService:
+        self.model
+        return self._embeddings
+    
+    @property
+    def collection(self):
+        if self._collection is None:
+            with self._store_lock:
+                if self._collection is None:
+                    import chromadb
+                    
+                    # Create chroma_db directory if it doesn't exist
+                    os.makedirs(settings.chroma_db_path, exist_ok=True)
+                    
+                    # Use the new ChromaDB client configuration
+                    self._client = chromadb.PersistentClient(path=settings.chroma_db_path)
+                    vector_maintenance.recover(self._client, COLLECTION_NAME)
+                    self._collection = self._client.get_or_create_collection(COLLECTION_NAME)
+                    logger.info("Vector store opened")
+        return self._collection
+    
+    @property
+    def ready(self) -> bool:
+        """True once both the model and the vector store are loaded"""
+        return self._model is not None and self._collection is not None
+    
+    def warm_up(self) -> None:
+        """Load the model and open the vector store concurrently (blocking)"""
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="rag-warmup") as pool:
+            model = pool.submit(lambda: self.model)
+            store = pool.submit(lambda: self.collection)
+            model.result()
+            store.result()
         logger.info("RAG service initialized successfully")
     
     def embed_text(self, text: str) -> List[float]:
         """Embed text using sentence transformers"""
         try:
-            embedding = self.model.encode(text)
+            with span("embed"):
+                embedding = self.embeddings.embed(text)
             return embedding.tolist()
         except Exception as e:
             logger.error(f"Error embedding text: {str(e)}")
             return []
     
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Embed several texts in one batched model call (cached texts are skipped)"""
+        try:
+            with span("embed"):
+                return self.embeddings.embed_many(texts).tolist()
+        except Exception as e:
+            logger.error(f"Error embedding texts: {str(e)}")
+            return []
+    
+    def _store(self, ids: List[str], documents: List[str], metadatas: List[Dict]) -> int:
+        """
+        Write entries whose id is not stored with the same content yet;
+        entries that are already stored are only marked as used. Returns
+        the number of entries written.
+        """
+        with self._write_lock:
+            existing = vector_maintenance.find_existing(self.collection, ids)
+            fresh = [i for i, entry_id in enumerate(ids)
+                     if (existing.get(entry_id) or {}).get('content_hash') != metadatas[i]['content_hash']]
+            fresh_ids = {ids[i] for i in fresh}
+            known = [entry_id for entry_id in existing if entry_id not in fresh_ids]
+            vector_maintenance.touch(self.collection, known, [existing[entry_id] for entry_id in known])
+        if not fresh:
+            return 0
+        
+        embeddings = self.embed_texts([documents[i] for i in fresh])
+        # upsert: re-storing the same ids refreshes instead of duplicating
+        with self._write_lock, span("chroma_upsert"):
+            self.collection.upsert(
+                embeddings=embeddings,
+                documents=[documents[i] for i in fresh],
+                metadatas=[metadatas[i] for i in fresh],
+                ids=[ids[i] for i in fresh]
+            )
+        return len(fresh)
+    
     def store_resume_sections(self, resume_id: str, sections: List[Dict]) -> None:
         """Store resume sections with embeddings"""
         try:
-            documents = []
-            metadatas = []
-            ids = []
-            
-            for i, section in enumerate(sections):
-                documents.append(section['content'])
-                metadatas.append({
-                    'type': 'resume_section',
-                    'section_type': section['section_type'],
-                    'resume_id': resume_id
-                })
-                ids.append(f"{resume_id}_section_{i}")
+            now = time.time()
+            documents = [section['content'] for section in sections]
+            metadatas = [{
+                'type': 'resume_section',
+                'section_type': section['section_type'],
+                'resume_id': resume_id,
+                'content_hash': text_hash(section['content']),
+                'created_at': now,
+                'last_used_at': now
+            } for section in sections]
+            ids = [f"{resume_id}_section_{i}" for i in range(len(sections))]
             
             if documents:
-                embeddings = [self.embed_text(doc) for doc in documents]
-                self.collection.add(
-                    embeddings=embeddings,
-                    documents=documents,
-                    metadatas=metadatas,
-                    ids=ids
-                )
-                logger.info(f"Stored {len(documents)} resume sections for {resume_id}")
+                written = self._store(ids, documents, metadatas)
+                logger.info(f"Stored {written} of {len(documents)} resume sections for {resume_id}")
         except Exception as e:
             logger.error(f"Error storing resume sections: {str(e)}")
     
     def store_job_description(self, job_id: str, job_description: str) -> None:
         """Store job description with embedding"""
         try:
-            embedding = self.embed_text(job_description)
-            self.collection.add(
-                embeddings=[embedding],
-                documents=[job_description],
-                metadatas=[{
-                    'type': 'job_description',
-                    'job_id': job_id
-                }],
-                ids=[job_id]
-            )
-            logger.info(f"Stored job description for {job_id}")
+            now = time.time()
+            written = self._store([job_id], [job_description], [{
+                'type': 'job_description',
+                'job_id': job_id,
+                'content_hash': text_hash(job_description),
+                'created_at': now,
+                'last_used_at': now
+            }])
+            if written:
+                logger.info(f"Stored job description for {job_id}")
         except Exception as e:
             logger.error(f"Error storing job description: {str(e)}")
     
@@ -80,11 +188,17 @@ class RAGService:
             job_embedding = self.embed_text(job_description)
             
             # Query for relevant resume sections
-            results = self.collection.query(
-                query_embeddings=[job_embedding],
-                n_results=top_k,
-                where={"resume_id": resume_id, "type": "resume_section"}
-            )
+            with span("chroma_query"):
+                results = self.collection.query(
+                    query_embeddings=[job_embedding],
+                    n_results=top_k,
+                    where={"resume_id": resume_id, "type": "resume_section"}
+                )
+            
+            # Returned entries count as used for LRU eviction; the lock keeps
+            # the update off a collection that compaction is replacing
+            with self._write_lock:
+                vector_maintenance.touch(self.collection, results['ids'][0], results['metadatas'][0])
             
             relevant_sections = []
             for i in range(len(results['documents'][0])):
@@ -100,25 +214,124 @@ class RAGService:
             logger.error(f"Error finding relevant sections: {str(e)}")
             return []
     
-    def extract_job_keywords(self, job_description: str) -> List[str]:
-        """Extract key terms and skills from job description"""
-        # Simple keyword extraction - can be enhanced with NLP
-        keywords = []
+    def rank_sections(self, sections: List[Dict], job_description: str, top_k: int = 5) -> List[Dict]:
+        """
+        Rank a request's sections against the job description entirely in memory.
+        `similarity` is cosine similarity (higher is more relevant) and
+        `index` is the position of the section in `sections`.
+        """
+        try:
+            if not sections:
+                return []
+            # One batch for the sections and the job description
+            with span("embed"):
+                vectors = self.embeddings.embed_many(
+                    [section['content'] for section in sections] + [job_description])
+            with span("rank_sections"):
+                indices, scores = cosine_top_k(vectors[:-1], vectors[-1], top_k)
+            
+            return [
+                {
+                    'content': sections[i]['content'],
+                    'section_type': sections[i]['section_type'],
+                    'similarity': float(score),
+                    'index': int(i)
+                }
+                for i, score in zip(indices, scores)
+            ]
+        except Exception as e:
+            logger.error(f"Error ranking sections: {str(e)}")
+            return []
+    
+    def persist_request(self, resume: str, sections: List[Dict], job_description: str) -> None:
+        """
+        Store a request's sections and job description, deduplicated by content hash
+        """
+        resume_id = f"resume_{text_hash(resume)}"
+        self.store_resume_sections(resume_id, sections)
+        self.store_job_description(f"job_{text_hash(job_description)}", job_description)
+        self.maybe_run_maintenance()
+    
+    def collect_garbage(self, ttl_seconds: float, start: int = 0, limit: Optional[int] = None) -> int:
+        """Delete entries whose created_at is older than `ttl_seconds` (in a window, with `limit`)"""
+        with span("chroma_delete"):
+            removed = vector_maintenance.evict_expired(self.collection, ttl_seconds, start=start, limit=limit)
+        logger.info(f"Removed {removed} vector DB entries older than {ttl_seconds:.0f}s")
+        return removed
+    
+    def run_maintenance(self, compact: Optional[bool] = None, scan: Optional[int] = None) -> Dict[str, int]:
+        """
+        Evict expired entries, then least recently used ones while the
+        store is over `rag_max_entries` or `rag_max_bytes`, and rebuild
+        the index once `rag_compact_ratio` of it has been evicted (or when
+        `compact` is true). Returns what was done.
+        
+        With `scan`, expiry and eviction only read that many entries,
+        continuing where the previous run stopped and wrapping around, so
+        a run costs the same however large the store is; without it the
+        whole store is read. Compaction copies every entry, but only after
+        a `rag_compact_ratio` share has been evicted.
+        """
+        collection = self.collection
+        start = self._scan_offset if scan else 0
+        if start >= collection.count():
+            start = 0
+        report = {"expired": self.collect_garbage(settings.rag_ttl_seconds, start=start, limit=scan),
+                  "evicted": 0, "compacted": 0}
+        
+        count = collection.count()
+        limits = [settings.rag_max_entries, vector_maintenance.entry_budget(
+            count, vector_maintenance.directory_bytes(settings.chroma_db_path), settings.rag_max_bytes)]
+        limits = [limit for limit in limits if limit > 0]
+        if limits:
+            with span("chroma_delete"):
+                report["evicted"] = vector_maintenance.evict_lru(collection, min(limits), start=start, limit=scan)
+        if scan:
+            # Deleted entries shift the ones after them back by as many places
+            self._scan_offset = start + scan - report["expired"] - report["evicted"]
         
-        # Common technical skills
-        tech_skills = [
-            'python', 'javascript', 'java', 'c++', 'sql', 'react', 'node.js',
-            'aws', 'docker', 'kubernetes', 'git', 'mongodb', 'postgresql',
-            'machine learning', 'ai', 'data science', 'web development',
-            'agile', 'scrum', 'devops', 'ci/cd', 'rest api', 'graphql'
-        ]
+        self._evicted_since_compaction += report["expired"] + report["evicted"]
+        if compact is None:
+            live = collection.count()
+            compact = self._evicted_since_compaction > 0 and \
+                self._evicted_since_compaction >= settings.rag_compact_ratio * max(1, live)
+        if compact:
+            with self._write_lock:
+                self._collection = vector_maintenance.compact(self._client, COLLECTION_NAME)
+            self._evicted_since_compaction = 0
+            report["compacted"] = 1
+        logger.info(f"Vector DB maintenance: {report}")
+        return report
+    
+    def maybe_run_maintenance(self) -> None:
+        """
+        Start a bounded run_maintenance (`rag_gc_scan_entries`) in the
+        background at most once per configured interval
+        """
+        with self._gc_lock:
+            now = time.monotonic()
+            if self._gc_running or (self._last_gc is not None
+                                    and now - self._last_gc < settings.rag_gc_interval_seconds):
+                return
+            self._last_gc = now
+            self._gc_running = True
         
-        job_lower = job_description.lower()
-        for skill in tech_skills:
-            if skill in job_lower:
-                keywords.append(skill)
+        def finished(future):
+            with self._gc_lock:
+                self._gc_running = False
+            if not future.cancelled() and future.exception() is not None:
+                logger.error(f"Error maintaining vector DB: {str(future.exception())}")
         
-        return keywords
+        io_executor.submit(self.run_maintenance, scan=settings.rag_gc_scan_entries or None).add_done_callback(finished)
+    
+    def stats(self) -> Dict[str, object]:
+        """Vector counts by type and on-disk size of the store"""
+        return vector_maintenance.collection_stats(self.collection, settings.chroma_db_path)
+    
+    def extract_job_keywords(self, job_description: str) -> List[str]:
+        """Extract key terms and skills from job description"""
+        # Canonical skills from the shared vocabulary, lowercased for matching
+        return find_skills(job_description)
 
 # Global RAG service instance
 rag_service = RAGService()
@@ -0,0 +1,261 @@
+import asyncio
+import logging
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.executors import io_executor
+from app.services.ai_service import (
+    complete_tailoring_async,
+    model_mapping,
+    resolve_provider_model,
+    tailor_resume_async,
+)
+from app.services.analysis_cache import analysis_cache
+from app.services.latex_parser import SectionSpan, index_latex_sections
+from app.services.llm_cache import llm_cache, prompt_key
+from app.services.prompt_builder import count_tokens, dedupe_job_description, fit_job_description
+from app.services.rag_service import rag_service
+from app.utils.latex_utils import new_validation_errors, validate_latex
+
+logger = logging.getLogger(__name__)
+
+SECTION_SYSTEM_PROMPT = "You are a professional resume writer specializing in LaTeX formatting. You rewrite one section of a LaTeX resume at a time. Output only the rewritten LaTeX for that section, starting with its original heading command, without any analysis, commentary, chain-of-thought, <think>...</think> blocks or code fences. Never output \\documentclass, a preamble, \\begin{document} or \\end{document}."
+
+
+def create_section_prompt(section: str, job_description: str, job_keywords: list) -> str:
+    """
+    Prompt for rewriting a single resume section
+    """
+    return f"""
+Tailor the following section of a LaTeX resume to better match the job description.
+
+JOB DESCRIPTION:
+{job_description}
+
+KEY JOB REQUIREMENTS:
+{', '.join(job_keywords)}
+
+RESUME SECTION:
+{section}
+
+INSTRUCTIONS:
+1. Preserve all LaTeX formatting and syntax exactly
+2. Keep the heading line exactly as it is
+3. Add relevant keywords naturally into the content
+4. Keep the same structure and roughly the same length
+5. Do not invent employers, dates, degrees or titles
+6. Only use commands and environments already used in this section
+
+TAILORED SECTION:
+"""
+
+
+def _sections_to_tailor(resume: str, job_description: str, limit: int) -> List[SectionSpan]:
+    """The `limit` most relevant non-overlapping sections, in document order."""
+    index = index_latex_sections(resume)
+    spans = [span for span in index.sections if span.level == 1] or index.sections
+    spans = [span for span in spans if resume[span.start:span.end].strip()]
+    if not spans:
+        return []
+    ranked = rag_service.rank_sections(
+        [{'content': resume[span.start:span.end], 'section_type': span.section_type} for span in spans],
+        job_description, top_k=limit)
+    return sorted((spans[r['index']] for r in ranked), key=lambda span: span.start)
+
+
+def _heading(section: str) -> str:
+    """The heading line of a section (its first non-blank line)."""
+    return section.strip().split('\n', 1)[0].strip()
+
+
+def _problems(section: str) -> Counter:
+    return Counter(d.message for d in validate_latex(section, fragment=True))
+
+
+def _acceptable(original: str, rewritten: str) -> bool:
+    """
+    Cheap guard against a rewrite that would corrupt the document: it must
+    keep the heading, must not contain document-level markers, must keep
+    braces and environments balanced the same way the original does and
+    must not add any problem `validate_latex` finds (an unescaped `&`, math
+    left open, a mismatched \\end) that the original section did not have.
+    """
+    if not rewritten or _heading(rewritten) != _heading(original):
+        return False
+    if any(marker in rewritten for marker in ("\\documentclass", "\\begin{document}", "\\end{document}")):
+        return False
+
+    def balance(text: str) -> Tuple[int, int]:
+        unescaped = text.replace('\\\\', '').replace('\\{', '').replace('\\}', '')
+        braces = unescaped.count('{') - unescaped.count('}')
+        envs = text.count('\\begin{') - text.count('\\end{')
+        return braces, envs
+
+    return balance(rewritten) == balance(original) and not _problems(rewritten) - _problems(original)
+
+
+def splice_sections(resume: str, replacements: Dict[SectionSpan, str]) -> str:
+    """
+    Replace each span's text with its rewrite, leaving every other byte of
+    `resume` untouched. Whitespace around a rewritten section is kept from
+    the original so the layout between sections does not change.
+    """
+    parts = []
+    cursor = 0
+    for span in sorted(replacements, key=lambda s: s.start):
+        original = resume[span.start:span.end]
+        lead = original[:len(original) - len(original.lstrip())]
+        trail = original[len(original.rstrip()):]
+        parts.append(resume[cursor:span.start])
+        parts.append(lead + replacements[span].strip() + trail)
+        cursor = span.end
+    parts.append(resume[cursor:])
+    return "".join(parts)
+
+
+async def _tailor_section(section: str, job_text: str, job_keywords: list, provider_model: str) -> Optional[str]:
+    """Rewrite one section; None when the call fails or the result is unusable."""
+    messages = [
+        {"role": "system", "content": SECTION_SYSTEM_PROMPT},
+        {"role": "user", "content": create_section_prompt(section.strip(), job_text, job_keywords)},
+    ]
+    key = prompt_key(provider_model, messages)
+    cached = llm_cache.exact.get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        # The router falls back to another model when a rewrite is malformed
+        _, rewritten = await complete_tailoring_async(
+            provider_model, messages, validate=lambda text: _acceptable(section, text))
+    except Exception as e:
+        logger.error(f"Error tailoring section '{_heading(section)}': {str(e)}")
+        return None
+
+    if not _acceptable(section, rewritten):
+        logger.warning(f"Discarding malformed rewrite of section '{_heading(section)}'")
+        return None
+    # Keyed by the requested model, like the lookup above, even if a fallback wrote it
+    llm_cache.exact.put(key, rewritten)
+    return rewritten
+
+
+def _job_context(job_description: str):
+    job_keywords = analysis_cache.job_keywords(job_description)
+    job_text = fit_job_description(
+        dedupe_job_description(job_description), job_keywords, settings.section_tailor_job_tokens)
+    return job_keywords, job_text
+
+
+def _prepare(resume: str, job_description: str, limit: int):
+    spans = _sections_to_tailor(resume, job_description, limit)
+    return (spans, *_job_context(job_description))
+
+
+async def tailor_sections_async(resume: str, job_description: str, model: str | None = "DEEPSEEK_R1_0528",
+                                max_sections: Optional[int] = None) -> str:
+    """
+    Tailor only the most relevant sections of `resume`.
+
+    Each selected section is rewritten by its own, concurrent LLM call and
+    spliced back at its original offsets, so the preamble and every other
+    section stay byte-identical and output length no longer scales with the
+    whole document. A section whose call fails or whose rewrite looks
+    malformed is left as it was; if none succeed this raises. Documents
+    without sections fall back to whole-document tailoring.
+    """
+    limit = max_sections or settings.section_tailor_max_sections
+    spans, job_keywords, job_text = await io_executor.run(_prepare, resume, job_description, limit)
+    if not spans:
+        return await tailor_resume_async(resume, job_description, model)
+
+    provider_model = resolve_provider_model(model or "", model_mapping)
+    rewrites = await asyncio.gather(*(
+        _tailor_section(resume[span.start:span.end], job_text, job_keywords, provider_model)
+        for span in spans))
+
+    replacements = {span: text for span, text in zip(spans, rewrites) if text is not None}
+    if not replacements:
+        raise RuntimeError("No section could be tailored")
+    if len(replacements) < len(spans):
+        logger.info(f"Kept {len(spans) - len(replacements)} of {len(spans)} sections unchanged")
+    tailored = splice_sections(resume, replacements)
+    logger.info(
+        f"Section tailoring rewrote {len(replacements)} sections "
+        f"({count_tokens(''.join(replacements.values()))} output tokens vs ~{count_tokens(resume)} for the full document)")
+    return tailored
+
+
+def _top_level_spans(resume: str) -> List[SectionSpan]:
+    index = index_latex_sections(resume)
+    return [span for span in index.sections if span.level == 1] or index.sections
+
+
+def _broken_sections(resume: str, tailored: str) -> Optional[Dict[SectionSpan, str]]:
+    """
+    Map each section of `tailored` that holds a validation error the
+    original did not have to the original section with the same heading.
+    None when such an error lies outside every section (preamble,
+    truncated ending) or a broken section has no original to rewrite.
+    """
+    errors = new_validation_errors(resume, tailored)
+    spans = _top_level_spans(tailored)
+    originals = {_heading(resume[span.start:span.end]): resume[span.start:span.end]
+                 for span in _top_level_spans(resume)}
+    broken = {}
+    for diagnostic in errors:
+        span = next((s for s in spans if s.start <= diagnostic.offset < s.end), None)
+        if span is None:
+            return None
+        original = originals.get(_heading(tailored[span.start:span.end]))
+        if original is None:
+            return None
+        broken[span] = original
+    return broken
+
+
+async def repair_tailored_resume_async(resume: str, tailored: str, job_description: str,
+                                       model: str | None = "DEEPSEEK_R1_0528") -> str:
+    """
+    Make a whole-document rewrite of `resume` compile.
+
+    A `tailored` without errors beyond those already in `resume` is
+    returned as is. Otherwise only the sections that hold the new errors
+    are requested again, from their original text with the
+    section prompt, and spliced into `tailored`; a section whose rewrite
+    fails keeps its original text. When the damage is outside the
+    sections, or survives the repair, the resume is tailored section by
+    section from the original instead.
+    """
+    broken = await io_executor.run(_broken_sections, resume, tailored)
+    if broken == {}:
+        return tailored
+
+    if broken:
+        job_keywords, job_text = await io_executor.run(_job_context, job_description)
+        provider_model = resolve_provider_model(model or "", model_mapping)
+        rewrites = await asyncio.gather(*(
+            _tailor_section(original, job_text, job_keywords, provider_model) for original in broken.values()))
+        repaired = splice_sections(tailored, {
+            span: rewrite or original for (span, original), rewrite in zip(broken.items(), rewrites)})
+        if not new_validation_errors(resume, repaired):
+            logger.info(f"Re-requested {len(broken)} broken sections of a tailored resume")
+            return repaired
+
+    logger.warning("Tailored resume does not validate; tailoring it section by section instead")
+    return await tailor_sections_async(resume, job_description, model)
+
+
+async def tailor_resume_checked_async(resume: str, job_description: str,
+                                      model: str | None = "DEEPSEEK_R1_0528") -> str:
+    """
+    `tailor_resume_async` followed by `repair_tailored_resume_async`.
+    The repaired resume is what gets cached; a cache hit is only
+    validated, which finds nothing to repair.
+    """
+    def repair(tailored: str):
+        return repair_tailored_resume_async(resume, tailored, job_description, model)
+
+    tailored = await tailor_resume_async(resume, job_description, model, finish=repair)
+    return await repair(tailored)
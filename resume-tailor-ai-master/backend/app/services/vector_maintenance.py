@@ -0,0 +1,240 @@
+import logging
+import os
+import sqlite3
+import time
+from typing import Dict, Iterator, List, Optional
+
+from app.services.embedding_service import text_hash
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 1000
+# Evict down to this share of a budget, so the next write does not evict again
+LOW_WATER = 0.9
+# Collections a compaction works in, next to the live one
+STAGING_SUFFIX = "__compacting"
+RETIRED_SUFFIX = "__retired"
+
+
+def directory_bytes(path: str) -> int:
+    """Total size of the files under `path` (0 when it does not exist)."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def last_used(metadata: Optional[Dict]) -> float:
+    """When an entry was last written or returned; entries from before LRU tracking use created_at."""
+    metadata = metadata or {}
+    return float(metadata.get("last_used_at", metadata.get("created_at", 0.0)))
+
+
+def iter_entries(collection, include: List[str], where: Optional[Dict] = None,
+                 start: int = 0, limit: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Page through a collection, one `get` of PAGE_SIZE entries at a time;
+    with `limit`, only the `limit` entries from position `start` on.
+    """
+    offset = start
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = PAGE_SIZE if remaining is None else min(PAGE_SIZE, remaining)
+        page = collection.get(where=where, limit=size, offset=offset, include=include)
+        ids = page["ids"]
+        if len(ids) == 0:
+            return
+        for i, entry_id in enumerate(ids):
+            yield {"id": entry_id, **{field: page[field][i] for field in include}}
+        offset += len(ids)
+        if remaining is not None:
+            remaining -= len(ids)
+
+
+def delete_ids(collection, ids: List[str]) -> int:
+    for start in range(0, len(ids), PAGE_SIZE):
+        collection.delete(ids=ids[start:start + PAGE_SIZE])
+    return len(ids)
+
+
+def collection_stats(collection, path: str) -> Dict[str, object]:
+    """Entry counts by type, age range and on-disk size of the store."""
+    by_type: Dict[str, int] = {}
+    oldest = newest = None
+    for entry in iter_entries(collection, ["metadatas"]):
+        metadata = entry["metadatas"] or {}
+        kind = str(metadata.get("type", "unknown"))
+        by_type[kind] = by_type.get(kind, 0) + 1
+        created = metadata.get("created_at")
+        if created is not None:
+            oldest = created if oldest is None else min(oldest, created)
+            newest = created if newest is None else max(newest, created)
+    return {
+        "vectors": collection.count(),
+        "by_type": by_type,
+        "oldest_created_at": oldest,
+        "newest_created_at": newest,
+        "disk_bytes": directory_bytes(path),
+    }
+
+
+def find_existing(collection, ids: List[str]) -> Dict[str, Dict]:
+    """Metadata of the entries among `ids` that are already stored."""
+    if not ids:
+        return {}
+    found = collection.get(ids=ids, include=["metadatas"])
+    return dict(zip(found["ids"], found["metadatas"]))
+
+
+def touch(collection, ids: List[str], metadatas: List[Dict], now: Optional[float] = None) -> None:
+    """Mark entries as used now; `metadatas` are their current, complete metadata."""
+    if not ids:
+        return
+    now = time.time() if now is None else now
+    collection.update(ids=list(ids), metadatas=[{**(m or {}), "last_used_at": now} for m in metadatas])
+
+
+def dedupe(collection) -> int:
+    """
+    Delete entries that repeat an earlier entry's type and content hash,
+    keeping the most recently used copy. Stores written before ids were
+    derived from content hashes hold one copy per request, under a fresh
+    resume id each time and without a stored hash.
+    """
+    keep: Dict[tuple, tuple] = {}
+    duplicates = []
+    for entry in iter_entries(collection, ["metadatas", "documents"]):
+        metadata = entry["metadatas"] or {}
+        content_hash = metadata.get("content_hash")
+        if content_hash is None:
+            # Legacy entry: its resume id names one request, not one resume
+            key = (metadata.get("type"), "", metadata.get("section_type", ""), text_hash(entry["documents"] or ""))
+        else:
+            # Sections of different resumes may share text; only same-resume repeats are duplicates
+            key = (metadata.get("type"), metadata.get("resume_id", ""), metadata.get("section_type", ""),
+                   content_hash)
+        current = (last_used(metadata), entry["id"])
+        if key not in keep:
+            keep[key] = current
+        elif current > keep[key]:
+            duplicates.append(keep[key][1])
+            keep[key] = current
+        else:
+            duplicates.append(entry["id"])
+    return delete_ids(collection, duplicates)
+
+
+def evict_expired(collection, ttl_seconds: float, now: Optional[float] = None,
+                  start: int = 0, limit: Optional[int] = None) -> int:
+    """
+    Delete entries created more than `ttl_seconds` ago; returns how many.
+    Entries from before created_at was recorded count as expired: their
+    age is unknown and their per-request ids are never looked up again.
+    With `limit`, only that window of entries from `start` is examined.
+    """
+    cutoff = (time.time() if now is None else now) - ttl_seconds
+    # A `where` on created_at would skip entries that lack it, so filter here
+    expired = [entry["id"] for entry in iter_entries(collection, ["metadatas"], start=start, limit=limit)
+               if float((entry["metadatas"] or {}).get("created_at", 0.0)) < cutoff]
+    return delete_ids(collection, expired)
+
+
+def evict_lru(collection, max_entries: int, start: int = 0, limit: Optional[int] = None) -> int:
+    """
+    Delete the least recently used entries while more than `max_entries`
+    are stored. With `limit`, candidates come from that window of entries
+    from `start` only, an approximate LRU that successive windows refine.
+    """
+    count = collection.count()
+    if max_entries <= 0 or count <= max_entries:
+        return 0
+    target = int(max_entries * LOW_WATER)
+    entries = sorted((last_used(entry["metadatas"]), entry["id"])
+                     for entry in iter_entries(collection, ["metadatas"], start=start, limit=limit))
+    return delete_ids(collection, [entry_id for _, entry_id in entries[:count - target]])
+
+
+def entry_budget(count: int, disk_bytes: int, max_bytes: int) -> int:
+    """Entries that fit in `max_bytes` at the store's current bytes per entry (0: no byte budget)."""
+    if max_bytes <= 0 or count == 0 or disk_bytes <= max_bytes:
+        return 0
+    return max(1, int(count * max_bytes / disk_bytes))
+
+
+def compact(client, name: str):
+    """
+    Rebuild collection `name` from its live entries and return the new
+    collection. Chroma only marks deleted vectors in its HNSW segment, so
+    after heavy eviction the index keeps its peak size until rebuilt.
+    Callers must keep writers out while this runs; entries are copied a
+    page at a time, so memory stays bounded.
+
+    The old collection is renamed aside before the copy takes its name
+    and only deleted after that, so at every point one complete copy
+    exists; `recover` finishes or undoes a swap cut short by a crash.
+    """
+    old = client.get_collection(name)
+    staging_name = f"{name}{STAGING_SUFFIX}"
+    retired_name = f"{name}{RETIRED_SUFFIX}"
+    try:
+        client.delete_collection(staging_name)  # left over from an interrupted run
+    except Exception:
+        pass
+    staging = client.create_collection(staging_name, metadata=old.metadata)
+    copied = 0
+    offset = 0
+    while True:
+        page = old.get(limit=PAGE_SIZE, offset=offset, include=["embeddings", "documents", "metadatas"])
+        if len(page["ids"]) == 0:
+            break
+        staging.add(ids=page["ids"], embeddings=page["embeddings"],
+                    documents=page["documents"], metadatas=page["metadatas"])
+        copied += len(page["ids"])
+        offset += len(page["ids"])
+    old.modify(name=retired_name)
+    staging.modify(name=name)
+    client.delete_collection(retired_name)
+    logger.info(f"Compacted {name}: {copied} live entries")
+    return client.get_collection(name)
+
+
+def recover(client, name: str) -> None:
+    """
+    Repair what an interrupted `compact` left behind; call before opening
+    collection `name`. A crash mid-swap leaves the complete old copy under
+    its retired name with nothing under `name`, and it is renamed back;
+    retired or staging copies next to a live `name` are deleted.
+    """
+    # Chroma returns names from 0.6 on, Collection objects before
+    existing = {getattr(c, "name", c) for c in client.list_collections()}
+    retired_name, staging_name = f"{name}{RETIRED_SUFFIX}", f"{name}{STAGING_SUFFIX}"
+    if retired_name in existing and name not in existing:
+        client.get_collection(retired_name).modify(name=name)
+        logger.warning(f"Restored {name} from an interrupted compaction")
+        existing |= {name}
+        existing -= {retired_name}
+    for leftover in (retired_name, staging_name):
+        if leftover in existing:
+            client.delete_collection(leftover)
+            logger.info(f"Removed {leftover} left over from an interrupted compaction")
+
+
+def vacuum(path: str) -> int:
+    """
+    VACUUM Chroma's SQLite file to hand freed pages back to the OS; returns
+    bytes reclaimed. Only safe while no client has the store open.
+    """
+    db_path = os.path.join(path, "chroma.sqlite3")
+    if not os.path.exists(db_path):
+        return 0
+    before = os.path.getsize(db_path)
+    connection = sqlite3.connect(db_path)
+    try:
+        connection.execute("VACUUM")
+    finally:
+        connection.close()
+    return before - os.path.getsize(db_path)
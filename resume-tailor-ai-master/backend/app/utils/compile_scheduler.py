@@ -0,0 +1,156 @@
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict
+
+from app.core.config import settings
+from app.core.metrics import compile_wait_seconds
+from app.utils.latex_utils import run_tectonic, preprocess_latex
+
+logger = logging.getLogger(__name__)
+
+_WARM_UP_DOCUMENT = r"""
+\documentclass[11pt]{article}
+\usepackage{geometry}
+\usepackage{hyperref}
+\usepackage{enumitem}
+\begin{document}
+warm-up
+\end{document}
+""".strip()
+
+
+class CompileQueueFullError(Exception):
+    """Raised when the compile queue is at capacity."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Compile queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class CompileScheduler:
+    """
+    Bounded-concurrency scheduler for tectonic builds.
+
+    A fixed number of worker slots each own a working directory that is
+    reused across builds, and all slots share one tectonic cache directory
+    so bundle files and generated formats stay warm between requests.
+    At most `queue_size` jobs may wait for a free slot; beyond that
+    `submit` raises CompileQueueFullError instead of queueing.
+    """
+
+    def __init__(self, workers: int, queue_size: int, timeout: float, work_dir: str):
+        self.workers = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self.timeout = timeout
+        self.root = Path(work_dir).resolve()
+
+        cache_dir = self.root / "tectonic-cache"
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self._env = {**os.environ, "TECTONIC_CACHE_DIR": str(cache_dir)}
+
+        self._slots: "queue.Queue[Path]" = queue.Queue()
+        for i in range(self.workers):
+            slot_dir = self.root / f"slot-{i}"
+            slot_dir.mkdir(parents=True, exist_ok=True)
+            self._slots.put(slot_dir)
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="tectonic")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        # Exponentially weighted average build time, seeds the Retry-After estimate
+        self._avg_seconds = 2.0
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0, "cancelled": 0}
+
+    def submit(self, preprocessed: str) -> "Future[bytes]":
+        """Queue a build of already-preprocessed LaTeX and return its future."""
+        with self._lock:
+            if self._pending >= self.workers + self.queue_size:
+                self._stats["rejected"] += 1
+                raise CompileQueueFullError(self._retry_after())
+            self._pending += 1
+            self._stats["submitted"] += 1
+        future = self._executor.submit(self._run, preprocessed, time.monotonic())
+        future.add_done_callback(self._forget_cancelled)
+        return future
+
+    def _forget_cancelled(self, future: "Future[bytes]") -> None:
+        # A job cancelled while queued never reaches `_run`, which would release its place
+        if future.cancelled():
+            with self._lock:
+                self._pending -= 1
+                self._stats["cancelled"] += 1
+
+    def compile(self, preprocessed: str) -> bytes:
+        """Blocking convenience wrapper around `submit`."""
+        return self.submit(preprocessed).result()
+
+    def _run(self, preprocessed: str, submitted: float) -> bytes:
+        # The executor never runs more jobs than there are slots
+        slot_dir = self._slots.get_nowait()
+        started = time.monotonic()
+        compile_wait_seconds.observe(started - submitted)
+        with self._lock:
+            self._running += 1
+        try:
+            pdf = run_tectonic(slot_dir, preprocessed, timeout=self.timeout, env=self._env)
+            with self._lock:
+                self._stats["completed"] += 1
+            return pdf
+        except Exception:
+            with self._lock:
+                self._stats["failed"] += 1
+            raise
+        finally:
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self._running -= 1
+                self._pending -= 1
+                self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * elapsed
+            self._slots.put(slot_dir)
+
+    def _retry_after(self) -> int:
+        waves = self._pending / self.workers
+        return max(1, int(waves * self._avg_seconds + 0.5))
+
+    def warm_up(self) -> None:
+        """Build a tiny document in the background to populate the tectonic cache."""
+        try:
+            future = self.submit(preprocess_latex(_WARM_UP_DOCUMENT))
+        except CompileQueueFullError:
+            return
+
+        def _log_result(done: "Future[bytes]") -> None:
+            if done.exception() is not None:
+                logger.warning(f"Tectonic warm-up failed: {str(done.exception())}")
+            else:
+                logger.info("Tectonic cache warmed up")
+
+        future.add_done_callback(_log_result)
+
+    def stats(self) -> Dict[str, float]:
+        """Queue depth, slot usage and job counters."""
+        with self._lock:
+            return {
+                **self._stats,
+                "workers": self.workers,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "queue_capacity": self.queue_size,
+                "avg_compile_seconds": round(self._avg_seconds, 3),
+            }
+
+
+# Global compile scheduler instance
+compile_scheduler = CompileScheduler(
+    workers=settings.compile_workers,
+    queue_size=settings.compile_queue_size,
+    timeout=settings.compile_timeout_seconds,
+    work_dir=settings.compile_work_dir,
+)
@@ -1 +1,59 @@
-# Placeholder for file handling utilities
+import codecs
+import logging
+from typing import Optional
+
+from fastapi import UploadFile
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def format_size(num_bytes: int) -> str:
+    """10485760 -> '10MB', 65536 -> '64KB'."""
+    for unit, size in (("MB", 1024 * 1024), ("KB", 1024)):
+        if num_bytes >= size:
+            return f"{num_bytes / size:.3g}{unit}"
+    return f"{num_bytes}B"
+
+
+class UploadTooLargeError(Exception):
+    """The upload is larger than the configured limit."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        super().__init__(f"File size must be less than {format_size(limit)}")
+
+
+class UploadDecodeError(Exception):
+    """The upload is not valid UTF-8 text."""
+
+
+async def read_text_upload(file: UploadFile, max_bytes: int, chunk_size: int = UPLOAD_CHUNK_SIZE) -> str:
+    """
+    Read an uploaded text file in chunks, decoding UTF-8 incrementally.
+
+    Raises UploadTooLargeError as soon as more than `max_bytes` have been
+    read (without reading the rest) and UploadDecodeError on invalid UTF-8.
+    A declared `file.size` over the limit is rejected before reading.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise UploadTooLargeError(max_bytes)
+
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    parts = []
+    total = 0
+    try:
+        while chunk := await file.read(chunk_size):
+            total += len(chunk)
+            if total > max_bytes:
+                raise UploadTooLargeError(max_bytes)
+            parts.append(decoder.decode(chunk))
+        parts.append(decoder.decode(b"", final=True))
+    except UnicodeDecodeError as e:
+        raise UploadDecodeError(f"File is not valid UTF-8 (byte {e.start})") from e
+    return "".join(parts)
+
+
+def is_allowed_file(filename: Optional[str], allowed_types) -> bool:
+    return bool(filename) and any(filename.lower().endswith(ext) for ext in allowed_types)
@@ -1,6 +1,16 @@
+import bisect
+import re
 import tempfile
 import subprocess
+import time
+from collections import Counter
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import compile_seconds, span
+from app.utils.single_flight import compile_flights, flight_key
 
 
 class LatexCompilationError(Exception):
@@ -49,8 +59,279 @@ def _ensure_document_structure(body: str) -> str:
     return template + "\n" + content + closing
 
 
-def preprocess_latex(latex_source: str) -> str:
-    """Normalize incoming LaTeX for compilation."""
+@dataclass(frozen=True)
+class LatexDiagnostic:
+    """One problem found by `validate_latex`; lines and columns are 1-based."""
+    line: int
+    column: int
+    message: str
+    severity: str  # "error": the build fails or garbles; "warning": likely a stray character
+    offset: int
+
+    def __str__(self) -> str:
+        return f"line {self.line}, column {self.column}: {self.message}"
+
+
+class LatexValidationError(LatexCompilationError):
+    """Raised by `preprocess_latex` when the source cannot compile cleanly."""
+
+    def __init__(self, diagnostics: List[LatexDiagnostic]):
+        super().__init__("LaTeX validation failed.\n" + "\n".join(str(d) for d in diagnostics))
+        self.diagnostics = diagnostics
+
+
+_TOKEN = re.compile(r"\\([A-Za-z@]+|.)|[{}$%&#_^\n]", re.S)
+_ENV_NAME = re.compile(r"[ \t]*\{([^{}\\]*)\}")
+_BLANK_LINE = re.compile(r"\n[ \t]*(?=\n)")
+_DEFINITIONS = {
+    "def", "gdef", "edef", "xdef", "newcommand", "renewcommand", "providecommand",
+    "DeclareRobustCommand", "newenvironment", "renewenvironment", "NewDocumentCommand",
+    "RenewDocumentCommand", "NewDocumentEnvironment", "newcolumntype",
+}
+_VERBATIM_ENVS = {"verbatim", "verbatim*", "Verbatim", "lstlisting", "minted", "comment", "filecontents", "filecontents*"}
+# Arguments that are names, files or URLs rather than text: `%`, `#`, `_` are literal there
+_RAW_ARGUMENT = {
+    "url", "path", "href", "label", "ref", "eqref", "pageref", "autoref", "cref", "Cref", "nameref",
+    "cite", "citep", "citet", "nocite", "includegraphics", "input", "include", "includeonly",
+    "bibliography", "bibliographystyle", "usepackage", "RequirePackage", "documentclass",
+    "definecolor", "color", "textcolor", "colorbox",
+}
+_ALIGNMENT_ENV = re.compile(r"tab|array|matrix|align|eqnarray|cases|split", re.I)
+_MATH_ENV = re.compile(r"equation|align|gather|multline|math|eqnarray")
+_BAD_PRIMITIVES = {
+    "pdfgentounicode": "pdfTeX primitive, undefined under XeTeX",
+    "pdfglyphtounicode": "pdfTeX primitive, undefined under XeTeX",
+    "pdfmapfile": "pdfTeX primitive, undefined under XeTeX",
+    "pdfmapline": "pdfTeX primitive, undefined under XeTeX",
+}
+
+
+def _close_brace(text: str, pos: int) -> int:
+    """Index just past the `}` matching the `{` at `pos`, counting braces only; -1 if none."""
+    depth = 0
+    for i in range(pos, len(text)):
+        if text[i] == "{" and text[i - 1] != "\\":
+            depth += 1
+        elif text[i] == "}" and text[i - 1] != "\\":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return -1
+
+
+def _skip_options(text: str, pos: int) -> int:
+    """Skip whitespace and `[...]` optional arguments."""
+    while True:
+        while pos < len(text) and text[pos] in " \t\n":
+            pos += 1
+        if pos < len(text) and text[pos] == "[":
+            close = text.find("]", pos)
+            if close == -1:
+                return pos
+            pos = close + 1
+        else:
+            return pos
+
+
+def validate_latex(source: str, fragment: bool = False, limit: int = 50) -> List[LatexDiagnostic]:
+    """
+    Structural check of LaTeX in a single pass, without running TeX.
+
+    Reports unbalanced braces, mismatched or unclosed environments, math
+    left open at a paragraph end, pdfTeX-only primitives and, for a full
+    document (`fragment=False`), a missing `\\begin{document}` or
+    `\\end{document}`. Unescaped `&`, `#`, `_` and `^` outside the places
+    they are allowed are reported as warnings. Comments, verbatim text and
+    the bodies of macro definitions are not checked for these.
+    At most `limit` diagnostics are returned, in source order.
+    """
+    newlines = [i for i, ch in enumerate(source) if ch == "\n"]
+    found: List[Tuple[int, str, str]] = []
+
+    def report(offset: int, message: str, severity: str = "error") -> None:
+        found.append((offset, message, severity))
+
+    braces: List[int] = []
+    envs: List[Tuple[str, int, int]] = []  # (name, offset, brace depth at \begin)
+    math: Optional[Tuple[str, int]] = None  # (opening delimiter, offset)
+    defining: Optional[int] = None  # brace depth a macro definition started at
+    begun = ended = False
+    pos = 0
+
+    while len(found) < limit:
+        match = _TOKEN.search(source, pos)
+        if match is None:
+            break
+        start, pos = match.start(), match.end()
+        token, name = match.group(0), match.group(1)
+
+        if token == "%":
+            newline = source.find("\n", pos)
+            pos = len(source) if newline == -1 else newline
+        elif token == "\n":
+            if math is not None and defining is None and _BLANK_LINE.match(source, start):
+                report(math[1], f"math opened with '{math[0]}' is not closed before the paragraph ends")
+                math = None
+        elif token == "{":
+            braces.append(start)
+        elif token == "}":
+            if not braces:
+                report(start, "unmatched '}'")
+                continue
+            braces.pop()
+            if defining is not None and len(braces) == defining:
+                # A definition runs over consecutive groups: \newenvironment{x}[1]{...}{...}
+                if not source.startswith("{", _skip_options(source, pos)):
+                    defining = None
+        elif defining is not None:
+            if name == "begin" or name == "end":
+                env = _ENV_NAME.match(source, pos)
+                pos = env.end() if env else pos
+        elif token == "$":
+            if math is None:
+                display = source.startswith("$", pos)
+                math = ("$$" if display else "$", start)
+                pos += display
+            elif math[0] == "$$":
+                if source.startswith("$", pos):
+                    math = None
+                    pos += 1
+            elif math[0] == "$":
+                math = None
+        elif token in ("&", "#"):
+            if token == "#":
+                report(start, "unescaped '#' outside a macro definition (use \\#)", "warning")
+            elif not any(_ALIGNMENT_ENV.search(env_name) for env_name, _, _ in envs):
+                report(start, "unescaped '&' outside a table or alignment (use \\&)", "warning")
+        elif token in ("_", "^"):
+            if math is None and not any(_MATH_ENV.search(env_name) for env_name, _, _ in envs):
+                report(start, f"'{token}' outside math mode (use \\{token}{{}} in text)", "warning")
+        elif name in ("(", "["):
+            if math is None:
+                math = ("\\" + name, start)
+        elif name in (")", "]"):
+            opener = "\\(" if name == ")" else "\\["
+            if math is None:
+                report(start, f"'\\{name}' without an opening '{opener}'")
+            elif math[0] == opener:
+                math = None
+        elif name in _DEFINITIONS:
+            defining = len(braces)
+        elif name == "verb":
+            delimiter = pos + (source.startswith("*", pos))
+            end = source.find(source[delimiter], delimiter + 1) if delimiter < len(source) else -1
+            newline = source.find("\n", delimiter)
+            if end == -1 or (newline != -1 and newline < end):
+                report(start, "\\verb is not closed on its line")
+            else:
+                pos = end + 1
+        elif name == "documentclass" and fragment:
+            report(start, "\\documentclass in a document fragment")
+        elif name in _RAW_ARGUMENT:
+            argument = _skip_options(source, pos)
+            if source.startswith("{", argument):
+                close = _close_brace(source, argument)
+                if close != -1:
+                    pos = close
+        elif name == "write" and source.startswith("18", pos):
+            report(start, "\\write18 runs shell commands, which are disabled")
+        elif name in _BAD_PRIMITIVES:
+            report(start, f"\\{name} is a {_BAD_PRIMITIVES[name]}")
+        if name not in ("begin", "end") or defining is not None:
+            continue
+
+        env = _ENV_NAME.match(source, pos)
+        if env is None:
+            report(start, f"\\{name} without an environment name")
+            continue
+        pos = env.end()
+        env_name = env.group(1).strip()
+        if name == "begin":
+            if env_name in _VERBATIM_ENVS:
+                close = source.find(f"\\end{{{env_name}}}", pos)
+                if close == -1:
+                    report(start, f"\\begin{{{env_name}}} is never closed")
+                    pos = len(source)
+                else:
+                    pos = close + len(env_name) + 6
+                continue
+            if env_name == "document":
+                if fragment:
+                    report(start, "\\begin{document} in a document fragment")
+                elif begun:
+                    report(start, "second \\begin{document}")
+                begun = True
+            envs.append((env_name, start, len(braces)))
+            continue
+
+        open_names = [open_name for open_name, _, _ in envs]
+        if env_name not in open_names:
+            report(start, f"\\end{{{env_name}}} has no matching \\begin")
+        else:
+            while envs[-1][0] != env_name:
+                inner, inner_start, _ = envs.pop()
+                report(inner_start, f"\\begin{{{inner}}} is never closed (\\end{{{env_name}}} comes first)")
+            _, begin_start, depth = envs.pop()
+            if len(braces) > depth:
+                for brace in braces[depth:]:
+                    report(brace, f"'{{' is never closed before \\end{{{env_name}}}")
+                del braces[depth:]
+            elif len(braces) < depth:
+                report(start, f"\\end{{{env_name}}} is outside the brace group its \\begin opened in")
+        if env_name == "document" and not fragment:
+            ended = True
+            break
+
+    if len(found) < limit:
+        for brace in braces:
+            report(brace, "'{' is never closed")
+        for env_name, env_start, _ in envs:
+            if not (env_name == "document" and not fragment):
+                report(env_start, f"\\begin{{{env_name}}} is never closed")
+        if math is not None:
+            report(math[1], f"math opened with '{math[0]}' is never closed")
+        if not fragment and not begun:
+            report(len(source), "missing \\begin{document}")
+        elif not fragment and not ended:
+            report(len(source), "missing \\end{document}")
+
+    diagnostics = []
+    for offset, message, severity in sorted(found, key=lambda item: item[0])[:limit]:
+        line = bisect.bisect_left(newlines, offset)
+        column = offset - (newlines[line - 1] + 1 if line else 0) + 1
+        diagnostics.append(LatexDiagnostic(line + 1, column, message, severity, offset))
+    return diagnostics
+
+
+def new_validation_errors(original: str, revised: str) -> List[LatexDiagnostic]:
+    """
+    Validation errors in `revised` that `original` does not already have.
+    Body-only documents (no \\documentclass, wrapped at compile time) are
+    checked as fragments, so a revision that keeps them body-only is fine.
+    """
+    fragment = "\\documentclass" not in original
+    inherited = Counter(d.message for d in validate_latex(original, fragment=fragment) if d.severity == "error")
+    errors = []
+    for diagnostic in validate_latex(revised, fragment=fragment):
+        if diagnostic.severity != "error":
+            continue
+        if inherited[diagnostic.message]:
+            inherited[diagnostic.message] -= 1
+            continue
+        errors.append(diagnostic)
+    return errors
+
+
+@span("preprocess_latex")
+def preprocess_latex(latex_source: str, validate: bool = False) -> str:
+    """
+    Normalize incoming LaTeX for compilation.
+
+    With `validate`, raises LatexValidationError when `validate_latex`
+    finds errors, so a document that cannot build never reaches tectonic.
+    Previews leave it off: tectonic continues past errors, and a
+    half-edited document still renders.
+    """
     def _sanitize_for_tectonic(text: str) -> str:
         # Remove pdfTeX-specific primitives that fail under XeTeX (tectonic)
         filtered_lines = []
@@ -68,6 +349,10 @@ def preprocess_latex(latex_source: str) -> str:
     without_fences = _strip_code_fences(latex_source)
     sanitized = _sanitize_for_tectonic(without_fences)
     normalized = _ensure_document_structure(sanitized)
+    if validate and settings.latex_validation:
+        errors = [d for d in validate_latex(normalized) if d.severity == "error"]
+        if errors:
+            raise LatexValidationError(errors)
     return normalized
 
 
@@ -76,19 +361,51 @@ def compile_latex_to_pdf(latex_source: str) -> bytes:
     Compile LaTeX source to PDF using the `tectonic` engine.
 
     Returns the compiled PDF bytes if successful, otherwise raises
-    LatexCompilationError with stderr/stdout from the compiler.
+    LatexCompilationError with stderr/stdout from the compiler, or
+    LatexValidationError without running it when the source is
+    structurally broken. Concurrent calls with the same normalized source
+    share one build.
+    """
+    preprocessed = preprocess_latex(latex_source, validate=True)
+    return compile_flights.call(flight_key(preprocessed), lambda: compile_preprocessed_latex(preprocessed))
+
+
+def compile_preprocessed_latex(preprocessed: str) -> bytes:
+    """
+    Compile LaTeX that has already been through `preprocess_latex`.
+
+    Split out so callers that hash the normalized source (e.g. the PDF
+    cache) do not preprocess twice.
     """
     # Safety: keep work inside a temp directory; no shell execution
     with tempfile.TemporaryDirectory(prefix="latex_build_") as work_dir:
-        work_path = Path(work_dir)
-        tex_path = work_path / "resume.tex"
-        pdf_path = work_path / "resume.pdf"
+        return run_tectonic(Path(work_dir), preprocessed)
 
-        preprocessed = preprocess_latex(latex_source)
-        tex_path.write_text(preprocessed, encoding="utf-8")
 
-        # Run tectonic. The -o flag sets output dir. We keep logs for diagnostics.
-        # Note: tectonic returns non-zero on errors; capture output for error reporting.
+def run_tectonic(
+    work_path: Path,
+    preprocessed: str,
+    timeout: Optional[float] = None,
+    env: Optional[Dict[str, str]] = None,
+) -> bytes:
+    """
+    Run a single tectonic build of `preprocessed` inside `work_path`.
+
+    The directory may be reused between builds (see the compile scheduler),
+    so any stale output is removed first. Raises LatexCompilationError on
+    failure or when the build exceeds `timeout` seconds.
+    """
+    tex_path = work_path / "resume.tex"
+    pdf_path = work_path / "resume.pdf"
+
+    if pdf_path.exists():
+        pdf_path.unlink()
+    tex_path.write_text(preprocessed, encoding="utf-8")
+
+    # Run tectonic. The -o flag sets output dir. We keep logs for diagnostics.
+    # Note: tectonic returns non-zero on errors; capture output for error reporting.
+    started = time.perf_counter()
+    try:
         process = subprocess.run(
             [
                 "tectonic",
@@ -98,16 +415,24 @@ def compile_latex_to_pdf(latex_source: str) -> bytes:
                 "-Z",
                 "continue-on-errors",
             ],
-            cwd=work_dir,
+            cwd=str(work_path),
             check=False,
             capture_output=True,
             text=True,
+            timeout=timeout,
+            env=env,
         )
+    except subprocess.TimeoutExpired:
+        # subprocess.run kills the child before re-raising
+        compile_seconds.labels(outcome="timeout").observe(time.perf_counter() - started)
+        raise LatexCompilationError(
+            f"LaTeX compilation timed out after {timeout:g} seconds.")
 
-        if process.returncode != 0 or not pdf_path.exists():
-            message = "LaTeX compilation failed."
-            detail = (process.stdout or "") + "\n" + (process.stderr or "")
-            raise LatexCompilationError(f"{message}\n{detail}")
-
-        return pdf_path.read_bytes()
+    ok = process.returncode == 0 and pdf_path.exists()
+    compile_seconds.labels(outcome="ok" if ok else "error").observe(time.perf_counter() - started)
+    if not ok:
+        message = "LaTeX compilation failed."
+        detail = (process.stdout or "") + "\n" + (process.stderr or "")
+        raise LatexCompilationError(f"{message}\n{detail}")
 
+    return pdf_path.read_bytes()
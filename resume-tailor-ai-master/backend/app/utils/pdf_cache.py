@@ -0,0 +1,162 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def latex_cache_key(preprocessed_latex: str) -> str:
+    """Content hash of preprocessed LaTeX, used as cache key and ETag."""
+    return hashlib.sha256(preprocessed_latex.encode("utf-8")).hexdigest()
+
+
+class PdfCache:
+    """
+    Two-tier content-addressed cache for compiled PDFs.
+
+    The memory tier is an LRU bounded by total bytes; the disk tier stores
+    one file per key and evicts least recently used files once the directory
+    grows past its byte budget.
+    """
+
+    def __init__(self, memory_budget: int, disk_path: Optional[str], disk_budget: int):
+        self.memory_budget = memory_budget
+        self.disk_budget = disk_budget
+        self.disk_path = Path(disk_path) if disk_path else None
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+        if self.disk_path is not None and self.disk_budget > 0:
+            self._load_disk_index()
+
+    def _load_disk_index(self) -> None:
+        """Rebuild the disk LRU order from file modification times."""
+        try:
+            self.disk_path.mkdir(parents=True, exist_ok=True)
+            entries = []
+            for path in self.disk_path.glob("*.pdf"):
+                stat = path.stat()
+                entries.append((stat.st_mtime, path.stem, stat.st_size))
+            for _, key, size in sorted(entries):
+                self._disk[key] = size
+                self._disk_bytes += size
+            self._evict_disk()
+        except OSError as e:
+            logger.error(f"Error loading PDF cache directory: {str(e)}")
+            self.disk_path = None
+
+    def _disk_file(self, key: str) -> Path:
+        return self.disk_path / f"{key}.pdf"
+
+    def _disk_enabled(self) -> bool:
+        return self.disk_path is not None and self.disk_budget > 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached PDF bytes for `key`, promoting disk hits into memory."""
+        with self._lock:
+            pdf = self._memory.get(key)
+            if pdf is not None:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return pdf
+
+            if self._disk_enabled() and key in self._disk:
+                path = self._disk_file(key)
+                try:
+                    pdf = path.read_bytes()
+                    os.utime(path)
+                except OSError:
+                    self._drop_disk_entry(key)
+                else:
+                    self._disk.move_to_end(key)
+                    self._stats["disk_hits"] += 1
+                    self._put_memory(key, pdf)
+                    return pdf
+
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: str, pdf: bytes) -> None:
+        """Store PDF bytes in both tiers."""
+        with self._lock:
+            self._stats["stores"] += 1
+            self._put_memory(key, pdf)
+            if self._disk_enabled() and key not in self._disk:
+                self._put_disk(key, pdf)
+
+    def _put_memory(self, key: str, pdf: bytes) -> None:
+        if len(pdf) > self.memory_budget:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[key] = pdf
+        self._memory_bytes += len(pdf)
+        while self._memory_bytes > self.memory_budget:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self._stats["evictions"] += 1
+
+    def _put_disk(self, key: str, pdf: bytes) -> None:
+        if len(pdf) > self.disk_budget:
+            return
+        try:
+            # Write to a temp file first so readers never see a partial PDF
+            fd, tmp_name = tempfile.mkstemp(dir=self.disk_path, suffix=".tmp")
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(pdf)
+            os.replace(tmp_name, self._disk_file(key))
+        except OSError as e:
+            logger.error(f"Error writing PDF cache entry: {str(e)}")
+            return
+        self._disk[key] = len(pdf)
+        self._disk_bytes += len(pdf)
+        self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        while self._disk_bytes > self.disk_budget and self._disk:
+            key = next(iter(self._disk))
+            self._drop_disk_entry(key)
+            self._stats["evictions"] += 1
+
+    def _drop_disk_entry(self, key: str) -> None:
+        size = self._disk.pop(key, 0)
+        self._disk_bytes -= size
+        try:
+            self._disk_file(key).unlink()
+        except OSError:
+            pass
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters and current tier sizes."""
+        with self._lock:
+            lookups = self._stats["memory_hits"] + self._stats["disk_hits"] + self._stats["misses"]
+            hits = lookups - self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+            }
+
+
+# Global PDF cache instance
+pdf_cache = PdfCache(
+    memory_budget=settings.pdf_cache_memory_bytes,
+    disk_path=settings.pdf_cache_dir,
+    disk_budget=settings.pdf_cache_disk_bytes,
+)
@@ -0,0 +1,133 @@
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.config import settings
+
+
+def flight_key(*parts: Optional[str]) -> str:
+    """Hash of a call's inputs, ignoring line-ending and surrounding-whitespace differences."""
+    digest = hashlib.sha256()
+    for part in parts:
+        text = "" if part is None else str(part)
+        digest.update(text.replace("\r\n", "\n").strip().encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class _Flight:
+    def __init__(self, task: "asyncio.Future"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key onto one computation.
+
+    The first caller for a key starts the work; callers arriving while it
+    runs wait for the same result or exception instead of repeating it.
+    Nothing is kept once the work finishes, so this is not a cache: it
+    only protects bursts of identical requests (double submits, several
+    tabs previewing one document) before any cache is warm.
+
+    `run` is for coroutines. The work runs as its own task, so a caller
+    that is cancelled (e.g. its client disconnected) leaves the others
+    waiting; when the last caller goes the task is cancelled too. `call`
+    is for blocking code: followers block on the leader's thread, which
+    always runs to completion because threads cannot be cancelled.
+    """
+
+    def __init__(self, name: str, enabled: bool = True):
+        self.name = name
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self._futures: Dict[str, Future] = {}
+        self._stats = {"calls": 0, "leaders": 0, "joined": 0, "cancelled": 0, "errors": 0}
+
+    def _count(self, leader: bool) -> None:
+        with self._lock:
+            self._stats["calls"] += 1
+            self._stats["leaders" if leader else "joined"] += 1
+
+    async def run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await `fn()`, or the in-flight run of it already started under `key`."""
+        if not self.enabled:
+            return await fn()
+
+        flight = self._flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = self._flights[key] = _Flight(asyncio.ensure_future(fn()))
+            flight.task.add_done_callback(lambda task: self._landed(key, flight, task))
+        self._count(leader)
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Every caller has gone away; nobody needs the result
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.task.cancel()
+
+    def _landed(self, key: str, flight: _Flight, task: "asyncio.Future") -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        with self._lock:
+            if task.cancelled():
+                self._stats["cancelled"] += 1
+            elif task.exception() is not None:
+                self._stats["errors"] += 1
+
+    def call(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Blocking variant of `run` for code on worker threads."""
+        if not self.enabled:
+            return fn()
+
+        with self._lock:
+            future = self._futures.get(key)
+            leader = future is None
+            if leader:
+                future = self._futures[key] = Future()
+        self._count(leader)
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            with self._lock:
+                self._stats["errors"] += 1
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                if self._futures.get(key) is future:
+                    del self._futures[key]
+
+    def stats(self) -> Dict[str, float]:
+        """How many calls started work and how many shared another's."""
+        with self._lock:
+            return {
+                **self._stats,
+                "coalesce_rate": self._stats["joined"] / self._stats["calls"] if self._stats["calls"] else 0.0,
+                "in_flight": len(self._flights) + len(self._futures),
+            }
+
+
+# Global coalescing groups, one per kind of expensive call
+tailor_flights = SingleFlight("tailor", enabled=settings.coalesce_requests)
+analyze_flights = SingleFlight("analyze", enabled=settings.coalesce_requests)
+compile_flights = SingleFlight("compile", enabled=settings.coalesce_requests)
+
+
+def single_flight_stats() -> Dict[str, Dict[str, float]]:
+    return {flights.name: flights.stats() for flights in (tailor_flights, analyze_flights, compile_flights)}
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the job-posting index at 10k/100k/1M vectors.
+
+Generates clustered unit vectors (real job embeddings are far from
+uniform), inserts them in batches into a fresh JobIndex and reports build
+time, on-disk and resident memory, and query latency for exact brute force
+and IVF search, plus IVF recall@k against the exact result.
+
+Usage: python benchmarks/bench_job_index.py [--sizes 10000 100000 1000000] [--dim 384]
+       [--output index.json]
+"""
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.embedding_service import normalize_rows
+from app.services.job_index import JobIndex
+from results import summarize, write_results
+
+
+def make_vectors(count: int, centers: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    labels = rng.integers(0, len(centers), size=count)
+    noise = rng.standard_normal((count, centers.shape[1])).astype(np.float32) * 0.03
+    return normalize_rows(centers[labels] + noise)
+
+
+def percentile_ms(samples: list, q: float) -> float:
+    return float(np.percentile(samples, q) * 1000)
+
+
+def rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, default=16)
+    parser.add_argument("--batch", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    results = {}
+    print(f"{'vectors':>9} {'insert s':>9} {'ivf s':>7} {'disk MB':>8} {'rss MB':>8} "
+          f"{'exact p50':>10} {'exact p95':>10} {'ivf p50':>8} {'ivf p95':>8} {'recall':>7}")
+
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            index = JobIndex(tmp, dim=args.dim, approx_threshold=0, nprobe=args.nprobe)
+            centers = normalize_rows(rng.standard_normal((max(50, size // 500), args.dim)))
+
+            start = time.perf_counter()
+            for offset in range(0, size, args.batch):
+                count = min(args.batch, size - offset)
+                vectors = make_vectors(count, centers, rng)
+                ids = [f"job-{offset + i}" for i in range(count)]
+                metas = [{"remote": bool((offset + i) % 2)} for i in range(count)]
+                index.upsert(ids, vectors, metas)
+            insert_s = time.perf_counter() - start
+
+            queries = make_vectors(args.queries, centers, rng)
+
+            start = time.perf_counter()
+            index.search(queries[0], top_k=args.top_k)  # trains the IVF index
+            ivf_build_s = time.perf_counter() - start
+
+            exact_times, ivf_times, recalls = [], [], []
+            for query in queries:
+                t = time.perf_counter()
+                exact = index.search(query, top_k=args.top_k, exact=True)
+                exact_times.append(time.perf_counter() - t)
+
+                t = time.perf_counter()
+                approx = index.search(query, top_k=args.top_k)
+                ivf_times.append(time.perf_counter() - t)
+
+                truth = {hit["id"] for hit in exact}
+                recalls.append(len(truth & {hit["id"] for hit in approx}) / max(1, len(truth)))
+
+            disk_mb = index.stats()["bytes"] / 1e6
+            results[f"job_index.insert[n={size}]"] = summarize([insert_s])
+            results[f"job_index.exact_search[n={size}]"] = summarize(exact_times)
+            results[f"job_index.ivf_search[n={size}]"] = summarize(ivf_times)
+            results[f"job_index.ivf_recall[n={size}]"] = summarize(recalls, unit="recall")
+            print(f"{size:>9} {insert_s:>9.2f} {ivf_build_s:>7.2f} {disk_mb:>8.1f} {rss_mb():>8.0f} "
+                  f"{percentile_ms(exact_times, 50):>10.2f} {percentile_ms(exact_times, 95):>10.2f} "
+                  f"{percentile_ms(ivf_times, 50):>8.2f} {percentile_ms(ivf_times, 95):>8.2f} "
+                  f"{np.mean(recalls):>7.3f}")
+
+    write_results(args.output, "job_index", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the shared KeywordMatcher at taxonomy scale.
+
+Builds a synthetic vocabulary of 10k+ skills (one to three words each,
+plus aliases), then scans job descriptions of growing size and reports
+build time and scan throughput. A per-term substring scan, the approach
+extract_job_keywords used before, is timed on the smallest input for
+comparison.
+
+Usage: python benchmarks/bench_keyword_matcher.py [--terms 10000 50000] [--kb 10 100 1000]
+       [--output matcher.json]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.keyword_matcher import DEFAULT_SKILLS, KeywordMatcher
+from results import summarize, write_results
+
+SYLLABLES = ["ka", "lo", "mi", "ne", "ro", "su", "ta", "vi", "ze", "qu", "ix", "or", "em", "ap"]
+FILLER = ("we are hiring an engineer to own services end to end collaborate with product "
+          "and ship reliable features in a fast paced team").split()
+
+
+def make_word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def make_vocabulary(count: int, rng: random.Random) -> dict:
+    skills = {name: list(aliases) for name, aliases in DEFAULT_SKILLS.items()}
+    while len(skills) < count:
+        name = " ".join(make_word(rng) for _ in range(rng.randint(1, 3)))
+        skills[name] = [make_word(rng)] if rng.random() < 0.2 else []
+    return skills
+
+
+def make_job_description(size_kb: int, vocabulary: list, rng: random.Random) -> str:
+    words = []
+    length = 0
+    while length < size_kb * 1024:
+        word = rng.choice(vocabulary) if rng.random() < 0.05 else rng.choice(FILLER)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+def naive_scan(terms: list, text: str) -> list:
+    lowered = text.lower()
+    return [term for term in terms if term in lowered]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--terms", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--kb", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = {}
+
+    for term_count in args.terms:
+        rng = random.Random(args.seed)
+        skills = make_vocabulary(term_count, rng)
+        started = time.perf_counter()
+        matcher = KeywordMatcher(skills)
+        build_s = time.perf_counter() - started
+        results[f"keyword_matcher.build[terms={term_count}]"] = summarize([build_s])
+        names = list(skills)
+        print(f"\n{len(matcher)} skills, built in {build_s * 1e3:.1f} ms")
+        print(f"{'KB':>6} {'scan ms':>10} {'MB/s':>8} {'matches':>8}")
+
+        for size_kb in args.kb:
+            text = make_job_description(size_kb, names, rng)
+            started = time.perf_counter()
+            found = matcher.find_all(text)
+            scan_s = time.perf_counter() - started
+            results[f"keyword_matcher.scan[terms={term_count},kb={size_kb}]"] = summarize([scan_s])
+            print(f"{size_kb:>6} {scan_s * 1e3:>10.2f} {len(text) / 1e6 / scan_s:>8.2f} {len(found):>8}")
+
+        text = make_job_description(args.kb[0], names, rng)
+        lowered_terms = [name.lower() for name in names]
+        started = time.perf_counter()
+        naive_scan(lowered_terms, text)
+        naive_s = time.perf_counter() - started
+        print(f"per-term substring scan, {args.kb[0]} KB: {naive_s * 1e3:.2f} ms")
+
+    write_results(args.output, "keyword_matcher", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
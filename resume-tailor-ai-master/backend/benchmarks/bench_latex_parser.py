@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for parse_latex_resume on synthetic 1-50 page resumes.
+
+Compares the single-pass section tokenizer against the previous
+per-section regex implementation and prints time per KB, which should
+stay flat as documents grow if parsing scales linearly. Note that
+`parse` runs extract_keywords over every section, while the legacy
+parser only kept the first match of ten hardcoded names (cut at the
+first \\subsection), so `index` is the like-for-like column.
+
+Usage: python benchmarks/bench_latex_parser.py [--pages 1 5 10 25 50] [--output parser.json]
+"""
+
+import argparse
+import os
+import re
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.latex_parser import extract_keywords, index_latex_sections, parse_latex_resume
+from corpus import make_resume
+from results import measure, summarize, write_results
+
+
+def legacy_parse(latex_content: str) -> list:
+    """The per-section regex scan parse_latex_resume used before the tokenizer."""
+    section_patterns = {
+        'personal_info': r'\\begin\{document\}.*?\\maketitle(.*?)(?=\\section|\\subsection|$)',
+        'education': r'\\section\{Education\}.*?(?=\\section|\\subsection|$)',
+        'experience': r'\\section\{Experience\}.*?(?=\\section|\\subsection|$)',
+        'skills': r'\\section\{Skills\}.*?(?=\\section|\\subsection|$)',
+        'projects': r'\\section\{Projects\}.*?(?=\\section|\\subsection|$)',
+        'certifications': r'\\section\{Certifications\}.*?(?=\\section|\\subsection|$)',
+        'awards': r'\\section\{Awards\}.*?(?=\\section|\\subsection|$)',
+        'publications': r'\\section\{Publications\}.*?(?=\\section|\\subsection|$)',
+        'languages': r'\\section\{Languages\}.*?(?=\\section|\\subsection|$)',
+        'interests': r'\\section\{Interests\}.*?(?=\\section|\\subsection|$)',
+    }
+    sections = []
+    for section_type, pattern in section_patterns.items():
+        matches = re.findall(pattern, latex_content, re.DOTALL | re.IGNORECASE)
+        if matches and matches[0].strip():
+            sections.append((section_type, extract_keywords(matches[0].strip())))
+    return sections
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 10, 25, 50])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'pages':>5} {'KB':>8} {'index ms':>10} {'parse ms':>10} {'legacy ms':>10} {'parse us/KB':>12}")
+    for pages in args.pages:
+        doc = make_resume(pages)
+        kb = len(doc) / 1024
+        for name, fn in (("index", index_latex_sections), ("parse", parse_latex_resume), ("legacy", legacy_parse)):
+            results[f"latex_parser.{name}[pages={pages}]"] = summarize(
+                measure(lambda: fn(doc), args.repeat, warmup=0))
+        index_s, parse_s, legacy_s = (results[f"latex_parser.{name}[pages={pages}]"]["min"]
+                                      for name in ("index", "parse", "legacy"))
+        print(f"{pages:>5} {kb:>8.1f} {index_s * 1e3:>10.2f} {parse_s * 1e3:>10.2f} "
+              f"{legacy_s * 1e3:>10.2f} {parse_s * 1e6 / kb:>12.1f}")
+
+    write_results(args.output, "latex_parser", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
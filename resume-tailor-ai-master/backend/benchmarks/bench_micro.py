@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the per-request pipeline stages.
+
+Times parse_latex_resume, extract_keywords, extract_job_keywords,
+preprocess_latex and sanitize_model_output on corpus.py inputs of
+several sizes, and RAGService embedding (uncached and cached), section
+storage, vector query and in-memory ranking. `--rag model` uses the
+configured SentenceTransformer and ChromaDB; `--rag hash` swaps in a
+feature-hashing encoder so the cache and store overhead can be measured
+without the model; `auto` uses the model when it is installed and skips
+the RAG cases otherwise. The vector store lives in a temporary directory.
+
+Usage: python benchmarks/bench_micro.py [--pages 1 5 20] [--job-kb 2 20]
+       [--repeat 20] [--rag auto|model|hash|off] [--output micro.json]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import zlib
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+# Parse in this process: the benchmark times the functions, not the pool
+os.environ.setdefault("CPU_WORKERS", "0")
+
+from corpus import make_job_description, make_model_output, make_resume
+from results import measure, summarize, write_results
+
+
+class HashingEncoder:
+    """Bag-of-words feature hashing behind the SentenceTransformer encode interface."""
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+
+    def encode(self, texts, batch_size: int = 32, convert_to_numpy: bool = True):
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                out[row, zlib.crc32(word.encode()) % self.dim] += 1.0
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        return out / np.maximum(norms, 1e-12)
+
+
+def text_cases(args) -> dict:
+    from app.services.ai_service import sanitize_model_output
+    from app.services.latex_parser import extract_keywords, parse_latex_resume
+    from app.services.rag_service import rag_service
+    from app.utils.latex_utils import preprocess_latex
+
+    cases = {}
+    for pages in args.pages:
+        resume = make_resume(pages, args.seed)
+        output = make_model_output(resume)
+        cases[f"parse_latex_resume[pages={pages}]"] = lambda r=resume: parse_latex_resume(r)
+        cases[f"extract_keywords[pages={pages}]"] = lambda r=resume: extract_keywords(r)
+        cases[f"preprocess_latex[pages={pages}]"] = lambda r=resume: preprocess_latex(r)
+        cases[f"sanitize_model_output[pages={pages}]"] = lambda o=output: sanitize_model_output(o)
+    for size_kb in args.job_kb:
+        job = make_job_description(size_kb, args.seed)
+        cases[f"extract_job_keywords[kb={size_kb:g}]"] = lambda j=job: rag_service.extract_job_keywords(j)
+    return cases
+
+
+def rag_service_for(mode: str):
+    """A RAGService with a temporary vector store, or None when RAG cases are skipped."""
+    if mode == "off":
+        return None
+    try:
+        import chromadb  # noqa: F401
+        if mode != "hash":
+            import sentence_transformers  # noqa: F401
+    except ImportError as e:
+        if mode != "auto":
+            raise
+        print(f"Skipping RAG cases: {e}")
+        return None
+
+    from app.core.config import settings
+    from app.services.embedding_service import EmbeddingService
+    from app.services.rag_service import RAGService
+
+    settings.chroma_db_path = tempfile.mkdtemp(prefix="bench_chroma_")
+    service = RAGService()
+    if mode == "hash":
+        encoder = HashingEncoder()
+        service._model = encoder
+        service._embeddings = EmbeddingService(encoder, cache_size=settings.embedding_cache_size)
+    service.warm_up()
+    return service
+
+
+def rag_cases(service, args) -> dict:
+    from app.services.analysis_cache import analysis_cache
+
+    resume = make_resume(args.pages[0], args.seed)
+    job = make_job_description(args.job_kb[0], args.seed)
+    sections = [section.dict() for section in analysis_cache.resume_sections(resume)]
+    counter = iter(range(10 ** 9))
+
+    service.store_resume_sections("bench_resume", sections)
+    return {
+        # A fresh text every call, so each one is encoded
+        "rag.embed_uncached": lambda: service.embed_text(f"{job} {next(counter)}"),
+        "rag.embed_cached": lambda: service.embed_text(job),
+        f"rag.store_sections[n={len(sections)}]": lambda: service.store_resume_sections("bench_resume", sections),
+        "rag.query": lambda: service.find_relevant_sections(job, "bench_resume"),
+        f"rag.rank_sections[n={len(sections)}]": lambda: service.rank_sections(sections, job),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--job-kb", type=float, nargs="+", default=[2, 20])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--rag", choices=["auto", "model", "hash", "off"], default="auto")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    cases = text_cases(args)
+    service = rag_service_for(args.rag)
+    if service is not None:
+        cases.update(rag_cases(service, args))
+
+    results = {}
+    print(f"{'case':<40} {'median ms':>10} {'p95 ms':>10} {'min ms':>10}")
+    for name, fn in cases.items():
+        results[name] = summarize(measure(fn, args.repeat))
+        r = results[name]
+        print(f"{name:<40} {r['median'] * 1e3:>10.3f} {r['p95'] * 1e3:>10.3f} {r['min'] * 1e3:>10.3f}")
+
+    write_results(args.output, "micro", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Compare two benchmark result files and flag regressions.
+
+Results are matched by name. A latency-like result (unit s, ms, MB or
+ratio) regresses when its median grows by more than --threshold; a
+throughput (ops/s) regresses when its median drops by more than that.
+
+Changes within a result's noise floor are ignored: --noise standard
+errors of the difference (from each side's stdev and sample count), and
+never less than the unit's resolution in UNIT_FLOORS (1 us for seconds),
+or --min-delta when given. So a 50 us case that doubles is flagged,
+while run-to-run jitter on a noisy case is not. Exits with status 1 when
+anything regressed, for use in CI.
+
+Usage: python benchmarks/compare.py BASELINE.json CANDIDATE.json [--threshold 0.10] [--noise 2]
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from results import LOWER_IS_BETTER
+
+# Smallest change worth reporting per unit, whatever the measured spread
+UNIT_FLOORS = {"s": 1e-6, "ms": 1e-3, "MB": 0.01, "ratio": 0.001, "ops/s": 0.01}
+
+
+def noise_floor(old: dict, new: dict, noise: float, min_delta: float = None) -> float:
+    """Change below which `old` and `new` are indistinguishable, in their unit."""
+    floor = min_delta if min_delta is not None else UNIT_FLOORS.get(old.get("unit"), 0.0)
+    standard_error = math.sqrt(sum(r.get("stdev", 0.0) ** 2 / max(1, r.get("samples", 1)) for r in (old, new)))
+    return max(floor, noise * standard_error)
+
+
+def compare(baseline: dict, candidate: dict, threshold: float, noise: float, stat: str,
+            min_delta: float = None):
+    """Yield (name, old, new, change, verdict) for every result present in both files."""
+    for name in sorted(set(baseline) | set(candidate)):
+        if name not in baseline or name not in candidate:
+            yield name, baseline.get(name, {}).get(stat), candidate.get(name, {}).get(stat), None, \
+                "added" if name not in baseline else "removed"
+            continue
+        old, new = baseline[name][stat], candidate[name][stat]
+        change = (new - old) / old if old else 0.0
+        worse = change if baseline[name].get("unit") in LOWER_IS_BETTER else -change
+        if abs(new - old) < noise_floor(baseline[name], candidate[name], noise, min_delta):
+            verdict = "same"
+        elif worse > threshold:
+            verdict = "REGRESSED"
+        elif worse < -threshold:
+            verdict = "improved"
+        else:
+            verdict = "same"
+        yield name, old, new, change, verdict
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change that counts")
+    parser.add_argument("--noise", type=float, default=2.0,
+                        help="standard errors of difference a change must exceed")
+    parser.add_argument("--min-delta", type=float,
+                        help="absolute change that counts, in the result's unit (default: per unit)")
+    parser.add_argument("--stat", default="median", help="summary statistic to compare")
+    args = parser.parse_args()
+
+    files = []
+    for path in (args.baseline, args.candidate):
+        with open(path, encoding="utf-8") as f:
+            files.append(json.load(f))
+    baseline, candidate = files
+    for label, data in (("baseline", baseline), ("candidate", candidate)):
+        env = data.get("environment", {})
+        print(f"{label:<9}: {data.get('suite')} @ {env.get('commit')} on {env.get('platform')}, "
+              f"{env.get('cpus')} CPUs, {env.get('timestamp')}")
+    if baseline.get("environment", {}).get("platform") != candidate.get("environment", {}).get("platform"):
+        print("warning: results come from different platforms")
+
+    regressions = 0
+    print(f"\n{'result':<44} {'baseline':>12} {'candidate':>12} {'change':>8}  verdict")
+    for name, old, new, change, verdict in compare(
+            baseline["results"], candidate["results"], args.threshold, args.noise, args.stat, args.min_delta):
+        regressions += verdict == "REGRESSED"
+        old_text = f"{old:.6g}" if old is not None else "-"
+        new_text = f"{new:.6g}" if new is not None else "-"
+        change_text = f"{change:+.1%}" if change is not None else ""
+        print(f"{name:<44} {old_text:>12} {new_text:>12} {change_text:>8}  {verdict}")
+
+    print(f"\n{regressions} regression(s) beyond {args.threshold:.0%}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
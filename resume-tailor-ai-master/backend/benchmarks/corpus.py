@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Synthetic LaTeX resumes and job descriptions for the benchmarks.
+
+Resumes follow the layout of real ones (header block, repeating sections
+with subsections and itemize lists) and job descriptions mix requirement
+bullets with filler prose, both drawing skills from the built-in
+vocabulary so keyword extraction and matching have something to find.
+Output is a pure function of the size and seed, so runs on different
+machines or commits work on identical inputs.
+
+Usage: python benchmarks/corpus.py OUT_DIR [--resumes 10] [--pages 1 5 20]
+       [--jobs 10] [--job-kb 2 20] [--seed 7]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")  # only the skill vocabulary is used
+
+from app.services.keyword_matcher import DEFAULT_SKILLS
+
+SECTION_NAMES = ["Education", "Experience", "Skills", "Projects", "Certifications",
+                 "Awards", "Publications", "Languages", "Interests", "Volunteering"]
+
+SKILLS = sorted(DEFAULT_SKILLS)
+
+VERBS = ["Built", "Led", "Designed", "Migrated", "Optimized", "Automated", "Shipped", "Scaled"]
+OUTCOMES = [r"cutting latency by {n}\%", r"for {n}M users", r"saving \${n}k per year",
+            r"raising test coverage to {n}\%", r"across {n} teams"]
+FILLER = ("we are hiring an engineer to own services end to end collaborate with product "
+          "and ship reliable features in a fast paced team with a strong culture of ownership").split()
+
+BULLETS_PER_SECTION = 15
+
+
+def make_bullet(rng: random.Random) -> str:
+    first, second = rng.sample(SKILLS, 2)
+    outcome = rng.choice(OUTCOMES).format(n=rng.randint(2, 90))
+    return rf"\item {rng.choice(VERBS)} {first} and {second} services, {outcome}."
+
+
+def make_resume(pages: int, seed: int = 7) -> str:
+    """A resume of roughly `pages` pages: three sections of 15 bullets per page."""
+    rng = random.Random(f"resume-{pages}-{seed}")
+    parts = [r"\documentclass[11pt]{article}", r"\usepackage{geometry}", r"\usepackage{enumitem}",
+             r"\begin{document}", r"\maketitle",
+             r"\begin{center}{\Large Jane Doe} \\ jane@example.com\end{center}"]
+    for i in range(pages * 3):
+        parts.append(f"\\section{{{SECTION_NAMES[i % len(SECTION_NAMES)]}}}")
+        parts.append(f"\\subsection{{Role {i}}}")
+        parts.append(r"\begin{itemize}")
+        parts.extend(make_bullet(rng) for _ in range(BULLETS_PER_SECTION))
+        parts.append(r"\end{itemize}")
+    parts.append(r"\end{document}")
+    return "\n".join(parts)
+
+
+def make_job_description(size_kb: float, seed: int = 7) -> str:
+    """A posting of about `size_kb` KB: requirement bullets followed by prose."""
+    rng = random.Random(f"job-{size_kb}-{seed}")
+    target = int(size_kb * 1024)
+    lines = ["Senior Software Engineer", "", "Requirements:"]
+    length = sum(len(line) + 1 for line in lines)
+    for _ in range(max(3, target // 400)):
+        line = f"- {rng.randint(2, 8)}+ years with {rng.choice(SKILLS)} and {rng.choice(SKILLS)}"
+        lines.append(line)
+        length += len(line) + 1
+    lines.append("")
+    words = []
+    while length < target:
+        word = rng.choice(SKILLS) if rng.random() < 0.05 else rng.choice(FILLER)
+        words.append(word)
+        length += len(word) + 1
+    lines.append(" ".join(words))
+    return "\n".join(lines)
+
+
+def make_model_output(resume: str) -> str:
+    """`resume` wrapped the way reasoning models answer: a think block and a code fence."""
+    reasoning = " ".join(["Let me weigh which bullets match the posting."] * 40)
+    return f"<think>{reasoning}</think>\n```latex\n{resume}\n```\nNotes: tailored for the role."
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("out_dir")
+    parser.add_argument("--resumes", type=int, default=10, help="resumes per page count")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--jobs", type=int, default=10, help="job descriptions per size")
+    parser.add_argument("--job-kb", type=float, nargs="+", default=[2, 20])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    manifest = {"seed": args.seed, "resumes": [], "jobs": []}
+    for pages in args.pages:
+        for i in range(args.resumes):
+            name = f"resume-{pages}p-{i}.tex"
+            with open(os.path.join(args.out_dir, name), "w", encoding="utf-8") as f:
+                f.write(make_resume(pages, args.seed + i))
+            manifest["resumes"].append({"file": name, "pages": pages})
+    for size_kb in args.job_kb:
+        for i in range(args.jobs):
+            name = f"job-{size_kb:g}kb-{i}.txt"
+            with open(os.path.join(args.out_dir, name), "w", encoding="utf-8") as f:
+                f.write(make_job_description(size_kb, args.seed + i))
+            manifest["jobs"].append({"file": name, "kb": size_kb})
+    with open(os.path.join(args.out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"Wrote {len(manifest['resumes'])} resumes and {len(manifest['jobs'])} job descriptions to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
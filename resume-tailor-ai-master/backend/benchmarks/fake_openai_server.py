@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Local OpenAI-compatible chat completions server with scripted latency.
+
+Answers POST /v1/chat/completions (plain and `stream: true`) with a small
+LaTeX resume after a configurable delay, so routing, hedging and load can
+be exercised without a provider. Per-model behaviour is set with
+--model MODEL=latency[,error_rate[,stall_rate]]: `latency` is the mean
+delay in seconds, `error_rate` the share of requests answered with 503
+and `stall_rate` the share that hang for --stall seconds. GET /stats
+reports requests seen per model.
+
+Point the backend at it with OPENAI_BASE_URL=http://127.0.0.1:8001/v1.
+
+Usage: python benchmarks/fake_openai_server.py [--port 8001] [--latency 1.0]
+       [--model deepseek/deepseek-r1-0528:free=5,0.1,0.05]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from collections import Counter
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+RESUME = r"""\documentclass{article}
+\begin{document}
+\section{Experience}
+Built Python services on AWS with Docker and Kubernetes.
+\section{Skills}
+Python, Docker, Kubernetes, AWS
+\end{document}"""
+
+
+def parse_model_spec(spec: str):
+    name, _, values = spec.rpartition("=")
+    parts = [float(v) for v in values.split(",")]
+    latency, error_rate, stall_rate = (parts + [0.0, 0.0])[:3]
+    return name, (latency, error_rate, stall_rate)
+
+
+def create_app(latency: float = 1.0, jitter: float = 0.2, stall: float = 600.0,
+               models: dict = None, seed: int = 0) -> FastAPI:
+    """Build the fake server; `models` maps a model id to (latency, error_rate, stall_rate)."""
+    app = FastAPI(title="Fake OpenAI")
+    rng = random.Random(seed)
+    models = models or {}
+    seen = Counter()
+
+    def reply_for(messages: list) -> str:
+        # Section prompts get their section back; everything else gets a full resume
+        prompt = messages[-1]["content"] if messages else ""
+        if "RESUME SECTION:\n" in prompt:
+            return prompt.split("RESUME SECTION:\n", 1)[1].split("\n\nINSTRUCTIONS", 1)[0]
+        return RESUME
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        model = body.get("model", "")
+        seen[model] += 1
+        mean, error_rate, stall_rate = models.get(model, (latency, 0.0, 0.0))
+
+        roll = rng.random()
+        if roll < error_rate:
+            await asyncio.sleep(mean * 0.1)
+            return JSONResponse(status_code=503, content={"error": {"message": "Provider overloaded"}})
+        delay = stall if roll < error_rate + stall_rate else max(0.0, rng.gauss(mean, mean * jitter))
+
+        text = reply_for(body.get("messages", []))
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+
+        if not body.get("stream"):
+            await asyncio.sleep(delay)
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": text}}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            }
+
+        async def chunks():
+            pieces = [text[i:i + 16] for i in range(0, len(text), 16)]
+            # Half the delay is time to first token, the rest is spread over the pieces
+            await asyncio.sleep(delay / 2)
+            for piece in pieces:
+                chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                         "model": model,
+                         "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+                yield f"data: {json.dumps(chunk)}\n\n"
+                await asyncio.sleep(delay / 2 / max(1, len(pieces)))
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    @app.get("/stats")
+    async def stats():
+        return {"requests": dict(seen)}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=1.0, help="default mean delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.2, help="delay std-dev as a share of the mean")
+    parser.add_argument("--stall", type=float, default=600.0, help="delay of a stalled request")
+    parser.add_argument("--model", action="append", default=[], metavar="MODEL=LAT[,ERR[,STALL]]")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    import uvicorn
+    models = dict(parse_model_spec(spec) for spec in args.model)
+    uvicorn.run(create_app(args.latency, args.jitter, args.stall, models, args.seed),
+                host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
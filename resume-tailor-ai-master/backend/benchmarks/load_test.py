@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test of the FastAPI app against a fake LLM provider.
+
+Starts fake_openai_server.py and the backend (uvicorn main:app, pointed
+at the fake server) as subprocesses, then drives the app with
+`--concurrency` clients for `--requests` requests split across the
+scenarios in `--mix`:
+
+  tailor   POST /api/v1/tailor/
+  sections POST /api/v1/tailor/ with mode=sections
+  stream   POST /api/v1/tailor/stream (time to first byte is reported too)
+  analyze  POST /api/v1/resume/analyze
+  compile  POST /api/v1/tailor/compile (needs tectonic)
+
+Inputs come from corpus.py. `--distinct` bounds the number of different
+job descriptions, so repeats exercise the caches; by default every
+request is unique. Use --target to load an already running backend
+instead of starting one. Reports latency percentiles, throughput and
+error rates per scenario.
+
+Admission control is switched off in the started backend unless
+`--clients N` is given: requests then come from N clients (distinct
+X-Forwarded-For addresses, which the backend is told to trust), one of
+which is a noisy neighbour sending `--heavy-share` of all requests.
+Results are reported per client class too (client.heavy, client.light),
+so the effect of per-client rate limits, fair queueing and shedding
+(429/503 counts) on well-behaved clients can be read off directly.
+
+Usage: python benchmarks/load_test.py [--requests 200] [--concurrency 20]
+       [--mix tailor=2,stream=1,analyze=1] [--llm-latency 1.0] [--output load.json]
+       [--clients 10 --heavy-share 0.5]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+from corpus import make_job_description, make_resume
+from results import summarize, write_results
+
+SCENARIOS = {
+    "tailor": ("/api/v1/tailor/", lambda resume, job: {"resume": resume, "job_description": job}),
+    "sections": ("/api/v1/tailor/", lambda resume, job: {"resume": resume, "job_description": job, "mode": "sections"}),
+    "stream": ("/api/v1/tailor/stream", lambda resume, job: {"resume": resume, "job_description": job}),
+    "analyze": ("/api/v1/resume/analyze", lambda resume, job: {"resume_content": resume, "job_description": job}),
+    "compile": ("/api/v1/tailor/compile", lambda resume, job: {"resume": resume, "job_description": ""}),
+}
+
+
+def parse_mix(spec: str) -> dict:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def start(cmd: list, env: dict, log_path: str) -> subprocess.Popen:
+    # Logs go to a file: an unread pipe would fill up and stall the server
+    log = open(log_path, "w")
+    process = subprocess.Popen(cmd, cwd=BACKEND_DIR, env={**os.environ, **env},
+                               stdout=log, stderr=subprocess.STDOUT, text=True)
+    process.log_path = log_path
+    return process
+
+
+def wait_until_up(url: str, process: subprocess.Popen, timeout: float = 120.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            with open(process.log_path) as log:
+                raise SystemExit(f"{url} exited during startup:\n{log.read()}")
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.25)
+    raise SystemExit(f"{url} did not come up within {timeout:g}s")
+
+
+def client_plan(requests: int, clients: int, heavy_share: float, rng: random.Random) -> list:
+    """(address, class) of each request's sender; client 0 is the heavy one."""
+    if clients <= 0:
+        return [(None, None)] * requests
+    senders = []
+    for _ in range(requests):
+        index = 0 if clients == 1 or rng.random() < heavy_share else rng.randrange(1, clients)
+        senders.append((f"10.0.{index // 250}.{index % 250 + 1}", "light" if index else "heavy"))
+    return senders
+
+
+async def run_load(base_url: str, plan: list, concurrency: int, timeout: float) -> dict:
+    """
+    Send every (scenario, body, address, class) in `plan` with `concurrency`
+    workers; returns raw samples per scenario and per client class.
+    """
+    samples = defaultdict(lambda: {"latency": [], "ttfb": [], "status": Counter()})
+    queue = iter(plan)
+
+    async def worker(client: httpx.AsyncClient):
+        for scenario, body, address, kind in queue:
+            path = SCENARIOS[scenario][0]
+            records = [samples[scenario]] + ([samples[f"client.{kind}"]] if kind else [])
+            headers = {"X-Forwarded-For": address} if address else None
+            started = time.perf_counter()
+            try:
+                async with client.stream("POST", path, json=body, headers=headers) as response:
+                    first = None
+                    async for _ in response.aiter_bytes():
+                        if first is None:
+                            first = time.perf_counter() - started
+                    status = response.status_code
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+                first = None
+            elapsed = time.perf_counter() - started
+            for record in records:
+                record["status"][status] += 1
+                if status == 200:
+                    record["latency"].append(elapsed)
+                    if first is not None:
+                        record["ttfb"].append(first)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        wall = time.perf_counter() - started
+    return {"wall_seconds": wall, "scenarios": samples}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--mix", default="tailor=2,stream=1,analyze=1")
+    parser.add_argument("--distinct", type=int, default=0, help="distinct job descriptions (0: all unique)")
+    parser.add_argument("--pages", type=int, default=2, help="resume length")
+    parser.add_argument("--job-kb", type=float, default=3)
+    parser.add_argument("--llm-latency", type=float, default=1.0, help="mean fake provider delay in seconds")
+    parser.add_argument("--llm-jitter", type=float, default=0.2)
+    parser.add_argument("--timeout", type=float, default=300.0, help="per-request client timeout")
+    parser.add_argument("--target", help="URL of a running backend; skips starting one")
+    parser.add_argument("--port", type=int, default=8100, help="backend port (the fake server uses port+1)")
+    parser.add_argument("--env", action="append", default=[], metavar="NAME=VALUE",
+                        help="extra backend setting, e.g. --env PRELOAD_RAG=false")
+    parser.add_argument("--log-dir", default=tempfile.gettempdir(), help="where server logs are written")
+    parser.add_argument("--clients", type=int, default=0,
+                        help="distinct client addresses; enables admission control (0: off)")
+    parser.add_argument("--heavy-share", type=float, default=0.5,
+                        help="share of requests sent by the one heavy client")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    rng = random.Random(args.seed)
+    resume = make_resume(args.pages, args.seed)
+    distinct = args.distinct or args.requests
+    jobs = [make_job_description(args.job_kb, args.seed + i) for i in range(distinct)]
+    names, weights = list(mix), list(mix.values())
+    senders = client_plan(args.requests, args.clients, args.heavy_share, rng)
+    plan = [(scenario, SCENARIOS[scenario][1](resume, jobs[i % distinct]), *senders[i])
+            for i, scenario in enumerate(rng.choices(names, weights, k=args.requests))]
+
+    processes = []
+    try:
+        base_url = args.target
+        if base_url is None:
+            fake_port = args.port + 1
+            fake = start([sys.executable, "benchmarks/fake_openai_server.py", "--port", str(fake_port),
+                          "--latency", str(args.llm_latency), "--jitter", str(args.llm_jitter),
+                          "--seed", str(args.seed)], {}, os.path.join(args.log_dir, "fake_openai_server.log"))
+            processes.append(fake)
+            wait_until_up(f"http://127.0.0.1:{fake_port}/stats", fake)
+
+            env = {"OPENAI_BASE_URL": f"http://127.0.0.1:{fake_port}/v1", "OPENAI_API_KEY": "load-test",
+                   "COMPILE_WARM_UP": "false"}
+            if args.clients:
+                env["ADMISSION_TRUST_FORWARDED"] = "true"
+            else:
+                env["ADMISSION_ENABLED"] = "false"
+            env.update(item.split("=", 1) for item in args.env)
+            backend = start([sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port),
+                             "--log-level", "warning"], env, os.path.join(args.log_dir, "backend.log"))
+            processes.append(backend)
+            base_url = f"http://127.0.0.1:{args.port}"
+            wait_until_up(f"{base_url}/health/live", backend)
+
+        print(f"{args.requests} requests, concurrency {args.concurrency}, mix {mix} against {base_url}"
+              + (f", {args.clients} clients ({args.heavy_share:.0%} heavy)" if args.clients else ""))
+        raw = asyncio.run(run_load(base_url, plan, args.concurrency, args.timeout))
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=30)
+
+    wall = raw["wall_seconds"]
+    results = {}
+    print(f"{'scenario':<13} {'ok':>6} {'errors':>7} {'req/s':>8} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8} {'ttfb p50':>9}")
+    for scenario, record in sorted(raw["scenarios"].items()):
+        total = sum(record["status"].values())
+        ok = record["status"][200]
+        results[f"load.{scenario}.error_rate"] = {"unit": "ratio", "samples": total,
+                                                 "median": (total - ok) / total if total else 0.0}
+        results[f"load.{scenario}.throughput"] = {"unit": "ops/s", "samples": ok, "median": ok / wall}
+        line = f"{scenario:<13} {ok:>6} {total - ok:>7} {ok / wall:>8.2f}"
+        if record["latency"]:
+            latency = results[f"load.{scenario}.latency"] = summarize(record["latency"])
+            ordered = sorted(record["latency"])
+            latency["p99"] = ordered[min(len(ordered) - 1, int(round(0.99 * (len(ordered) - 1))))]
+            line += f" {latency['median']:>8.3f} {latency['p95']:>8.3f} {latency['p99']:>8.3f}"
+        if record["ttfb"] and scenario == "stream":
+            ttfb = results[f"load.{scenario}.ttfb"] = summarize(record["ttfb"])
+            line += f" {ttfb['median']:>9.3f}"
+        print(line)
+        errors = {str(k): v for k, v in record["status"].items() if k != 200}
+        if errors:
+            print(f"{'':<13} non-200 responses: {json.dumps(errors)}")
+
+    params = {**vars(args), "mix": mix}
+    write_results(args.output, "load", params, results)
+
+
+if __name__ == "__main__":
+    main()
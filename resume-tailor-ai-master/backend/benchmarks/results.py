@@ -0,0 +1,76 @@
+"""
+Timing helpers and the JSON result format shared by the benchmarks.
+
+A result file looks like
+
+    {"suite": "micro", "environment": {...}, "params": {...},
+     "results": {"parse_latex_resume[pages=5]": {"unit": "s", "median": ..., ...}}}
+
+Every result has a `unit` and summary statistics; "s" results are
+latencies and "ratio" results error rates (lower is better), "ops/s"
+results are throughputs (higher is better). compare.py matches results
+by name across two files.
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+LOWER_IS_BETTER = {"s", "ms", "MB", "ratio"}
+
+
+def measure(fn: Callable[[], object], repeat: int, warmup: int = 1) -> List[float]:
+    """Seconds per call of `fn`, after `warmup` untimed calls."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def summarize(samples: List[float], unit: str = "s") -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "unit": unit,
+        "samples": len(ordered),
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "mean": statistics.fmean(ordered),
+        "p95": ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+        "stdev": statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+    }
+
+
+def environment() -> Dict[str, object]:
+    """Where and on which commit the run happened; results only compare well on one machine."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def write_results(path: Optional[str], suite: str, params: Dict[str, object],
+                  results: Dict[str, Dict[str, float]]) -> None:
+    """Write a result file to `path` (nothing when `path` is empty)."""
+    if not path:
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"suite": suite, "environment": environment(), "params": params, "results": results},
+                  f, indent=2)
+    print(f"Results written to {path}")
@@ -1,11 +1,20 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.v1.endpoints import tailor, resume
+from fastapi.responses import JSONResponse, Response
+from app.api.v1.endpoints import tailor, resume, jobs
+from app.core.config import settings
+from app.core.executors import executor_stats
+from app.core.lifespan import lifespan, startup_state
+from app.core.metrics import CONTENT_TYPE, render_metrics
+from app.core.admission import admission_controller
+from app.core.middleware import AdmissionControlMiddleware, BodySizeLimitMiddleware, RequestMetricsMiddleware
+from app.core.profiler import SamplingProfiler
 
 app = FastAPI(
     title="Resume Tailor AI",
     description="AI-powered resume tailoring using RAG and vector databases",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.include_router(
@@ -20,6 +29,20 @@ app.include_router(
     tags=["Resume"]
 )
 
+app.include_router(
+    router=jobs.router,
+    prefix="/api/v1/jobs",
+    tags=["Jobs"]
+)
+
+# Innermost, so 429/503 refusals still carry CORS headers
+if settings.admission_enabled:
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        controller=admission_controller,
+        trust_forwarded=settings.admission_trust_forwarded,
+    )
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -27,6 +50,32 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Cache", "Retry-After"],
+)
+
+# Cut off oversized uploads while they are being received; per-file limits
+# are enforced again by the endpoints. Allows multipart overhead per file.
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_bytes=settings.max_upload_files * (settings.max_file_size + 64 * 1024),
+    paths=["/api/v1/resume/upload/batch"],
+)
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_bytes=settings.max_file_size + 64 * 1024,
+    paths=["/api/v1/resume/upload"],
+)
+
+# Outermost, so request timings include the middlewares above
+profiler = SamplingProfiler(
+    interval=settings.profiler_interval_seconds,
+    slow_seconds=settings.profiler_slow_seconds,
+    output_dir=settings.profiler_output_dir,
+) if settings.profiler_enabled else None
+app.add_middleware(
+    RequestMetricsMiddleware,
+    server_timing=settings.server_timing,
+    profiler=profiler,
 )
 
 @app.get("/")
@@ -35,7 +84,34 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    return {"status": "healthy", **startup_state.report()}
+
+@app.get("/health/live")
+async def liveness_check():
+    return {"status": "live"}
+
+@app.get("/health/ready")
+async def readiness_check():
+    report = startup_state.report()
+    if not report["ready"]:
+        return JSONResponse(status_code=503, content={"status": "starting", **report})
+    return {"status": "ready", **report}
+
+@app.get("/health/executors")
+async def executors_check():
+    """Queue depth and saturation of the CPU, I/O and compile pools."""
+    return executor_stats()
+
+@app.get("/health/admission")
+async def admission_check():
+    """Rate-limit, queueing and load-shedding decisions per route tier."""
+    return {"enabled": settings.admission_enabled, **admission_controller.stats()}
+
+if settings.metrics_enabled:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics_endpoint():
+        """Stage, LLM, compile and cache metrics in the Prometheus text format."""
+        return Response(render_metrics(), media_type=CONTENT_TYPE)
 
 if __name__ == "__main__":
     import uvicorn
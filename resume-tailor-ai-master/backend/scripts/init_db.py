@@ -1,33 +1,113 @@
 #!/usr/bin/env python3
 """
-Database initialization script for Resume Tailor AI
-Creates the ChromaDB collection and optionally adds sample data
+Database initialization and maintenance script for Resume Tailor AI
+Creates the ChromaDB collection, reports its size and runs the
+maintenance jobs (dedup, TTL, LRU eviction, compaction) offline
+
+Usage: python scripts/init_db.py [init|stats|dedupe|expire|evict|compact|maintain|vacuum]
+       python scripts/init_db.py evict --max-entries 50000
+       python scripts/init_db.py vacuum   # with the server stopped
 """
 
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import argparse
+import json
 import logging
 
+from app.core.config import settings
+from app.services import vector_maintenance
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def init_database():
+
+def get_rag_service():
+    # Opening the store never loads the embedding model
+    from app.services.rag_service import rag_service
+    return rag_service
+
+
+def init_database(args):
     """Initialize the database with basic setup"""
+    get_rag_service().collection
+    logger.info("Database initialized successfully")
+    logger.info(f"ChromaDB collection 'resume_job_matches' is ready in {settings.chroma_db_path}")
+    return {}
+
+
+def report_stats(args):
+    return get_rag_service().stats()
+
+
+def dedupe(args):
+    return {"duplicates_removed": vector_maintenance.dedupe(get_rag_service().collection)}
+
+
+def expire(args):
+    return {"expired": get_rag_service().collect_garbage(args.ttl)}
+
+
+def evict(args):
+    collection = get_rag_service().collection
+    limits = [args.max_entries, vector_maintenance.entry_budget(
+        collection.count(), vector_maintenance.directory_bytes(settings.chroma_db_path), args.max_bytes)]
+    limits = [limit for limit in limits if limit > 0]
+    return {"evicted": vector_maintenance.evict_lru(collection, min(limits)) if limits else 0}
+
+
+def compact(args):
+    return get_rag_service().run_maintenance(compact=True)
+
+
+def maintain(args):
+    """Every job except vacuum, followed by a size report"""
+    result = dedupe(args)
+    result.update(get_rag_service().run_maintenance(compact=True))
+    result["stats"] = report_stats(args)
+    return result
+
+
+def vacuum(args):
+    """Shrink the SQLite file; no client may have the store open"""
+    before = vector_maintenance.directory_bytes(settings.chroma_db_path)
+    reclaimed = vector_maintenance.vacuum(settings.chroma_db_path)
+    return {"disk_bytes_before": before, "bytes_reclaimed": reclaimed}
+
+
+COMMANDS = {
+    "init": (init_database, "create the collection"),
+    "stats": (report_stats, "vector counts by type and on-disk size"),
+    "dedupe": (dedupe, "delete repeated copies of identical documents"),
+    "expire": (expire, "delete entries older than the TTL"),
+    "evict": (evict, "delete least recently used entries over the size budget"),
+    "compact": (compact, "expire, evict, then rebuild the index from live entries"),
+    "maintain": (maintain, "dedupe, expire, evict and compact, then report"),
+    "vacuum": (vacuum, "shrink the SQLite file (server must be stopped)"),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create, inspect and maintain the ChromaDB store")
+    parser.add_argument("command", nargs="?", default="init", choices=COMMANDS,
+                        help="; ".join(f"{name}: {help}" for name, (_, help) in COMMANDS.items()))
+    parser.add_argument("--ttl", type=float, default=settings.rag_ttl_seconds, help="seconds, for expire")
+    parser.add_argument("--max-entries", type=int, default=settings.rag_max_entries, help="for evict")
+    parser.add_argument("--max-bytes", type=int, default=settings.rag_max_bytes, help="for evict")
+    args = parser.parse_args()
+
     try:
-        # The RAG service will automatically create the collection
-        logger.info("Database initialized successfully")
-        logger.info("ChromaDB collection 'resume_job_matches' is ready")
-        return True
+        result = COMMANDS[args.command][0](args)
     except Exception as e:
-        logger.error(f"Failed to initialize database: {str(e)}")
-        return False
+        logger.error(f"{args.command} failed: {str(e)}")
+        print(f"❌ {args.command} failed")
+        sys.exit(1)
+    if result:
+        print(json.dumps(result, indent=2))
+    print(f"✅ {args.command} done")
+
 
 if __name__ == "__main__":
-    success = init_database()
-    if success:
-        print("✅ Database initialized successfully")
-    else:
-        print("❌ Database initialization failed")
-        sys.exit(1) 
\ No newline at end of file
+    main()
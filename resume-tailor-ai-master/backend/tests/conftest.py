@@ -0,0 +1,10 @@
+import os
+import sys
+
+# Settings refuse to load without a key; tests never reach the real provider
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("PRELOAD_RAG", "false")
+os.environ.setdefault("COMPILE_WARM_UP", "false")
+os.environ.setdefault("CPU_WORKERS", "0")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
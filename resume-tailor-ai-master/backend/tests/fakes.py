@@ -0,0 +1,122 @@
+"""In-memory stand-ins for the embedding model and the parts of the ChromaDB client API the app uses."""
+import re
+
+import numpy as np
+
+
+class WordModel:
+    """Bag-of-words "sentence embedding" over a fixed vocabulary; records encode calls."""
+
+    def __init__(self, vocabulary):
+        self.vocabulary = {word: i for i, word in enumerate(vocabulary)}
+        self.calls = []
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return len(self.vocabulary) + 1
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True):
+        self.calls.append(list(texts))
+        vectors = np.zeros((len(texts), len(self.vocabulary) + 1), dtype=np.float32)
+        for row, text in enumerate(texts):
+            vectors[row, -1] = 0.01  # never all zeros
+            for word in re.findall(r"[a-z]+", text.lower()):
+                if word in self.vocabulary:
+                    vectors[row, self.vocabulary[word]] += 1
+        return vectors
+
+
+class FakeCollection:
+    def __init__(self, name: str, metadata=None):
+        self.name = name
+        self.metadata = metadata
+        self.entries = {}  # id -> {"embeddings", "documents", "metadatas"}
+        self.client = None
+
+    def count(self) -> int:
+        return len(self.entries)
+
+    def _matches(self, metadata, where) -> bool:
+        return not where or all((metadata or {}).get(k) == v for k, v in where.items())
+
+    def get(self, ids=None, where=None, limit=None, offset=None, include=("metadatas", "documents")):
+        selected = [i for i in (ids if ids is not None else self.entries)
+                    if i in self.entries and self._matches(self.entries[i]["metadatas"], where)]
+        selected = selected[offset or 0:][:limit]
+        page = {"ids": selected}
+        for field in include:
+            page[field] = [self.entries[i][field] for i in selected]
+        return page
+
+    def add(self, ids, embeddings=None, documents=None, metadatas=None):
+        for entry_id in ids:
+            if entry_id in self.entries:
+                raise ValueError(f"duplicate id {entry_id}")
+        self.upsert(ids, embeddings, documents, metadatas)
+
+    def upsert(self, ids, embeddings=None, documents=None, metadatas=None):
+        for n, entry_id in enumerate(ids):
+            self.entries[entry_id] = {
+                "embeddings": None if embeddings is None else list(embeddings[n]),
+                "documents": None if documents is None else documents[n],
+                "metadatas": None if metadatas is None else dict(metadatas[n]),
+            }
+
+    def update(self, ids, metadatas):
+        for entry_id, metadata in zip(ids, metadatas):
+            if entry_id in self.entries:
+                self.entries[entry_id]["metadatas"] = dict(metadata)
+
+    def delete(self, ids):
+        for entry_id in ids:
+            self.entries.pop(entry_id, None)
+
+    def query(self, query_embeddings, n_results, where=None):
+        query = np.asarray(query_embeddings[0], dtype=np.float32)
+        candidates = [(i, e) for i, e in self.entries.items() if self._matches(e["metadatas"], where)]
+        candidates.sort(key=lambda item: -float(np.dot(item[1]["embeddings"], query)))
+        candidates = candidates[:n_results]
+        return {
+            "ids": [[i for i, _ in candidates]],
+            "documents": [[e["documents"] for _, e in candidates]],
+            "metadatas": [[e["metadatas"] for _, e in candidates]],
+            "distances": [[1 - float(np.dot(e["embeddings"], query)) for _, e in candidates]],
+        }
+
+    def modify(self, name=None, metadata=None):
+        if name is not None:
+            self.client._rename(self, name)
+
+
+class FakeClient:
+    def __init__(self):
+        self.collections = {}
+
+    def _rename(self, collection, name):
+        if name in self.collections:
+            raise ValueError(f"collection {name} already exists")
+        del self.collections[collection.name]
+        collection.name = name
+        self.collections[name] = collection
+
+    def list_collections(self):
+        return list(self.collections)
+
+    def create_collection(self, name, metadata=None):
+        if name in self.collections:
+            raise ValueError(f"collection {name} already exists")
+        collection = self.collections[name] = FakeCollection(name, metadata)
+        collection.client = self
+        return collection
+
+    def get_collection(self, name):
+        if name not in self.collections:
+            raise ValueError(f"collection {name} does not exist")
+        return self.collections[name]
+
+    def get_or_create_collection(self, name, metadata=None):
+        return self.collections.get(name) or self.create_collection(name, metadata)
+
+    def delete_collection(self, name):
+        if name not in self.collections:
+            raise ValueError(f"collection {name} does not exist")
+        del self.collections[name]
@@ -0,0 +1,185 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.admission import AdmissionController, AdmissionRejected, FairQueue, Tier
+from app.core.middleware import AdmissionControlMiddleware
+
+
+def controller(per_minute: float = 6000, burst: float = 100, capacity: int = 4, max_delay: float = 1.0,
+               max_wait: float = 5.0, target_wait: float = 1.0, interval: float = 1.0) -> AdmissionController:
+    tiers = {
+        "cheap": Tier("cheap", per_minute, burst, cost=1, shed_level=0),
+        "medium": Tier("medium", per_minute, burst, cost=1, shed_level=0),
+        "expensive": Tier("expensive", per_minute, burst, cost=2, shed_level=1),
+    }
+    return AdmissionController(tiers, capacity, max_delay, max_wait, target_wait, interval)
+
+
+def test_rate_limited_client_gets_429_with_retry_after():
+    app = FastAPI()
+
+    @app.post("/api/v1/tailor/compile")
+    async def compile_endpoint():
+        return {"ok": True}
+
+    limits = controller(per_minute=6, burst=1, max_delay=0.0)
+    app.add_middleware(AdmissionControlMiddleware, controller=limits, trust_forwarded=True)
+
+    with TestClient(app) as client:
+        first = client.post("/api/v1/tailor/compile", headers={"X-Forwarded-For": "10.0.0.1"})
+        second = client.post("/api/v1/tailor/compile/", headers={"X-Forwarded-For": "10.0.0.1"})
+        other = client.post("/api/v1/tailor/compile", headers={"X-Forwarded-For": "10.0.0.2"})
+
+    assert first.status_code == 200
+    assert second.status_code == 429
+    # One token every 10s, none left
+    assert 9 <= int(second.headers["Retry-After"]) <= 10
+    assert second.json() == {"detail": "Rate limit exceeded for medium requests."}
+    assert other.status_code == 200
+    assert limits.stats()["tiers"]["medium"]["rate_limited"] == 1
+    assert limits.stats()["in_use"] == 0
+
+
+def test_client_over_its_rate_is_delayed_before_refused():
+    async def scenario():
+        limits = controller(per_minute=600, burst=1, max_delay=0.15)
+        results = await asyncio.gather(*(limits.admit("a", "cheap") for _ in range(3)), return_exceptions=True)
+        return limits, results
+
+    limits, results = asyncio.run(scenario())
+    # The first has a token, the second waits 0.1s for one, the third would wait 0.2s
+    assert results[:2] == [1, 1]
+    assert isinstance(results[2], AdmissionRejected) and results[2].status == 429
+    assert results[2].retry_after == pytest.approx(0.05, abs=0.02)
+    assert limits.stats()["tiers"]["cheap"]["delayed"] == 1
+
+
+def test_fair_queue_serves_a_light_client_ahead_of_a_heavy_backlog():
+    async def scenario():
+        queue = FairQueue(capacity=1)
+        await queue.acquire("heavy", 1, None)
+        order = []
+
+        async def request(client: str):
+            await queue.acquire(client, 1, None)
+            order.append(client)
+            await asyncio.sleep(0)
+            queue.release(1)
+
+        heavy = [asyncio.create_task(request("heavy")) for _ in range(5)]
+        await asyncio.sleep(0)
+        light = asyncio.create_task(request("light"))
+        await asyncio.sleep(0)
+        queue.release(1)
+        await asyncio.gather(*heavy, light)
+        return queue, order
+
+    queue, order = asyncio.run(scenario())
+    # "heavy" already holds a unit, so the light request goes ahead of its whole backlog
+    assert order[0] == "light"
+    assert order.count("heavy") == 5
+    assert queue.in_use == 0 and queue.waiting() == 0
+
+
+def test_shed_level_rises_under_sustained_queueing_and_falls_after():
+    async def scenario():
+        limits = controller(capacity=2, target_wait=0.05, interval=0.1)
+        held = await limits.admit("a", "expensive")
+        queued = asyncio.create_task(limits.admit("b", "cheap"))
+        await asyncio.sleep(0.15)
+        # A new window starts; the grant to "a" had no wait, so no overload yet
+        ticking = asyncio.create_task(limits.admit("c", "cheap"))
+        await asyncio.sleep(0.15)
+        # A whole window in which the oldest waiter sat past the target
+        with pytest.raises(AdmissionRejected) as shed:
+            await limits.admit("d", "expensive")
+        level_when_shed = limits.level
+        # Cheap requests are never shed
+        cheap = asyncio.create_task(limits.admit("e", "cheap"))
+
+        limits.release(held)
+        for task in (queued, ticking, cheap):
+            limits.release(await task)
+        for _ in range(2):
+            await asyncio.sleep(0.15)
+            limits.release(await limits.admit("f", "cheap"))
+        return limits, shed.value, level_when_shed
+
+    limits, shed, level_when_shed = asyncio.run(scenario())
+    assert shed.status == 503 and shed.retry_after > 0
+    assert level_when_shed == 1
+    assert limits.level == 0
+    assert limits.stats()["tiers"]["expensive"]["shed"] == 1
+    assert limits.stats()["in_use"] == 0
+
+
+def test_waiter_admitted_as_it_gives_up_hands_its_units_on():
+    async def scenario():
+        queue = FairQueue(capacity=1)
+        await queue.acquire("a", 1, None)
+        giving_up = asyncio.create_task(queue.acquire("b", 1, 10))
+        next_in_line = asyncio.create_task(queue.acquire("c", 1, 10))
+        await asyncio.sleep(0)
+        # "b" gives up (times out or is cancelled) and is granted the unit before it resumes
+        giving_up.cancel()
+        queue.release(1)
+        with pytest.raises(asyncio.CancelledError):
+            await giving_up
+        await asyncio.wait_for(next_in_line, 1)
+        return queue
+
+    queue = asyncio.run(scenario())
+    assert queue.in_use == 1 and queue.waiting() == 0
+
+
+def test_queue_timeout_is_a_503_and_leaves_no_waiter():
+    async def scenario():
+        limits = controller(capacity=1, max_wait=0.05)
+        held = await limits.admit("a", "cheap")
+        with pytest.raises(AdmissionRejected) as timed_out:
+            await limits.admit("b", "cheap")
+        waiting = limits.queue.waiting()
+        limits.release(held)
+        return limits, timed_out.value, waiting
+
+    limits, timed_out, waiting = asyncio.run(scenario())
+    assert timed_out.status == 503 and waiting == 0
+    assert limits.stats()["in_use"] == 0
+
+
+def test_batch_items_are_charged_to_the_submitting_client(monkeypatch):
+    from app.schemas.tailor import BatchTailorRequest
+    from app.services import batch_service
+
+    limits = controller(per_minute=600, burst=1)
+    monkeypatch.setattr(batch_service, "admission_controller", limits)
+    monkeypatch.setattr(batch_service, "_prepare_shared_work", lambda items: None)
+    in_use = []
+
+    async def tailor(resume, job_description, model):
+        in_use.append(limits.queue.in_use)
+        return resume
+
+    async def analyze(resume, job_description):
+        return {}
+
+    monkeypatch.setattr(batch_service, "tailor_resume_checked_async", tailor)
+    monkeypatch.setattr(batch_service, "analyze_resume_job_match_async", analyze)
+
+    async def scenario():
+        manager = batch_service.BatchJobManager(ttl=60)
+        job = manager.submit(BatchTailorRequest(resume="r", job_descriptions=["j1", "j2", "j3"], concurrency=3),
+                             client="10.0.0.1")
+        await job.task
+        return job
+
+    job = asyncio.run(scenario())
+    assert job.snapshot().completed == 3
+    stats = limits.stats()["tiers"]["expensive"]
+    # One token at once, then one every 0.1s for the same client
+    assert stats["admitted"] == 3 and stats["delayed"] == 2
+    assert all(units >= 2 for units in in_use)
+    assert limits.stats()["in_use"] == 0
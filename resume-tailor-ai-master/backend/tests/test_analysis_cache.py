@@ -0,0 +1,88 @@
+from app.services import analysis_cache as analysis_module
+from app.services.analysis_cache import DocumentAnalysisCache
+from app.utils import ttl_cache
+from app.utils.ttl_cache import TTLCache
+
+RESUME = "\\begin{document}\n\\section{Skills}\nPython and Docker\n\\end{document}"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_expire_after_their_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ttl_cache.time, "monotonic", clock)
+    cache = TTLCache(max_entries=10, ttl=5)
+    cache.put("a", 1)
+
+    clock.now += 5
+    assert cache.get("a") == 1
+    clock.now += 0.1
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["expirations"] == 1 and stats["entries"] == 0
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_entries=2, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_get_or_compute_computes_once_and_zero_size_stores_nothing():
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return "value"
+
+    cache = TTLCache(max_entries=4, ttl=60)
+    assert cache.get_or_compute("k", compute) == cache.get_or_compute("k", compute) == "value"
+    assert len(calls) == 1
+
+    disabled = TTLCache(max_entries=0, ttl=60)
+    disabled.get_or_compute("k", compute)
+    disabled.get_or_compute("k", compute)
+    assert len(calls) == 3 and disabled.stats()["entries"] == 0
+
+
+def test_each_document_is_analyzed_once(monkeypatch):
+    analyzed = []
+    real = analysis_module._analyze
+
+    def counting(stage, fn, text):
+        analyzed.append(stage)
+        return real(stage, fn, text)
+
+    monkeypatch.setattr(analysis_module, "_analyze", counting)
+    cache = DocumentAnalysisCache(max_entries=8, ttl=60)
+
+    sections = cache.resume_sections(RESUME)
+    assert cache.resume_keywords(RESUME) == ["Python", "Docker"]
+    assert cache.job_keywords("Python, k8s and Docker") == cache.job_keywords("Python, k8s and Docker")
+    assert analyzed == ["parse_resume", "extract_job_keywords"]
+    assert [s.section_type for s in sections] == ["skills"]
+
+    # Callers get their own list, so appending to it leaves the cache alone
+    sections.append(sections[0])
+    assert len(cache.resume_sections(RESUME)) == 1
+    assert cache.stats()["resumes"]["hits"] == 2
+
+
+def test_different_content_is_analyzed_separately():
+    cache = DocumentAnalysisCache(max_entries=8, ttl=60)
+    assert cache.job_keywords("Python") == ["python"]
+    assert cache.job_keywords("Java") == ["java"]
+    cache.clear()
+    assert cache.stats()["jobs"]["entries"] == 0
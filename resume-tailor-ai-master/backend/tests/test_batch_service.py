@@ -0,0 +1,124 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.schemas.tailor import BatchTailorRequest, TailorPair
+from app.services import batch_service
+from app.services.batch_service import BatchJobManager
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Stub the per-item work; records prepared items and peak tailoring concurrency."""
+    record = {"prepared": [], "running": 0, "peak": 0}
+
+    async def tailor(resume, job_description, model):
+        record["running"] += 1
+        record["peak"] = max(record["peak"], record["running"])
+        await asyncio.sleep(0.01)
+        record["running"] -= 1
+        if "fail" in job_description:
+            raise RuntimeError("provider down")
+        return f"{resume} for {job_description}"
+
+    async def analyze(resume, job_description):
+        return {"match_score": 50}
+
+    monkeypatch.setattr(batch_service, "_prepare_shared_work", lambda items: record["prepared"].append(items))
+    monkeypatch.setattr(batch_service, "tailor_resume_checked_async", tailor)
+    monkeypatch.setattr(batch_service, "analyze_resume_job_match_async", analyze)
+    return record
+
+
+def run_batch(request: BatchTailorRequest, manager: BatchJobManager = None):
+    async def scenario():
+        job = (manager or BatchJobManager(ttl=60)).submit(request)
+        await job.task
+        return job
+
+    return asyncio.run(scenario())
+
+
+def test_one_resume_against_many_jobs_and_explicit_pairs(calls):
+    request = BatchTailorRequest(resume="R", job_descriptions=["j1", "j2"],
+                                 pairs=[TailorPair(resume="P", job_description="j3")])
+    status = run_batch(request).snapshot()
+
+    assert status.status == "completed" and (status.total, status.completed, status.failed) == (3, 3, 0)
+    assert [r.tailored_resume for r in status.results] == ["P for j3", "R for j1", "R for j2"]
+    assert calls["prepared"] == [[("P", "j3"), ("R", "j1"), ("R", "j2")]]
+
+
+def test_fan_out_is_bounded_by_concurrency(calls):
+    run_batch(BatchTailorRequest(resume="R", job_descriptions=[f"j{i}" for i in range(8)], concurrency=3))
+    assert calls["peak"] == 3
+
+
+def test_concurrency_is_capped_by_settings(calls, monkeypatch):
+    monkeypatch.setattr(batch_service.settings, "batch_max_concurrency", 2)
+    job = run_batch(BatchTailorRequest(resume="R", job_descriptions=[f"j{i}" for i in range(6)], concurrency=50))
+    assert job.concurrency == 2 and calls["peak"] == 2
+
+
+def test_a_failed_item_does_not_fail_the_batch(calls):
+    status = run_batch(BatchTailorRequest(resume="R", job_descriptions=["j1", "fail", "j3"])).snapshot()
+
+    assert (status.completed, status.failed) == (2, 1)
+    failed = status.results[1]
+    assert failed.status == "failed" and failed.error and failed.tailored_resume is None
+
+
+def test_empty_or_oversized_batches_are_rejected(calls, monkeypatch):
+    manager = BatchJobManager(ttl=60)
+    with pytest.raises(ValueError):
+        manager.submit(BatchTailorRequest(resume="R"))
+    monkeypatch.setattr(batch_service.settings, "batch_max_items", 2)
+    with pytest.raises(ValueError, match="at most 2"):
+        manager.submit(BatchTailorRequest(resume="R", job_descriptions=["a", "b", "c"]))
+
+
+def test_finished_jobs_expire(calls, monkeypatch):
+    manager = BatchJobManager(ttl=30)
+    job = run_batch(BatchTailorRequest(resume="R", job_descriptions=["j1"]), manager)
+    assert manager.get(job.job_id) is job
+
+    finished = job.finished_at
+    monkeypatch.setattr(batch_service.time, "monotonic", lambda: finished + 31)
+    assert manager.get(job.job_id) is None
+
+
+def test_events_stream_every_result_then_done(calls, monkeypatch):
+    from app.api.v1.endpoints import tailor
+
+    monkeypatch.setattr(tailor, "batch_manager", BatchJobManager(ttl=60))
+    app = FastAPI()
+    app.include_router(tailor.router, prefix="/api/v1/tailor")
+    with TestClient(app) as client:
+        submitted = client.post("/api/v1/tailor/batch", json={"resume": "R", "job_descriptions": ["j1", "j2"]})
+        assert submitted.status_code == 202
+        job_id = submitted.json()["job_id"]
+        body = client.get(f"/api/v1/tailor/batch/{job_id}/events").text
+        assert client.get("/api/v1/tailor/batch/unknown").status_code == 404
+
+    events = [block.split("\n", 1) for block in body.strip().split("\n\n")]
+    assert [name for name, _ in events] == ["event: result", "event: result", "event: done"]
+    results = [json.loads(data.removeprefix("data: ")) for _, data in events[:2]]
+    assert sorted(r["result"]["index"] for r in results) == [0, 1]
+    assert json.loads(events[2][1].removeprefix("data: "))["completed"] == 2
+
+
+def test_shared_work_parses_each_resume_once_and_embeds_in_one_batch(monkeypatch):
+    from app.services.analysis_cache import DocumentAnalysisCache
+
+    cache = DocumentAnalysisCache(max_entries=8, ttl=60)
+    embedded = []
+    monkeypatch.setattr(batch_service, "analysis_cache", cache)
+    monkeypatch.setattr(batch_service.rag_service, "embed_texts", embedded.append)
+    resume = "\\begin{document}\n\\section{Skills}\nPython\n\\end{document}"
+
+    batch_service._prepare_shared_work([(resume, "j1"), (resume, "j2"), (resume, "j1")])
+    assert cache.stats()["resumes"]["misses"] == 1
+    assert embedded == [["\\section{Skills}\nPython", "j1", "j2"]]
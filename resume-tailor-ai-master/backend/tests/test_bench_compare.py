@@ -0,0 +1,70 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+BENCHMARKS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks")
+_spec = importlib.util.spec_from_file_location("bench_compare", os.path.join(BENCHMARKS, "compare.py"))
+compare = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(compare)
+
+
+def result(median, unit="s", stdev=0.0, samples=10):
+    return {"unit": unit, "median": median, "stdev": stdev, "samples": samples}
+
+
+def verdicts(baseline, candidate, threshold=0.10, noise=2.0, min_delta=None):
+    return {name: verdict for name, _, _, _, verdict in
+            compare.compare(baseline, candidate, threshold, noise, "median", min_delta)}
+
+
+def test_noise_floor_is_the_unit_resolution_or_the_standard_error():
+    assert compare.noise_floor(result(1.0), result(1.0), noise=2) == compare.UNIT_FLOORS["s"]
+    # sqrt(0.1^2/4 + 0.1^2/4) = 0.0707
+    floor = compare.noise_floor(result(1.0, stdev=0.1, samples=4), result(1.0, stdev=0.1, samples=4), noise=2)
+    assert floor == pytest.approx(2 * 0.0707, rel=1e-3)
+    assert compare.noise_floor(result(1.0), result(1.0), noise=2, min_delta=0.5) == 0.5
+    assert compare.noise_floor(result(1.0, unit="widgets"), result(1.0, unit="widgets"), noise=2) == 0.0
+
+
+def test_a_small_but_clean_slowdown_is_flagged():
+    # 50 us doubling to 100 us with tight spreads
+    assert verdicts({"fast": result(50e-6, stdev=1e-6)}, {"fast": result(100e-6, stdev=1e-6)}) == {
+        "fast": "REGRESSED"}
+
+
+def test_jitter_within_the_noise_is_not_flagged():
+    baseline = {"noisy": result(1.0, stdev=0.5, samples=5)}
+    assert verdicts(baseline, {"noisy": result(1.3, stdev=0.5, samples=5)}) == {"noisy": "same"}
+    # Below the microsecond resolution even without any spread
+    assert verdicts({"tiny": result(1e-7)}, {"tiny": result(5e-7)}) == {"tiny": "same"}
+
+
+def test_direction_depends_on_the_unit():
+    baseline = {"latency": result(1.0), "throughput": result(100.0, unit="ops/s")}
+    assert verdicts(baseline, {"latency": result(0.5), "throughput": result(50.0, unit="ops/s")}) == {
+        "latency": "improved", "throughput": "REGRESSED"}
+    assert verdicts(baseline, {"latency": result(1.05), "throughput": result(105.0, unit="ops/s")}) == {
+        "latency": "same", "throughput": "same"}
+
+
+def test_added_and_removed_results_are_reported():
+    assert verdicts({"old": result(1.0)}, {"new": result(1.0)}) == {"old": "removed", "new": "added"}
+
+
+def test_cli_exits_non_zero_on_regressions(tmp_path):
+    paths = []
+    for name, median in (("baseline", 1.0), ("candidate", 2.0)):
+        path = tmp_path / f"{name}.json"
+        path.write_text(json.dumps({"suite": "micro", "results": {"case": result(median)}}))
+        paths.append(str(path))
+
+    regressed = subprocess.run([sys.executable, os.path.join(BENCHMARKS, "compare.py"), *paths],
+                               capture_output=True, text=True, timeout=60)
+    assert regressed.returncode == 1 and "1 regression(s)" in regressed.stdout
+    unchanged = subprocess.run([sys.executable, os.path.join(BENCHMARKS, "compare.py"), paths[0], paths[0]],
+                               capture_output=True, text=True, timeout=60)
+    assert unchanged.returncode == 0
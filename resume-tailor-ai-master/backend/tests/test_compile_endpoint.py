@@ -0,0 +1,75 @@
+from concurrent.futures import Future
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints import tailor
+from app.utils.pdf_cache import PdfCache
+
+SOURCE = "\\documentclass{article}\n\\begin{document}\nHello\n\\end{document}\n"
+PDF = b"%PDF-1.7 hello"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    builds = []
+
+    def submit(preprocessed: str) -> Future:
+        builds.append(preprocessed)
+        future = Future()
+        future.set_result(PDF)
+        return future
+
+    monkeypatch.setattr(tailor, "pdf_cache", PdfCache(memory_budget=1 << 20, disk_path=None, disk_budget=0))
+    monkeypatch.setattr(tailor.compile_scheduler, "submit", submit)
+    app = FastAPI()
+    app.include_router(tailor.router, prefix="/api/v1/tailor")
+    with TestClient(app) as test_client:
+        test_client.builds = builds
+        yield test_client
+
+
+def test_compile_is_content_addressed(client):
+    first = client.post("/api/v1/tailor/compile", json={"resume": SOURCE})
+    second = client.post("/api/v1/tailor/compile", json={"resume": SOURCE})
+
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content == PDF
+    assert (first.headers["X-Cache"], second.headers["X-Cache"]) == ("MISS", "HIT")
+    assert len(client.builds) == 1
+    key = first.headers["ETag"].strip('"')
+    assert first.headers["Content-Location"].endswith(f"/api/v1/tailor/compile/{key}")
+
+
+@pytest.mark.parametrize("if_none_match", ["*", '"other"', None])
+def test_compile_post_never_answers_304(client, if_none_match):
+    etag = client.post("/api/v1/tailor/compile", json={"resume": SOURCE}).headers["ETag"]
+    headers = {"If-None-Match": if_none_match or etag}
+    response = client.post("/api/v1/tailor/compile", json={"resume": SOURCE}, headers=headers)
+    assert response.status_code == 200 and response.content == PDF
+
+
+def test_compiled_pdf_is_revalidated_by_its_hash(client):
+    compiled = client.post("/api/v1/tailor/compile", json={"resume": SOURCE})
+    location, etag = compiled.headers["Content-Location"], compiled.headers["ETag"]
+
+    fetched = client.get(location)
+    assert fetched.status_code == 200 and fetched.content == PDF
+    assert fetched.headers["ETag"] == etag
+    assert client.get(location, headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+    assert client.get(location, headers={"If-None-Match": '"other", ' + etag}).status_code == 304
+
+
+def test_unknown_or_malformed_hash(client):
+    assert client.get("/api/v1/tailor/compile/" + "0" * 64).status_code == 404
+    assert client.get("/api/v1/tailor/compile/not-a-hash").status_code == 422
+    # The stats routes are not taken for hashes
+    assert client.get("/api/v1/tailor/compile/cache").json()["success"] is True
+
+
+def test_half_edited_previews_still_build(client):
+    half_edited = SOURCE.replace("Hello", "\\begin{itemize}\n\\item Hel")
+    response = client.post("/api/v1/tailor/compile", json={"resume": half_edited})
+    assert response.status_code == 200 and response.content == PDF
+    assert len(client.builds) == 1
@@ -0,0 +1,72 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.utils.compile_scheduler import CompileQueueFullError, CompileScheduler
+
+
+@pytest.fixture
+def scheduler(tmp_path, monkeypatch):
+    """One slot and one queue place; builds block until `release` is set."""
+    scheduler = CompileScheduler(workers=1, queue_size=1, timeout=10, work_dir=str(tmp_path))
+    scheduler.started = threading.Event()
+    scheduler.release = threading.Event()
+
+    def build(slot_dir, preprocessed: str, timeout=None, env=None) -> bytes:
+        scheduler.started.set()
+        scheduler.release.wait(5)
+        return preprocessed.encode()
+
+    monkeypatch.setattr("app.utils.compile_scheduler.run_tectonic", build)
+    yield scheduler
+    scheduler.release.set()
+    scheduler._executor.shutdown(wait=True)
+
+
+def test_queue_full_is_rejected_with_retry_after(scheduler):
+    running = scheduler.submit("a")
+    assert scheduler.started.wait(5)
+    scheduler.submit("b")
+    with pytest.raises(CompileQueueFullError) as full:
+        scheduler.submit("c")
+    assert full.value.retry_after >= 1
+
+    scheduler.release.set()
+    assert running.result(5) == b"a"
+    stats = scheduler.stats()
+    assert stats["rejected"] == 1
+
+
+def test_cancelled_queued_jobs_give_their_place_back(scheduler):
+    running = scheduler.submit("a")
+    assert scheduler.started.wait(5)
+    queued = scheduler.submit("b")
+    assert queued.cancel()
+    assert scheduler.stats()["queued"] == 0
+
+    # The freed place can be taken again, and the cancelled job never builds
+    again = scheduler.submit("c")
+    scheduler.release.set()
+    assert (running.result(5), again.result(5)) == (b"a", b"c")
+    stats = scheduler.stats()
+    assert stats["cancelled"] == 1 and stats["completed"] == 2
+    assert stats["running"] == 0 and stats["queued"] == 0
+
+
+def test_disconnected_waiters_do_not_leak_queue_places(scheduler):
+    async def scenario():
+        running = scheduler.submit("a")
+        await asyncio.get_running_loop().run_in_executor(None, scheduler.started.wait, 5)
+        # A client awaiting a queued build goes away; wrap_future cancels the job
+        waiting = asyncio.wrap_future(scheduler.submit("b"))
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        await asyncio.sleep(0)  # the cancellation reaches the job from a loop callback
+        again = scheduler.submit("c")
+        scheduler.release.set()
+        return await asyncio.wrap_future(running), await asyncio.wrap_future(again)
+
+    assert asyncio.run(scenario()) == (b"a", b"c")
+    assert scheduler.stats()["queued"] == 0
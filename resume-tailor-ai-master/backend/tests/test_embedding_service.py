@@ -0,0 +1,88 @@
+import numpy as np
+
+from app.services.embedding_service import DiskEmbeddingStore, EmbeddingService, cosine_top_k, text_hash
+
+
+class FakeModel:
+    """Deterministic stand-in for a SentenceTransformer that records its calls."""
+
+    def __init__(self, dim: int = 8):
+        self.dim = dim
+        self.calls = []
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True):
+        self.calls.append(list(texts))
+        return np.stack([np.random.default_rng(len(t) * 7919 + sum(map(ord, t))).random(self.dim)
+                         for t in texts]).astype(np.float32)
+
+
+def test_misses_are_encoded_in_one_batch_and_duplicates_once():
+    model = FakeModel()
+    service = EmbeddingService(model)
+    vectors = service.embed_many(["a", "b", "a", "c"])
+
+    assert model.calls == [["a", "b", "c"]]
+    assert vectors.shape == (4, model.dim) and vectors.dtype == np.float32
+    np.testing.assert_array_equal(vectors[0], vectors[2])
+    assert service.stats()["misses"] == 3 and service.stats()["encode_calls"] == 1
+
+
+def test_cached_texts_are_not_encoded_again():
+    model = FakeModel()
+    service = EmbeddingService(model)
+    first = service.embed_many(["a", "b"])
+    second = service.embed_many(["b", "c", "a"])
+
+    assert model.calls == [["a", "b"], ["c"]]
+    np.testing.assert_array_equal(second[[2, 0]], first)
+    assert service.stats()["memory_hits"] == 2
+
+
+def test_memory_cache_evicts_least_recently_used():
+    model = FakeModel()
+    service = EmbeddingService(model, cache_size=2)
+    service.embed_many(["a", "b"])
+    service.embed("a")  # "b" is now the least recently used
+    service.embed("c")
+    service.embed_many(["a", "b"])
+
+    assert model.calls[-1] == ["b"]
+    assert service.stats()["cached"] == 2
+
+
+def test_disk_store_survives_a_restart(tmp_path):
+    first = EmbeddingService(FakeModel(), store_path=str(tmp_path))
+    vectors = first.embed_many(["a", "b"])
+
+    model = FakeModel()
+    restarted = EmbeddingService(model, store_path=str(tmp_path))
+    np.testing.assert_array_equal(restarted.embed_many(["b", "a"]), vectors[::-1])
+    assert model.calls == []
+    assert restarted.stats()["disk_hits"] == 2 and restarted.stats()["stored"] == 2
+
+
+def test_disk_store_drops_a_torn_tail(tmp_path):
+    store = DiskEmbeddingStore(str(tmp_path), dim=4)
+    store.add([text_hash("a"), text_hash("b")], np.ones((2, 4), dtype=np.float32))
+    # A crash after writing the vectors of "c" but before its index line
+    with open(store.vectors_path, "ab") as fh:
+        fh.write(np.full(4, 9, dtype=np.float32).tobytes()[:10])
+
+    reopened = DiskEmbeddingStore(str(tmp_path), dim=4)
+    assert len(reopened) == 2
+    assert reopened.vectors_path.stat().st_size == 2 * 4 * 4
+    np.testing.assert_array_equal(reopened.get(text_hash("b")), np.ones(4))
+    assert reopened.get(text_hash("c")) is None
+
+
+def test_cosine_top_k_returns_best_first():
+    matrix = np.array([[1, 0], [0, 1], [1, 1], [-1, 0]], dtype=np.float32)
+    indices, scores = cosine_top_k(matrix, np.array([1, 0.1], dtype=np.float32), 3)
+
+    assert indices.tolist() == [0, 2, 1]
+    assert np.all(np.diff(scores) <= 0)
+    assert cosine_top_k(matrix, matrix[0], 10)[0].shape == (4,)
+    assert cosine_top_k(matrix[:0], matrix[0], 3)[0].size == 0
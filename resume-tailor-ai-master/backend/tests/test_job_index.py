@@ -0,0 +1,122 @@
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.schemas.resume import MAX_JOB_MATCHES
+from app.services.job_index import JobIndex
+
+DIM = 4
+
+
+def unit(*values):
+    return np.array(values, dtype=np.float32)
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = JobIndex(str(tmp_path), dim=DIM)
+    index.upsert(
+        ["python", "sales", "design"],
+        np.stack([unit(1, 0, 0, 0), unit(0, 1, 0, 0), unit(0, 0, 1, 0)]),
+        [{"city": "Berlin", "remote": True}, {"city": "Paris", "remote": False}, {"city": "Berlin", "remote": False}],
+    )
+    return index
+
+
+def ids(results):
+    return [r["id"] for r in results]
+
+
+def test_search_returns_the_closest_jobs_first(index):
+    results = index.search(unit(1, 0.5, 0, 0), top_k=2)
+    assert ids(results) == ["python", "sales"]
+    assert results[0]["score"] == pytest.approx(1 / np.sqrt(1.25))
+    assert results[0]["metadata"] == {"city": "Berlin", "remote": True}
+    assert len(index.search(unit(1, 0, 0, 0), top_k=10)) == 3
+
+
+def test_filters_accept_one_value_or_a_list(index):
+    assert ids(index.search(unit(1, 1, 1, 0), filters={"city": "Berlin", "remote": False})) == ["design"]
+    assert sorted(ids(index.search(unit(1, 1, 1, 0), filters={"city": ["Paris", "Berlin"]}))) == [
+        "design", "python", "sales"]
+    assert index.search(unit(1, 0, 0, 0), filters={"city": "Rome"}) == []
+
+
+def test_top_k_below_one_is_rejected(index):
+    with pytest.raises(ValueError, match="top_k"):
+        index.search(unit(1, 0, 0, 0), top_k=0)
+
+
+def test_replaced_and_deleted_jobs_are_not_found(index):
+    index.upsert(["python"], unit(0, 0, 0, 1)[None], [{"city": "Rome"}])
+    assert index.delete(["sales", "unknown"]) == 1
+    assert index.delete(["sales"]) == 0
+
+    assert ids(index.search(unit(1, 1, 0, 0))) == ["python", "design"]
+    assert index.search(unit(0, 0, 0, 1), top_k=1)[0]["metadata"] == {"city": "Rome"}
+    assert index.stats()["jobs"] == 2 and index.stats()["deleted_rows"] == 2
+
+
+def test_compaction_drops_dead_rows_and_survives_reopening(index, tmp_path):
+    index.upsert(["python"], unit(0, 0, 0, 1)[None])
+    index.delete(["sales"])
+    before = index.search(unit(0, 1, 1, 2))
+    index.compact()
+
+    stats = index.stats()
+    assert (stats["jobs"], stats["rows"], stats["bytes"]) == (2, 2, 2 * DIM * 4)
+    assert not (tmp_path / "deleted.txt").exists()
+    assert index.search(unit(0, 1, 1, 2)) == before
+
+    reopened = JobIndex(str(tmp_path), dim=DIM)
+    assert reopened.search(unit(0, 1, 1, 2)) == before
+    assert ids(reopened.search(unit(1, 1, 1, 0), filters={"city": "Berlin"})) == ["design"]
+
+
+def test_deletes_survive_reopening_without_compaction(index, tmp_path):
+    index.delete(["design"])
+    assert sorted(ids(JobIndex(str(tmp_path), dim=DIM).search(unit(1, 1, 1, 1)))) == ["python", "sales"]
+
+
+def test_a_torn_write_is_dropped_on_open(index, tmp_path):
+    with open(tmp_path / "vectors.f32", "ab") as fh:
+        fh.write(unit(1, 1, 1, 1).tobytes()[:6])
+    with open(tmp_path / "meta.jsonl", "a", encoding="utf-8") as fh:
+        fh.write('{"id": "half')
+
+    reopened = JobIndex(str(tmp_path), dim=DIM)
+    assert len(reopened) == 3
+    assert (tmp_path / "vectors.f32").stat().st_size == 3 * DIM * 4
+    reopened.upsert(["ops"], unit(0, 0, 0, 1)[None])
+    assert ids(JobIndex(str(tmp_path), dim=DIM).search(unit(0, 0, 0, 1), top_k=1)) == ["ops"]
+
+
+def test_ivf_search_finds_the_nearest_jobs(tmp_path):
+    rng = np.random.default_rng(0)
+    centers = np.eye(8, dtype=np.float32)
+    vectors = np.concatenate([center + 0.05 * rng.standard_normal((50, 8), dtype=np.float32) for center in centers])
+    index = JobIndex(str(tmp_path), dim=8, approx_threshold=100, nprobe=4)
+    index.upsert([f"job{i}" for i in range(len(vectors))], vectors)
+
+    query = vectors[123]
+    exact = index.search(query, top_k=5, exact=True)
+    approximate = index.search(query, top_k=5)
+    assert index.stats()["mode"] == "ivf" and index.stats()["ivf_lists"] > 0
+    assert ids(approximate) == ids(exact) and ids(exact)[0] == "job123"
+
+    # Rows added after training go into their bucket and are found
+    index.upsert(["new"], centers[2][None])
+    assert ids(index.search(centers[2], top_k=1)) == ["new"]
+
+
+def test_match_requests_bound_top_n(monkeypatch):
+    from app.api.v1.endpoints import jobs
+
+    monkeypatch.setattr(jobs, "resume_query_vector", lambda resume: unit(1, 0, 0, 0))
+    app = FastAPI()
+    app.include_router(jobs.router, prefix="/api/v1/jobs")
+    with TestClient(app) as client:
+        for top_n in (0, MAX_JOB_MATCHES + 1):
+            response = client.post("/api/v1/jobs/match", json={"resume_content": "R", "top_n": top_n})
+            assert response.status_code == 422
@@ -0,0 +1,56 @@
+from app.services.keyword_matcher import (
+    DEFAULT_SKILLS, KeywordMatcher, find_skills, get_keyword_matcher, load_skill_taxonomy, tokenize)
+
+
+def test_tokens_keep_skill_punctuation():
+    assert tokenize("C++, C#, Node.js and CI/CD. R&D") == [
+        "c++", "c#", "node.js", "and", "ci", "/", "cd", "r", "&", "d"]
+
+
+def test_longest_match_wins():
+    matcher = KeywordMatcher({"Java": [], "Java EE": ["j2ee"], "Spring": [], "Spring Boot": []})
+    assert matcher.find_all("Java EE apps on Spring Boot, plain Java and Spring") == [
+        "Java EE", "Spring Boot", "Java", "Spring"]
+
+
+def test_a_failed_longer_match_falls_back_to_the_shorter_one():
+    matcher = KeywordMatcher({"Machine": [], "Machine Learning Ops": []})
+    assert matcher.find_all("machine learning") == ["Machine"]
+
+
+def test_aliases_map_to_the_canonical_name_once():
+    matcher = KeywordMatcher(DEFAULT_SKILLS)
+    text = "k8s, Kubernetes, postgres, ReactJS, node js, Amazon Web Services and CI CD"
+    assert matcher.find_all(text) == ["Kubernetes", "PostgreSQL", "React", "Node.js", "AWS", "CI/CD"]
+
+
+def test_matches_fall_on_word_boundaries():
+    matcher = KeywordMatcher(DEFAULT_SKILLS)
+    assert matcher.find_all("JavaScript, Gitlab, SQLite") == ["JavaScript"]
+    assert matcher.find_all("C++ and Java") == ["C++", "Java"]
+
+
+def test_taxonomy_file_extends_the_default_skills(tmp_path):
+    path = tmp_path / "skills.txt"
+    path.write_text("# extra skills\n\nRust | rustlang\nTerraform|tf | \nRust | cargo\n", encoding="utf-8")
+    assert load_skill_taxonomy(str(path)) == {"Rust": ["rustlang", "cargo"], "Terraform": ["tf"]}
+
+    get_keyword_matcher.cache_clear()
+    try:
+        matcher = get_keyword_matcher(str(path))
+        assert matcher.find_all("rustlang, tf and Python") == ["Rust", "Terraform", "Python"]
+        assert len(matcher) == len(DEFAULT_SKILLS) + 2
+    finally:
+        get_keyword_matcher.cache_clear()
+
+
+def test_missing_taxonomy_falls_back_to_the_defaults(tmp_path):
+    get_keyword_matcher.cache_clear()
+    try:
+        assert len(get_keyword_matcher(str(tmp_path / "missing.txt"))) == len(DEFAULT_SKILLS)
+    finally:
+        get_keyword_matcher.cache_clear()
+
+
+def test_find_skills_is_lowercased():
+    assert find_skills("Docker, Python and GraphQL") == ["docker", "python", "graphql"]
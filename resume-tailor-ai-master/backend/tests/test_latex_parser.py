@@ -0,0 +1,89 @@
+from app.services.latex_parser import index_latex_sections, normalize_section_type, parse_latex_resume
+
+RESUME = r"""\documentclass{article}
+\newcommand{\resumeheading}[1]{\section{#1}\vspace{-4pt}}
+\renewcommand{\maketitle}{\section*{Jane Doe}}
+\begin{document}
+\maketitle
+jane@example.com
+\section{Open Source \& Side Projects}
+Built things in Python.
+% \section{Hidden}
+\subsection{Rust tools}
+A linter.
+\subsection[Short]{Go services}
+An API.
+\section*{Work Experience}
+Docker and Kubernetes at Acme.
+\end{document}
+"""
+
+
+def spans(source: str):
+    return [(s.title, s.level, source[s.start:s.end]) for s in index_latex_sections(source).sections]
+
+
+def test_arbitrary_section_names_and_nested_subsections():
+    found = spans(RESUME)
+    assert [(title, level) for title, level, _ in found] == [
+        (r"Open Source \& Side Projects", 1),
+        ("Rust tools", 2),
+        ("Go services", 2),
+        ("Work Experience", 1),
+    ]
+    projects, rust, go, work = (text for _, _, text in found)
+    # A section runs over its subsections, a subsection to the next heading
+    assert projects.startswith(r"\section{Open Source") and projects.rstrip().endswith("An API.")
+    assert rust.startswith(r"\subsection{Rust tools}") and rust.rstrip().endswith("A linter.")
+    assert go.rstrip().endswith("An API.")
+    assert work.rstrip().endswith("at Acme.") and r"\end{document}" not in work
+
+
+def test_commented_headings_are_skipped():
+    titles = [title for title, _, _ in spans(RESUME)]
+    assert "Hidden" not in titles
+    # An escaped percent sign does not start a comment
+    assert [t for t, _, _ in spans("\\begin{document}\n50\\% \\section{Skills}\n\\end{document}")] == ["Skills"]
+
+
+def test_headings_in_preamble_macros_are_not_sections():
+    index = index_latex_sections(RESUME)
+    assert all(span.start > index.body_start for span in index.sections)
+    assert "#1" not in [span.title for span in index.sections]
+    # The title ends at the body's \maketitle, not the preamble redefinition
+    assert RESUME[index.title_end:].startswith("\njane@example.com")
+
+
+def test_document_without_begin_document():
+    source = "\\section{Summary}\nHello\n\\subsection{Detail}\nMore\n\\section{Skills}\nPython\n"
+    index = index_latex_sections(source)
+    assert index.body_start is None and index.body_end is None
+    assert [(s.title, s.level) for s in index.sections] == [("Summary", 1), ("Detail", 2), ("Skills", 1)]
+    assert source[index.sections[-1].start:index.sections[-1].end] == "\\section{Skills}\nPython\n"
+
+    sections = parse_latex_resume(source)
+    assert [s.section_type for s in sections] == ["summary", "skills"]
+
+
+def test_nothing_after_end_document_is_a_section():
+    source = "\\begin{document}\n\\section{A}\nx\n\\end{document}\n\\section{Trailing}\n"
+    assert [title for title, _, _ in spans(source)] == ["A"]
+
+
+def test_parse_latex_resume_sections():
+    sections = parse_latex_resume(RESUME)
+    assert [s.section_type for s in sections] == [
+        "personal_info", "open_source_side_projects", "work_experience"]
+    assert sections[0].content == "jane@example.com"
+    assert "Python" in sections[1].keywords
+    assert {"Docker", "Kubernetes"} <= set(sections[2].keywords)
+
+
+def test_body_without_sections_is_general():
+    sections = parse_latex_resume("\\documentclass{article}\n\\begin{document}\nJust text\n\\end{document}")
+    assert [(s.section_type, s.content) for s in sections] == [("general", "Just text")]
+
+
+def test_normalize_section_type():
+    assert normalize_section_type(r"\textbf{Work} Experience") == "work_experience"
+    assert normalize_section_type(r"\faIcon") == "section"
@@ -0,0 +1,61 @@
+import pytest
+
+from app.utils import latex_utils
+from app.utils.latex_utils import LatexValidationError, new_validation_errors, preprocess_latex, validate_latex
+
+
+def document(body: str) -> str:
+    return "\\documentclass{article}\n\\begin{document}\n" + body + "\n\\end{document}\n"
+
+
+def errors(source: str, fragment: bool = False):
+    return [str(d) for d in validate_latex(source, fragment=fragment) if d.severity == "error"]
+
+
+def test_structural_errors_are_reported_by_line_and_column():
+    assert errors(document("Hello {world")) == ["line 3, column 7: '{' is never closed before \\end{document}"]
+    assert errors(document("Hello }")) == ["line 3, column 7: unmatched '}'"]
+    assert errors(document("\\begin{itemize}\n\\item a\n\\end{enumerate}")) == [
+        "line 3, column 1: \\begin{itemize} is never closed (\\end{document} comes first)",
+        "line 5, column 1: \\end{enumerate} has no matching \\begin",
+    ]
+    assert errors(document("Earned $5M\n\nnext")) == [
+        "line 3, column 8: math opened with '$' is not closed before the paragraph ends"]
+
+
+def test_primitives_that_cannot_build_are_errors():
+    assert errors(document("\\pdfgentounicode=1")) == [
+        "line 3, column 1: \\pdfgentounicode is a pdfTeX primitive, undefined under XeTeX"]
+    assert errors(document("\\immediate\\write18{ls}")) == [
+        "line 3, column 11: \\write18 runs shell commands, which are disabled"]
+
+
+def test_raw_arguments_and_verbatim_are_not_checked():
+    assert validate_latex(document("\\url{a_b#c%d} \\% ok")) == []
+    assert validate_latex(document("\\begin{verbatim}\n{ $ &\n\\end{verbatim}")) == []
+    stray = validate_latex(document("R&D"))
+    assert [d.severity for d in stray] == ["warning"]
+
+
+def test_fragments_need_no_document_environment():
+    assert errors("\\section{A}\nx", fragment=True) == []
+    assert errors("\\section{A}\nx") == ["line 2, column 2: missing \\begin{document}"]
+
+
+def test_only_errors_the_revision_adds_count():
+    original = document("Earned $5M\n\nSkills")
+    assert new_validation_errors(original, original.replace("Skills", "Python")) == []
+    added = new_validation_errors(original, original.replace("Skills", "Python {"))
+    assert [d.message for d in added] == ["'{' is never closed before \\end{document}"]
+
+
+def test_preprocessing_validates_only_when_asked(monkeypatch):
+    broken = document("\\begin{itemize}\n\\item a")
+    # Previews go to tectonic as they are
+    assert "\\item a" in preprocess_latex(broken)
+    with pytest.raises(LatexValidationError) as raised:
+        preprocess_latex(broken, validate=True)
+    assert raised.value.diagnostics[0].line == 3
+
+    monkeypatch.setattr(latex_utils.settings, "latex_validation", False)
+    assert preprocess_latex(broken, validate=True) == preprocess_latex(broken)
@@ -0,0 +1,100 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.services import ai_service
+from app.services.llm_cache import LLMResponseCache, prompt_key
+from app.utils import ttl_cache
+
+MESSAGES = [{"role": "user", "content": "Tailor this"}]
+
+
+def vector(*values):
+    calls = []
+
+    def job_vector():
+        calls.append(1)
+        return np.array(values, dtype=np.float32)
+
+    job_vector.calls = calls
+    return job_vector
+
+
+def test_exact_tier_is_keyed_by_model_and_messages():
+    cache = LLMResponseCache(max_entries=8, ttl=60, semantic=False, threshold=0.9)
+    cache.put("model-a", MESSAGES, "resume", vector(1, 0), "tailored")
+
+    assert cache.get("model-a", MESSAGES, "resume", vector(1, 0)) == "tailored"
+    assert cache.get("model-b", MESSAGES, "resume", vector(1, 0)) is None
+    assert cache.get("model-a", [{"role": "user", "content": "Other"}], "resume", vector(1, 0)) is None
+    assert prompt_key("m", MESSAGES) != prompt_key("m", MESSAGES + MESSAGES)
+
+
+def test_semantic_tier_reuses_near_duplicate_jobs_for_the_same_resume():
+    cache = LLMResponseCache(max_entries=8, ttl=60, semantic=True, threshold=0.95)
+    cache.put("m", MESSAGES, "resume", vector(1, 0), "tailored")
+    other_prompt = [{"role": "user", "content": "Slightly different job"}]
+
+    assert cache.get("m", other_prompt, "resume", vector(1, 0.1)) == "tailored"
+    assert cache.get("m", other_prompt, "resume", vector(1, 1)) is None
+    assert cache.get("m", other_prompt, "other resume", vector(1, 0)) is None
+    stats = cache.stats()["semantic"]
+    assert (stats["semantic_hits"], stats["semantic_misses"]) == (1, 2)
+
+
+def test_job_vector_is_only_computed_when_the_semantic_tier_is_consulted():
+    exact_only = LLMResponseCache(max_entries=8, ttl=60, semantic=False, threshold=0.9)
+    job_vector = vector(1, 0)
+    exact_only.get("m", MESSAGES, "resume", job_vector)
+    exact_only.put("m", MESSAGES, "resume", job_vector, "tailored")
+    assert job_vector.calls == []
+
+    semantic = LLMResponseCache(max_entries=8, ttl=60, semantic=True, threshold=0.9)
+    semantic.get("m", MESSAGES, "unseen resume", job_vector)
+    assert job_vector.calls == []
+
+
+def test_semantic_entries_expire_and_are_bounded_per_resume(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.services.llm_cache.time.monotonic", lambda: now[0])
+    monkeypatch.setattr(ttl_cache.time, "monotonic", lambda: now[0])
+    cache = LLMResponseCache(max_entries=8, ttl=60, semantic=True, threshold=0.99, per_resume=2)
+    for i, values in enumerate([(1, 0, 0), (0, 1, 0), (0, 0, 1)]):
+        cache.put("m", [{"role": "user", "content": str(i)}], "resume", vector(*values), f"r{i}")
+
+    probe = [{"role": "user", "content": "probe"}]
+    # The oldest of three entries was dropped
+    assert cache.get("m", probe, "resume", vector(1, 0, 0)) is None
+    assert cache.get("m", probe, "resume", vector(0, 0, 1)) == "r2"
+    now[0] += 61
+    assert cache.get("m", probe, "resume", vector(0, 0, 1)) is None
+    assert cache.stats()["semantic"]["groups"] == 0
+
+
+@pytest.fixture
+def tailoring(monkeypatch):
+    """tailor_resume_async with a fresh cache and a router that falls back to "backup"."""
+    cache = LLMResponseCache(max_entries=8, ttl=60, semantic=False, threshold=0.9)
+    completions = []
+
+    async def complete(provider_model, messages, validate=None):
+        completions.append(provider_model)
+        return "backup", "\\section{Skills}\ntailored"
+
+    monkeypatch.setattr(ai_service, "llm_cache", cache)
+    monkeypatch.setattr(ai_service, "build_tailoring_request", lambda resume, job, model: ("primary", MESSAGES))
+    monkeypatch.setattr(ai_service, "complete_tailoring_async", complete)
+    return cache, completions
+
+
+def test_fallback_answers_are_found_again_under_the_requested_model(tailoring):
+    cache, completions = tailoring
+
+    async def twice():
+        return [await ai_service.tailor_resume_async("resume", "job", "primary") for _ in range(2)]
+
+    first, second = asyncio.run(twice())
+    assert first == second
+    assert completions == ["primary"]
+    assert cache.stats()["exact"]["hits"] == 1
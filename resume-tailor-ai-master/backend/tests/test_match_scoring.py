@@ -0,0 +1,144 @@
+import asyncio
+import pickle
+import re
+import threading
+
+import numpy as np
+import pytest
+
+from app.services import ai_service, match_scoring
+from app.services.embedding_service import EmbeddingService
+from app.services.match_scoring import extract_requirements, keyword_overlap, rank_jobs_for_resume, score_resume_against_job
+from fakes import WordModel
+
+VOCABULARY = ["python", "docker", "kubernetes", "sales", "marketing", "design", "degree"]
+RESUME = r"""\documentclass{article}
+\begin{document}
+\section{Experience}
+\begin{itemize}
+\item Built Python services deployed with Docker
+\end{itemize}
+\section{Skills}
+Python, Docker, Kubernetes
+\section{Education}
+BSc degree in Computer Science
+\end{document}
+"""
+
+
+def word_overlap(rows, columns):
+    """Cosine of word-count vectors, standing in for scikit-learn's TF-IDF."""
+    texts = [set(re.findall(r"[a-z]+", text.lower())) for text in rows + columns]
+    vocabulary = sorted(set().union(*texts))
+    matrix = np.array([[word in words for word in vocabulary] for words in texts], dtype=np.float32)
+    matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-9)
+    return matrix[:len(rows)] @ matrix[len(rows):].T
+
+
+@pytest.fixture
+def model(monkeypatch):
+    """A word-count embedding model on the shared RAG service and a numpy lexical signal."""
+    model = WordModel(VOCABULARY)
+    monkeypatch.setattr(match_scoring.rag_service, "_model", model)
+    monkeypatch.setattr(match_scoring.rag_service, "_embeddings", EmbeddingService(model))
+    monkeypatch.setattr(match_scoring, "_tfidf_similarity", word_overlap)
+    return model
+
+
+def test_requirements_are_bullets_and_sentences_without_repeats():
+    job = ("- Strong Python experience required\n"
+           "* Docker and Kubernetes in production. Excellent written communication skills.\n"
+           "1) Strong Python experience required\n"
+           "Remote\n")
+    assert extract_requirements(job) == [
+        "Strong Python experience required",
+        "Docker and Kubernetes in production.",
+        "Excellent written communication skills.",
+    ]
+    assert extract_requirements(job, limit=1) == ["Strong Python experience required"]
+    assert extract_requirements("Remote") == ["Remote"]
+
+
+def test_keyword_overlap_keeps_the_job_order():
+    overlap = keyword_overlap(["Python", "Go"], ["docker", "python", "Docker", "kubernetes"])
+    assert overlap.matching == ["python"]
+    assert overlap.missing == ["docker", "kubernetes"]
+    assert overlap.percentage == pytest.approx(100 / 3)
+    assert keyword_overlap(["python"], []).percentage == 0.0
+
+
+def test_each_requirement_is_covered_by_its_best_section(model):
+    job = "- Python and Docker services\n- Kubernetes clusters in production\n- Enterprise sales and marketing"
+    result = score_resume_against_job(RESUME, job)
+
+    coverage = {item["requirement"]: item for item in result["requirement_coverage"]}
+    assert coverage["Python and Docker services"]["covered"]
+    assert coverage["Python and Docker services"]["best_section"] == "experience"
+    assert coverage["Kubernetes clusters in production"]["best_section"] == "skills"
+    assert not coverage["Enterprise sales and marketing"]["covered"]
+    assert 0 < result["requirement_coverage_percentage"] < 100
+    # Sections and requirements go to the model in one batch
+    assert len(model.calls) == 1
+
+
+def test_match_percentage_blends_keywords_and_coverage(model, monkeypatch):
+    job = "- Python and Docker services\n- Kubernetes clusters in production"
+    monkeypatch.setattr(match_scoring.settings, "match_keyword_weight", 1.0)
+    result = score_resume_against_job(RESUME, job)
+    assert result["match_percentage"] == pytest.approx(result["keyword_match_percentage"])
+
+    monkeypatch.setattr(match_scoring.settings, "match_keyword_weight", 0.0)
+    result = score_resume_against_job(RESUME, job)
+    assert result["match_percentage"] == pytest.approx(result["requirement_coverage_percentage"])
+
+
+def test_jobs_are_ranked_best_first_in_one_pass(model):
+    jobs = [
+        "Enterprise sales and marketing lead",
+        "Python engineer running Docker and Kubernetes",
+        "Product design for mobile apps",
+    ]
+    ranked = rank_jobs_for_resume(RESUME, jobs)
+
+    assert [r["index"] for r in ranked][0] == 1
+    assert [r["score"] for r in ranked] == sorted((r["score"] for r in ranked), reverse=True)
+    assert ranked[0]["keyword_coverage"] == 1.0
+    assert len(model.calls) == 1
+
+    assert [r["index"] for r in rank_jobs_for_resume(RESUME, jobs, top_k=1)] == [1]
+    assert len(rank_jobs_for_resume(RESUME, jobs, top_k=10)) == 3
+    assert rank_jobs_for_resume(RESUME, []) == []
+
+
+def test_top_k_below_one_is_rejected(model):
+    with pytest.raises(ValueError, match="top_k"):
+        rank_jobs_for_resume(RESUME, ["Python engineer"], top_k=0)
+
+
+class RecordingPool:
+    """Stands in for the CPU process pool: pickles each call as a pool would and runs it inline."""
+
+    def __init__(self):
+        self.calls = []
+
+    def call(self, fn, *args):
+        fn, args = pickle.loads(pickle.dumps((fn, args)))
+        self.calls.append((fn.__name__, threading.current_thread().name))
+        return fn(*args)
+
+
+def test_scoring_runs_on_the_cpu_pool_and_embedding_on_the_io_thread(model, monkeypatch):
+    pool = RecordingPool()
+    monkeypatch.setattr(match_scoring, "cpu_executor", pool)
+    embedded_on = []
+    embed_many = match_scoring.rag_service.embeddings.embed_many
+    monkeypatch.setattr(match_scoring.rag_service.embeddings, "embed_many",
+                        lambda texts: embedded_on.append(threading.current_thread().name) or embed_many(texts))
+
+    analysis = asyncio.run(ai_service.analyze_resume_job_match_async(RESUME, "- Python and Docker services"))
+    assert "error" not in analysis and analysis["requirement_coverage"][0]["covered"]
+    assert pool.calls == [("_requirement_coverage", embedded_on[0])]
+    assert embedded_on[0].startswith("io")
+
+    rank_jobs_for_resume(RESUME, ["Python engineer", "Sales lead"])
+    assert pool.calls[-1][0] == "_job_scores"
@@ -0,0 +1,47 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client.parser import text_string_to_metric_families
+
+from app.core.metrics import record_llm_usage, registry, render_metrics, span
+from app.core.middleware import RequestMetricsMiddleware
+
+
+def requests_for(route: str, status: str = "200") -> float:
+    return registry.get_sample_value(
+        "resume_tailor_http_request_duration_seconds_count",
+        {"method": "GET", "route": route, "status": status}) or 0.0
+
+
+def test_requests_are_labelled_by_route_template():
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    def item(item_id: str):
+        with span("lookup"):
+            return {"id": item_id}
+
+    app.add_middleware(RequestMetricsMiddleware, server_timing=True)
+    before = requests_for("/items/{item_id}")
+    unmatched = requests_for("unmatched", "404")
+    with TestClient(app) as client:
+        response = client.get("/items/7")
+        # A path parameter equal to a literal segment of the path
+        client.get("/items/items")
+        client.get("/nothing/here")
+
+    assert requests_for("/items/{item_id}") == before + 2
+    assert requests_for("unmatched", "404") == unmatched + 1
+    assert response.headers["server-timing"].startswith("lookup;dur=")
+    assert "/items/7" not in render_metrics().decode()
+
+
+def test_exposition_parses_with_counters_histograms_and_scrape_time_gauges():
+    record_llm_usage("test-model", 120, 30)
+    families = {f.name: f for f in text_string_to_metric_families(render_metrics().decode())}
+
+    tokens = {s.labels["kind"]: s.value for s in families["resume_tailor_llm_tokens"].samples
+              if s.labels.get("model") == "test-model" and s.name.endswith("_total")}
+    assert tokens == {"prompt": 120.0, "completion": 30.0}
+    assert families["resume_tailor_llm_completion_tokens"].type == "histogram"
+    pools = {s.labels["pool"] for s in families["resume_tailor_pool_running"].samples}
+    assert {"cpu", "io", "compile"} <= pools
@@ -0,0 +1,184 @@
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+import pytest
+from openai import AsyncOpenAI
+
+from app.services.ai_service import looks_like_latex, sanitize_model_output
+from app.services.model_router import ModelRouter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from fake_openai_server import create_app  # noqa: E402
+
+MESSAGES = [{"role": "user", "content": "Tailor this resume"}]
+
+
+def fake_provider(models: dict):
+    """
+    An AsyncOpenAI client served in process by fake_openai_server, and a
+    router `call` that completes through it. `models` maps a model id to
+    (latency, error_rate, stall_rate) and may be changed between calls.
+    """
+    app = create_app(latency=0.01, jitter=0.0, models=models)
+    http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://fake/v1")
+    client = AsyncOpenAI(api_key="test", base_url="http://fake/v1", max_retries=0, http_client=http_client)
+
+    async def call(model: str) -> str:
+        completion = await client.chat.completions.create(model=model, messages=MESSAGES)
+        return sanitize_model_output(completion.choices[0].message.content)
+
+    return client, call
+
+
+def test_falls_back_when_a_model_errors():
+    async def scenario():
+        client, call = fake_provider({"bad": (0.01, 1.0, 0.0), "good": (0.01, 0.0, 0.0)})
+        router = ModelRouter(["bad", "good"], hedging=False)
+        async with client:
+            model, text = await router.complete("bad", call, looks_like_latex)
+        return router, model, text
+
+    router, model, text = asyncio.run(scenario())
+    assert model == "good"
+    assert "\\begin{document}" in text
+    stats = router.stats()
+    assert stats["fallbacks"] == 1 and stats["rerouted"] == 1
+    assert stats["models"]["bad"]["error_rate"] == 1.0
+
+
+def test_falls_back_on_invalid_output():
+    async def scenario():
+        client, call = fake_provider({})
+        router = ModelRouter(["prose", "good"], hedging=False)
+
+        async def call_or_prose(model: str) -> str:
+            return "Sure! Here is your resume." if model == "prose" else await call(model)
+
+        async with client:
+            return await router.complete("prose", call_or_prose, looks_like_latex)
+
+    model, _ = asyncio.run(scenario())
+    assert model == "good"
+
+
+def test_hedges_when_primary_is_slower_than_its_p95():
+    async def scenario():
+        client, call = fake_provider({"slow": (5.0, 0.0, 0.0), "fast": (0.01, 0.0, 0.0)})
+        router = ModelRouter(["slow", "fast"], hedge_min=0.05, hedge_max=1.0)
+        # "slow" has answered in 50ms so far, so 5s is far past its p95
+        for _ in range(10):
+            router.release(router.reserve("slow"), 0.05, ok=True)
+        assert router.hedge_delay("slow") == pytest.approx(0.05)
+
+        started = time.monotonic()
+        async with client:
+            model, _ = await router.complete("slow", call, looks_like_latex)
+        return router, model, time.monotonic() - started
+
+    router, model, elapsed = asyncio.run(scenario())
+    assert model == "fast"
+    assert elapsed < 1.0
+    stats = router.stats()
+    assert stats["hedges"] == 1 and stats["cancelled"] == 1
+    # The losing request was cancelled, not counted against the slow model
+    assert stats["models"]["slow"]["in_flight"] == 0
+    assert stats["models"]["slow"]["error_rate"] == 0.0
+
+
+def test_breaker_opens_then_half_opens_then_closes():
+    async def scenario():
+        models = {"flaky": (0.01, 1.0, 0.0)}
+        client, call = fake_provider(models)
+        router = ModelRouter(["flaky"], hedging=False, failure_threshold=2, cooldown=0.2)
+        async with client:
+            for _ in range(2):
+                with pytest.raises(Exception):
+                    await router.complete("flaky", call, looks_like_latex)
+            assert router.stats()["models"]["flaky"]["state"] == "open"
+            with pytest.raises(RuntimeError, match="circuit breaker is open"):
+                await router.complete("flaky", call, looks_like_latex)
+
+            await asyncio.sleep(0.25)
+            assert router.stats()["models"]["flaky"]["state"] == "half_open"
+            # Only one probe is let through while half-open
+            probe = router.reserve("flaky")
+            assert probe == "flaky" and router.reserve("flaky") is None
+            router.release(probe, None, ok=False)
+
+            models["flaky"] = (0.01, 0.0, 0.0)
+            model, _ = await router.complete("flaky", call, looks_like_latex)
+        return router, model
+
+    router, model = asyncio.run(scenario())
+    assert model == "flaky"
+    assert router.stats()["models"]["flaky"]["state"] == "closed"
+
+
+def test_failed_probe_reopens_the_breaker():
+    async def scenario():
+        client, call = fake_provider({"flaky": (0.01, 1.0, 0.0)})
+        router = ModelRouter(["flaky"], hedging=False, failure_threshold=1, cooldown=0.1)
+        async with client:
+            with pytest.raises(Exception):
+                await router.complete("flaky", call, looks_like_latex)
+            await asyncio.sleep(0.15)
+            assert router.stats()["models"]["flaky"]["state"] == "half_open"
+            with pytest.raises(Exception):
+                await router.complete("flaky", call, looks_like_latex)
+        return router
+
+    router = asyncio.run(scenario())
+    assert router.stats()["models"]["flaky"]["state"] == "open"
+
+
+@pytest.fixture
+def streaming(monkeypatch):
+    """stream_tailored_resume wired to a fake provider, with prompt building and caching stubbed out."""
+    from app.services import ai_service
+
+    def setup(models: dict, router: ModelRouter, enabled: bool = True):
+        client, _ = fake_provider(models)
+        monkeypatch.setattr(ai_service, "get_async_client", lambda: client)
+        monkeypatch.setattr(ai_service, "model_router", router)
+        monkeypatch.setattr(ai_service.settings, "router_enabled", enabled)
+        monkeypatch.setattr(ai_service, "build_tailoring_request",
+                            lambda resume, job, model: (model, MESSAGES))
+        monkeypatch.setattr(ai_service, "_cached_tailoring", lambda *args: None)
+        monkeypatch.setattr(ai_service, "_remember_tailoring", lambda *args: None)
+
+        async def stream(model: str) -> str:
+            return "".join([part async for part in ai_service.stream_tailored_resume("resume", "job", model)])
+
+        return stream
+
+    return setup
+
+
+def test_stream_leaves_a_disabled_router_alone(streaming):
+    router = ModelRouter(["primary"])
+    stream = streaming({}, router, enabled=False)
+    text = asyncio.run(stream("primary"))
+    assert "\\begin{document}" in text
+    assert router.stats()["models"] == {}
+
+
+def test_stream_claims_the_half_open_probe(streaming):
+    router = ModelRouter(["primary", "backup"], failure_threshold=1, cooldown=0.05)
+    stream = streaming({}, router)
+    router.release(router.reserve("primary"), 0.01, ok=False)
+    time.sleep(0.1)
+    assert router.stats()["models"]["primary"]["state"] == "half_open"
+
+    # Another request holds the probe, so the stream goes to the backup model
+    probe = router.reserve("primary")
+    asyncio.run(stream("primary"))
+    assert router.stats()["models"]["backup"]["samples"] == 1
+    router.release(probe, None, ok=False)
+
+    # The stream itself is the probe, and its success closes the breaker
+    asyncio.run(stream("primary"))
+    primary = router.stats()["models"]["primary"]
+    assert primary["state"] == "closed" and primary["in_flight"] == 0
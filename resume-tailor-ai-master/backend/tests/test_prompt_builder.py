@@ -0,0 +1,96 @@
+import pytest
+
+from app.services import prompt_builder
+from app.services.ai_service import render_tailoring_prompt
+from app.services.prompt_builder import (
+    DEFAULT_CONTEXT_WINDOW, MIN_JOB_TOKENS, PromptStats, assemble_tailoring_prompt, count_tokens,
+    dedupe_job_description, fit_job_description, prompt_budget, truncate_to_tokens)
+
+RESUME = "\\begin{document}\n\\section{Skills}\nPython, Docker\n\\end{document}"
+SECTIONS = [
+    {"section_type": "education", "content": "BSc Computer Science " * 40, "similarity": 0.1},
+    {"section_type": "skills", "content": "Python Docker Kubernetes " * 40, "similarity": 0.9},
+    {"section_type": "experience", "content": "Built Python services " * 40, "similarity": 0.5},
+]
+
+
+@pytest.fixture(autouse=True)
+def budget(monkeypatch):
+    """Defaults as configured, counted with the approximate tokenizer so numbers are stable."""
+    monkeypatch.setattr(prompt_builder, "_get_encoding", lambda: None)
+    monkeypatch.setattr(prompt_builder.settings, "prompt_token_budget", 8000)
+    monkeypatch.setattr(prompt_builder.settings, "prompt_min_output_tokens", 2048)
+    monkeypatch.setattr(prompt_builder.settings, "prompt_section_excerpt_tokens", 80)
+    monkeypatch.setattr(prompt_builder.settings, "prompt_job_share", 0.7)
+
+
+def test_truncation_stays_within_the_limit_at_a_word_boundary():
+    text = "alpha beta gamma delta " * 50
+    cut = truncate_to_tokens(text, 20)
+    assert count_tokens(cut) <= 20 and cut.endswith("...")
+    assert text.startswith(cut[:-3])
+    assert truncate_to_tokens("short", 20) == "short"
+    assert truncate_to_tokens(text, 0) == ""
+
+
+def test_budget_is_capped_and_shrinks_for_small_windows():
+    assert prompt_budget("deepseek/deepseek-r1-0528:free", 500) == 8000
+    # 40960-token window minus room for a 1.2x rewrite of a 30000-token resume
+    assert prompt_budget("qwen/qwen3-235b-a22b:free", 30000) == 40960 - 36000
+    assert prompt_budget("unknown/model", 100) == min(8000, DEFAULT_CONTEXT_WINDOW - 2048)
+    assert prompt_budget("unknown/model", 10 ** 6) == 0
+
+
+def test_job_description_boilerplate_and_repeats_are_dropped():
+    job = ("Senior Python engineer\nPython engineer with Docker\n\n\n\nSenior Python engineer\n"
+           "We are an Equal Opportunity Employer.\nApply now at our site\nKubernetes a plus")
+    assert dedupe_job_description(job) == (
+        "Senior Python engineer\nPython engineer with Docker\n\nKubernetes a plus")
+
+
+def test_fitting_keeps_keyword_lines_in_their_order():
+    lines = ["About us: a friendly team " * 5, "Must know Python and Docker", "Perks " * 10, "Kubernetes daily"]
+    fitted = fit_job_description("\n".join(lines), ["python", "docker", "kubernetes"], 15)
+    assert fitted == "Must know Python and Docker\nKubernetes daily"
+    assert count_tokens(fitted) <= 15
+
+
+def test_prompt_fits_the_budget_with_the_best_sections_first(monkeypatch):
+    monkeypatch.setattr(prompt_builder.settings, "prompt_token_budget", 1200)
+    job = "\n".join(f"Requirement {i}: Python and Docker experience in production" for i in range(400))
+    prompt, report = assemble_tailoring_prompt(
+        RESUME, job, SECTIONS, ["python", "docker"], "deepseek/deepseek-r1-0528:free",
+        render_tailoring_prompt)
+
+    assert report.prompt_tokens == count_tokens(prompt) <= report.budget == 1200
+    assert RESUME in prompt and not report.over_budget
+    context = prompt.split("RELEVANT RESUME SECTIONS")[1].split("ORIGINAL RESUME")[0]
+    lines = [line for line in context.splitlines() if line.startswith("- ")]
+    assert [line.split(" (")[0] for line in lines] == ["- skills", "- experience", "- education"]
+    assert all(count_tokens(line.split("): ", 1)[1]) <= 80 for line in lines)
+    # Against the whole job description plus three fixed-length section excerpts
+    assert report.tokens_saved == report.baseline_tokens - report.prompt_tokens > 0
+
+
+def test_job_description_keeps_a_minimum_when_the_resume_fills_the_budget(monkeypatch):
+    monkeypatch.setattr(prompt_builder.settings, "prompt_token_budget", 300)
+    resume = RESUME.replace("Python, Docker", "Python Docker Kubernetes " * 200)
+    job = "Python developer\n" + "Docker and Kubernetes in production\n" * 300
+    prompt, report = assemble_tailoring_prompt(
+        resume, job, SECTIONS, ["python"], "deepseek/deepseek-r1-0528:free", render_tailoring_prompt)
+
+    assert report.over_budget and report.sections_included == 0
+    assert "Python developer" in prompt
+    job_part = prompt.split("JOB DESCRIPTION:")[1].split("KEY JOB REQUIREMENTS")[0]
+    assert count_tokens(job_part) <= MIN_JOB_TOKENS + 2
+
+
+def test_stats_accumulate_reports():
+    stats = PromptStats()
+    _, report = assemble_tailoring_prompt(
+        RESUME, "Python developer", SECTIONS, ["python"], "unknown/model", render_tailoring_prompt)
+    stats.record(report)
+    stats.record(report)
+    totals = stats.stats()
+    assert totals["prompts"] == 2 and totals["prompt_tokens"] == 2 * report.prompt_tokens
+    assert totals["exact_tokenizer"] is False and stats.last is report
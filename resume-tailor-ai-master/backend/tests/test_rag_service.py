@@ -0,0 +1,81 @@
+import pytest
+
+from app.services import ai_service
+from app.services.embedding_service import EmbeddingService, text_hash
+from app.services.rag_service import COLLECTION_NAME, RAGService
+from fakes import FakeClient, WordModel
+
+VOCABULARY = ["python", "docker", "kubernetes", "sales", "marketing", "design"]
+SECTIONS = [
+    {"content": "Marketing and sales lead", "section_type": "experience"},
+    {"content": "Python, Docker and Kubernetes", "section_type": "skills"},
+    {"content": "Design portfolio", "section_type": "projects"},
+]
+
+
+@pytest.fixture
+def rag(monkeypatch):
+    """A RAGService on a word-count model and an in-memory vector store."""
+    service = RAGService()
+    model = WordModel(VOCABULARY)
+    service._model = model
+    service._embeddings = EmbeddingService(model)
+    service._client = FakeClient()
+    service._collection = service._client.get_or_create_collection(COLLECTION_NAME)
+    monkeypatch.setattr(service, "maybe_run_maintenance", lambda: None)
+    return service
+
+
+def test_rank_sections_orders_by_cosine_similarity(rag):
+    ranked = rag.rank_sections(SECTIONS, "Python and Kubernetes engineer with some sales", top_k=2)
+
+    assert [(r["section_type"], r["index"]) for r in ranked] == [("skills", 1), ("experience", 0)]
+    assert ranked[0]["similarity"] > ranked[1]["similarity"]
+    assert -1.0 <= ranked[1]["similarity"] <= ranked[0]["similarity"] <= 1.0
+    # Sections and the job description are embedded in one batch, and nothing is stored
+    assert len(rag.model.calls) == 1
+    assert rag.collection.count() == 0
+
+
+def test_rank_sections_of_nothing(rag):
+    assert rag.rank_sections([], "anything") == []
+
+
+def test_persisting_is_keyed_by_content(rag):
+    rag.persist_request("resume text", SECTIONS, "Python engineer")
+    assert rag.collection.count() == 4
+    stored = rag.collection.get(include=["metadatas"])
+    assert f"resume_{text_hash('resume text')}_section_1" in stored["ids"]
+    assert f"job_{text_hash('Python engineer')}" in stored["ids"]
+
+    # The same request again is only marked as used, not written or embedded again
+    encoded = len(rag.model.calls)
+    rag.persist_request("resume text", SECTIONS, "Python engineer")
+    assert rag.collection.count() == 4
+    assert len(rag.model.calls) == encoded
+
+
+def test_changed_section_is_rewritten_in_place(rag):
+    rag.persist_request("resume text", SECTIONS, "Python engineer")
+    changed = [dict(SECTIONS[0]), dict(SECTIONS[1], content="Python and Go"), dict(SECTIONS[2])]
+    rag.persist_request("resume text", changed, "Python engineer")
+
+    entry = rag.collection.get(ids=[f"resume_{text_hash('resume text')}_section_1"], include=["documents"])
+    assert entry["documents"] == ["Python and Go"]
+    assert rag.collection.count() == 4
+
+
+def test_tailoring_request_only_persists_when_enabled(rag, monkeypatch):
+    persisted = []
+    monkeypatch.setattr(ai_service, "rag_service", rag)
+    monkeypatch.setattr(rag, "persist_request", lambda *args: persisted.append(args))
+    resume = "\\begin{document}\n\\section{Skills}\nPython, Docker\n\\section{Sales}\nMarketing\n\\end{document}"
+
+    monkeypatch.setattr(ai_service.settings, "rag_persist", False)
+    _, messages = ai_service.build_tailoring_request(resume, "Python developer", "DEEPSEEK_R1_0528")
+    assert persisted == []
+    assert "Python, Docker" in messages[1]["content"]
+
+    monkeypatch.setattr(ai_service.settings, "rag_persist", True)
+    ai_service.build_tailoring_request(resume, "Python developer", "DEEPSEEK_R1_0528")
+    assert len(persisted) == 1 and persisted[0][0] == resume
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from app.services import ai_service, section_tailoring
+from app.services.llm_cache import LLMResponseCache
+
+BODY = r"""\section{Experience}
+\begin{itemize}
+\item Built Python services
+\end{itemize}
+\section{Skills}
+Python, Docker
+"""
+DOCUMENT = "\\documentclass{article}\n\\begin{document}\n" + BODY + "\\end{document}\n"
+
+
+@pytest.fixture
+def llm_calls(monkeypatch):
+    """Record section and whole-resume re-requests instead of calling a model."""
+    calls = {"sections": [], "full": 0}
+
+    async def tailor_section(section, job_text, job_keywords, provider_model):
+        calls["sections"].append(section_tailoring._heading(section))
+        return section
+
+    async def tailor_sections(resume, job_description, model=None):
+        calls["full"] += 1
+        return resume
+
+    monkeypatch.setattr(section_tailoring, "_tailor_section", tailor_section)
+    monkeypatch.setattr(section_tailoring, "_job_context", lambda job: ([], job))
+    monkeypatch.setattr(section_tailoring, "tailor_sections_async", tailor_sections)
+    return calls
+
+
+def repair(resume: str, tailored: str) -> str:
+    return asyncio.run(section_tailoring.repair_tailored_resume_async(resume, tailored, "job"))
+
+
+def test_body_only_resume_is_kept(llm_calls):
+    tailored = BODY.replace("Built", "Designed")
+    assert repair(BODY, tailored) == tailored
+    assert llm_calls == {"sections": [], "full": 0}
+
+
+def test_errors_already_in_the_original_are_ignored(llm_calls):
+    resume = DOCUMENT.replace("Built Python services", "Earned $5M\n\n")
+    tailored = resume.replace("Python, Docker", "Python, Docker, Kubernetes")
+    assert repair(resume, tailored) == tailored
+    assert llm_calls == {"sections": [], "full": 0}
+
+
+def test_only_newly_broken_sections_are_requested_again(llm_calls):
+    tailored = DOCUMENT.replace("\\end{itemize}\n", "")
+    repaired = repair(DOCUMENT, tailored)
+    assert llm_calls == {"sections": ["\\section{Experience}"], "full": 0}
+    assert "\\end{itemize}" in repaired
+
+
+def test_damage_outside_sections_falls_back_to_section_tailoring(llm_calls):
+    repair(DOCUMENT, DOCUMENT.replace("\\end{document}\n", ""))
+    assert llm_calls == {"sections": [], "full": 1}
+
+
+@pytest.fixture
+def completions(monkeypatch, llm_calls):
+    """tailor_resume_async on a fresh cache, completing with the queued answers."""
+    answers = []
+
+    async def complete(provider_model, messages, validate=None):
+        return provider_model, answers.pop(0)
+
+    monkeypatch.setattr(ai_service, "llm_cache", LLMResponseCache(max_entries=8, ttl=60, semantic=False, threshold=0.9))
+    monkeypatch.setattr(ai_service, "build_tailoring_request",
+                        lambda resume, job, model: ("primary", [{"role": "user", "content": resume + job}]))
+    monkeypatch.setattr(ai_service, "complete_tailoring_async", complete)
+    return answers
+
+
+def checked(resume: str) -> str:
+    return asyncio.run(section_tailoring.tailor_resume_checked_async(resume, "job", "primary"))
+
+
+def test_the_repaired_resume_is_what_gets_cached(completions, llm_calls):
+    completions.append(DOCUMENT.replace("\\end{itemize}\n", ""))
+    first = checked(DOCUMENT)
+    assert "\\end{itemize}" in first and llm_calls["sections"] == ["\\section{Experience}"]
+
+    # The hit is the repaired resume: no completion and nothing left to repair
+    assert checked(DOCUMENT) == first
+    assert llm_calls["sections"] == ["\\section{Experience}"]
+
+
+def test_broken_completions_are_not_cached(completions):
+    broken = DOCUMENT.replace("\\end{itemize}\n", "")
+    completions.extend([broken, DOCUMENT])
+    assert asyncio.run(ai_service.tailor_resume_async(DOCUMENT, "job", "primary")) == broken
+    assert asyncio.run(ai_service.tailor_resume_async(DOCUMENT, "job", "primary")) == DOCUMENT
+    assert completions == []
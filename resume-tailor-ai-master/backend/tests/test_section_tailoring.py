@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+from app.services import section_tailoring
+from app.services.llm_cache import LLMResponseCache
+
+RESUME = r"""\documentclass{article}
+\usepackage{enumitem}
+\begin{document}
+\section{Experience}
+\begin{itemize}
+\item Built Python services
+\end{itemize}
+
+\section{Skills}
+Python, Docker
+
+\section{Education}
+BSc Computer Science
+\end{document}
+"""
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """
+    A fresh cache, every section ranked as relevant and a model that
+    appends "(tailored)" to each section; headings listed in `fail` raise,
+    those in `malform` come back without their heading.
+    """
+    state = {"calls": [], "running": 0, "peak": 0, "fail": set(), "malform": set()}
+
+    async def complete(provider_model, messages, validate=None):
+        section = messages[1]["content"].split("RESUME SECTION:\n")[1].split("\n\nINSTRUCTIONS")[0]
+        heading = section_tailoring._heading(section)
+        state["calls"].append(heading)
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        await asyncio.sleep(0.01)
+        state["running"] -= 1
+        if heading in state["fail"]:
+            raise RuntimeError("provider down")
+        if heading in state["malform"]:
+            return provider_model, section.split("\n", 1)[1]
+        return provider_model, section + " (tailored)"
+
+    def rank(sections, job_description, top_k=5):
+        return [{"index": i} for i in range(len(sections))][:top_k]
+
+    monkeypatch.setattr(section_tailoring, "llm_cache",
+                        LLMResponseCache(max_entries=16, ttl=60, semantic=False, threshold=0.9))
+    monkeypatch.setattr(section_tailoring, "complete_tailoring_async", complete)
+    monkeypatch.setattr(section_tailoring.rag_service, "rank_sections", rank)
+    return state
+
+
+def tailor(resume: str = RESUME, **kwargs) -> str:
+    return asyncio.run(section_tailoring.tailor_sections_async(resume, "Python developer", **kwargs))
+
+
+def test_sections_are_rewritten_concurrently_and_spliced_in_place(llm):
+    tailored = tailor()
+
+    assert sorted(llm["calls"]) == ["\\section{Education}", "\\section{Experience}", "\\section{Skills}"]
+    assert llm["peak"] == 3
+    assert tailored == (RESUME.replace("\\end{itemize}\n", "\\end{itemize} (tailored)\n")
+                        .replace("Python, Docker\n", "Python, Docker (tailored)\n")
+                        .replace("BSc Computer Science\n", "BSc Computer Science (tailored)\n"))
+
+
+def test_only_the_most_relevant_sections_are_sent(llm):
+    tailored = tailor(max_sections=1)
+    assert llm["calls"] == ["\\section{Experience}"]
+    assert "Python, Docker\n" in tailored and "BSc Computer Science\n" in tailored
+
+
+def test_failed_or_malformed_sections_keep_their_original_text(llm):
+    llm["fail"].add("\\section{Skills}")
+    llm["malform"].add("\\section{Education}")
+    tailored = tailor()
+
+    assert "\\end{itemize} (tailored)" in tailored
+    assert "Python, Docker\n" in tailored and "BSc Computer Science\n" in tailored
+    assert "(tailored)" not in tailored.split("\\section{Skills}")[1]
+
+
+def test_no_usable_section_raises(llm):
+    llm["fail"].update({"\\section{Experience}", "\\section{Skills}", "\\section{Education}"})
+    with pytest.raises(RuntimeError):
+        tailor()
+
+
+def test_rewrites_are_cached_per_section(llm):
+    tailor()
+    llm["calls"].clear()
+    changed = RESUME.replace("Python, Docker", "Python, Docker, Go")
+    tailored = tailor(changed)
+
+    assert llm["calls"] == ["\\section{Skills}"]
+    assert "Python, Docker, Go (tailored)" in tailored
+
+
+def test_resume_without_sections_is_tailored_whole(llm, monkeypatch):
+    whole = []
+
+    async def tailor_resume(resume, job_description, model=None):
+        whole.append(resume)
+        return "tailored"
+
+    monkeypatch.setattr(section_tailoring, "tailor_resume_async", tailor_resume)
+    resume = "\\documentclass{article}\n\\begin{document}\nJust text\n\\end{document}\n"
+    assert tailor(resume) == "tailored"
+    assert whole == [resume] and llm["calls"] == []
+
+
+def test_rewrites_that_change_structure_are_not_acceptable():
+    original = "\\section{Skills}\n\\begin{itemize}\n\\item Python\n\\end{itemize}"
+    assert section_tailoring._acceptable(original, original.replace("Python", "Python, Go"))
+    assert not section_tailoring._acceptable(original, original.replace("\\end{itemize}", ""))
+    assert not section_tailoring._acceptable(original, original.replace("{Skills}", "{Tools}"))
+    assert not section_tailoring._acceptable(original, original + "\n\\end{document}")
+    assert not section_tailoring._acceptable(original, original.replace("Python", "Python & Go"))
@@ -0,0 +1,154 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.utils.single_flight import SingleFlight, flight_key, single_flight_stats
+
+
+def test_keys_ignore_line_endings_and_surrounding_whitespace():
+    assert flight_key("full", "a\r\nb\n") == flight_key("full", " a\nb")
+    assert flight_key("full", None) == flight_key("full", "")
+    # Parts are delimited, so moving text between them changes the key
+    assert flight_key("ab", "c") != flight_key("a", "bc")
+
+
+def test_concurrent_runs_share_one_call():
+    flights = SingleFlight("test")
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "pdf"
+
+    async def scenario():
+        results = await asyncio.gather(*(flights.run("k", work) for _ in range(3)))
+        # Nothing is kept once the flight lands
+        return results, await flights.run("k", work)
+
+    results, later = asyncio.run(scenario())
+    assert results == ["pdf"] * 3 and later == "pdf"
+    assert len(calls) == 2
+    assert flights.stats() == {"calls": 4, "leaders": 2, "joined": 2, "cancelled": 0, "errors": 0,
+                               "coalesce_rate": 0.5, "in_flight": 0}
+
+
+def test_every_waiter_gets_the_exception():
+    flights = SingleFlight("test")
+
+    async def work():
+        await asyncio.sleep(0.01)
+        raise ValueError("bad latex")
+
+    async def scenario():
+        return await asyncio.gather(*(flights.run("k", work) for _ in range(2)), return_exceptions=True)
+
+    assert [str(e) for e in asyncio.run(scenario())] == ["bad latex", "bad latex"]
+    assert flights.stats()["errors"] == 1
+
+
+def test_a_cancelled_caller_leaves_the_others_waiting():
+    flights = SingleFlight("test")
+
+    async def scenario():
+        gate = asyncio.Event()
+
+        async def work():
+            await gate.wait()
+            return "done"
+
+        leader = asyncio.create_task(flights.run("k", work))
+        follower = asyncio.create_task(flights.run("k", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        gate.set()
+        return await follower, leader.cancelled()
+
+    assert asyncio.run(scenario()) == ("done", True)
+    assert flights.stats()["cancelled"] == 0
+
+
+def test_the_work_is_cancelled_when_the_last_caller_leaves():
+    flights = SingleFlight("test")
+    cancelled = []
+
+    async def work():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def scenario():
+        callers = [asyncio.create_task(flights.run("k", work)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+    assert cancelled == [True]
+    assert flights.stats()["cancelled"] == 1 and flights.stats()["in_flight"] == 0
+
+
+def test_blocking_calls_share_the_leaders_result():
+    flights = SingleFlight("test")
+    started, release = threading.Event(), threading.Event()
+    calls, results = [], []
+
+    def work():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "pdf"
+
+    leader = threading.Thread(target=lambda: results.append(flights.call("k", work)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flights.call("k", work))) for _ in range(2)]
+    for follower in followers:
+        follower.start()
+    while flights.stats()["joined"] < 2:
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert results == ["pdf"] * 3 and len(calls) == 1
+    assert flights.stats()["in_flight"] == 0
+
+
+def test_blocking_call_errors_reach_the_leader():
+    flights = SingleFlight("test")
+
+    def work():
+        raise RuntimeError("tectonic failed")
+
+    with pytest.raises(RuntimeError, match="tectonic failed"):
+        flights.call("k", work)
+    assert flights.stats()["errors"] == 1 and flights.stats()["in_flight"] == 0
+
+
+def test_disabled_groups_run_every_call():
+    flights = SingleFlight("test", enabled=False)
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    async def scenario():
+        return await asyncio.gather(flights.run("k", work), flights.run("k", work))
+
+    assert sorted(asyncio.run(scenario())) == [2, 2]
+    assert flights.call("k", lambda: "sync") == "sync"
+    assert flights.stats()["calls"] == 0
+
+
+def test_stats_are_reported_per_group():
+    assert set(single_flight_stats()) == {"tailor", "analyze", "compile"}
@@ -0,0 +1,103 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+import types
+
+from fastapi.testclient import TestClient
+
+from app.core import lifespan
+from app.services.rag_service import RAGService
+from fakes import FakeClient, WordModel
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_importing_the_app_loads_no_heavy_dependencies():
+    code = (
+        "import sys, main\n"
+        "heavy = {'torch', 'sentence_transformers', 'chromadb', 'openai'} & set(sys.modules)\n"
+        "print(sorted(heavy))\n"
+    )
+    env = {**os.environ, "OPENAI_API_KEY": "test", "PRELOAD_RAG": "false"}
+    result = subprocess.run([sys.executable, "-c", code], cwd=BACKEND, env=env,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]"
+
+
+def fake_dependencies(monkeypatch, concurrently: bool = False):
+    """Stand-ins for sentence_transformers and chromadb that count how often they load."""
+    loads = {"model": 0, "store": 0}
+    both_started = threading.Barrier(2, timeout=5)
+
+    def sentence_transformer(name):
+        loads["model"] += 1
+        if concurrently:
+            both_started.wait()
+        return WordModel(["python"])
+
+    def persistent_client(path):
+        loads["store"] += 1
+        if concurrently:
+            both_started.wait()
+        return FakeClient()
+
+    monkeypatch.setitem(sys.modules, "sentence_transformers",
+                        types.SimpleNamespace(SentenceTransformer=sentence_transformer))
+    monkeypatch.setitem(sys.modules, "chromadb", types.SimpleNamespace(PersistentClient=persistent_client))
+    return loads
+
+
+def test_rag_service_loads_once_on_first_use(monkeypatch, tmp_path):
+    loads = fake_dependencies(monkeypatch)
+    monkeypatch.setattr("app.services.rag_service.settings.chroma_db_path", str(tmp_path))
+    service = RAGService()
+    assert loads == {"model": 0, "store": 0} and not service.ready
+
+    threads = [threading.Thread(target=lambda: service.embeddings) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    service.collection
+    service.collection
+    assert loads == {"model": 1, "store": 1} and service.ready
+
+
+def test_warm_up_loads_model_and_store_concurrently(monkeypatch, tmp_path):
+    # Each loader waits for the other to start, so a sequential warm-up would time out
+    loads = fake_dependencies(monkeypatch, concurrently=True)
+    monkeypatch.setattr("app.services.rag_service.settings.chroma_db_path", str(tmp_path))
+    service = RAGService()
+    service.warm_up()
+    assert loads == {"model": 1, "store": 1} and service.ready
+
+
+def test_ready_only_after_warm_up(monkeypatch):
+    import main
+    from app.services import ai_service
+    from app.services import rag_service as rag_module
+
+    release = threading.Event()
+    monkeypatch.setattr(lifespan.settings, "preload_rag", True)
+    monkeypatch.setattr(rag_module.rag_service, "warm_up", lambda: release.wait(5))
+    monkeypatch.setattr(lifespan, "startup_state", lifespan.StartupState())
+    monkeypatch.setattr(main, "startup_state", lifespan.startup_state)
+
+    with TestClient(main.app) as client:
+        assert client.get("/health/live").status_code == 200
+        starting = client.get("/health/ready")
+        assert starting.status_code == 503 and starting.json()["components"]["rag"] is False
+
+        release.set()
+        for _ in range(100):
+            ready = client.get("/health/ready")
+            if ready.status_code == 200:
+                break
+            time.sleep(0.02)
+        assert ready.status_code == 200
+        assert ready.json()["components"] == {"rag": True, "llm_client": True}
+    # Shutdown closed the shared client
+    ai_service.get_async_client.cache_clear()
@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from app.services.ai_service import StreamingSanitizer, sanitize_model_output
+
+BODY = "\\section{Experience}\n\\item Built `tools` with ``quotes'' and $5M savings\n\n\\end{document}"
+
+OUTPUTS = [
+    BODY,
+    f"<think>plan the edits</think>\n{BODY}",
+    f"<THINK>upper case</Think>{BODY}\n\n",
+    f"```latex\n{BODY}\n```",
+    f"```\n{BODY}\n```\n",
+    f"<think>reason ``` about fences</think>\n```latex\n{BODY}\n```",
+    f"```latex\n{BODY}\n```\ntrailing note",
+    f"```latex\n{BODY}\n``` and ``` twice",
+    f"{BODY}\n<think>late thought</think>\nafter",
+    f"<think>one</think>{BODY}<think>two</think>",
+    f"<think>never closed {BODY}",
+    f"{BODY} <thin",
+    f"`{BODY}`",
+    f"```latex\n{BODY}",
+    "```latex\n```",
+    "   \n",
+    "",
+]
+
+
+def chunkings(text: str, rng: random.Random, count: int = 30):
+    yield [text]
+    yield list(text)
+    for _ in range(count):
+        cuts = sorted(rng.sample(range(1, len(text)), min(len(text) - 1, rng.randint(1, 8)))) if len(text) > 1 else []
+        bounds = [0, *cuts, len(text)]
+        yield [text[a:b] for a, b in zip(bounds, bounds[1:])]
+
+
+@pytest.mark.parametrize("output", OUTPUTS)
+def test_streamed_output_matches_sanitize(output):
+    expected = sanitize_model_output(output)
+    rng = random.Random(output)
+    for chunks in chunkings(output, rng):
+        sanitizer = StreamingSanitizer()
+        streamed = "".join(sanitizer.feed(chunk) for chunk in chunks) + sanitizer.finish()
+        assert streamed == expected, chunks
+
+
+def test_random_outputs_match_sanitize():
+    rng = random.Random(7)
+    pieces = ["<think>", "</think>", "<THINK>", "```", "```latex\n", "\n", "  ", "`", "text", "\\item a", "<thi"]
+    for _ in range(300):
+        output = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+        expected = sanitize_model_output(output)
+        for chunks in chunkings(output, rng, count=5):
+            sanitizer = StreamingSanitizer()
+            streamed = "".join(sanitizer.feed(chunk) for chunk in chunks) + sanitizer.finish()
+            assert streamed == expected, chunks
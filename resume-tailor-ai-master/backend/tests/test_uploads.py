@@ -0,0 +1,143 @@
+import asyncio
+import io
+
+import pytest
+from fastapi import FastAPI, UploadFile
+from fastapi.testclient import TestClient
+
+from app.core.middleware import BodySizeLimitMiddleware
+from app.utils.file_handler import UploadDecodeError, UploadTooLargeError, read_text_upload
+
+RESUME = "\\begin{document}\n\\section{Skills}\nPython, Docker, naïve café\n\\end{document}\n"
+
+
+class CountingFile(io.BytesIO):
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        return super().read(size)
+
+
+def read(data: bytes, max_bytes: int, chunk_size: int = 4, size=None):
+    upload = UploadFile(CountingFile(data), filename="resume.tex", size=size)
+    text = asyncio.run(read_text_upload(upload, max_bytes, chunk_size=chunk_size))
+    return text, upload.file.reads
+
+
+def test_text_is_decoded_across_chunk_boundaries():
+    # Four-byte chunks split the two-byte characters
+    text, reads = read(RESUME.encode(), max_bytes=1000)
+    assert text == RESUME and reads > 10
+
+
+def test_reading_stops_once_the_limit_is_passed():
+    upload = UploadFile(CountingFile(b"x" * 1000), filename="resume.tex")
+    with pytest.raises(UploadTooLargeError, match="less than 10B"):
+        asyncio.run(read_text_upload(upload, 10, chunk_size=4))
+    assert upload.file.reads == 3
+
+
+def test_a_declared_size_over_the_limit_is_rejected_before_reading():
+    upload = UploadFile(CountingFile(b"x"), filename="resume.tex", size=5000)
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(read_text_upload(upload, 1000))
+    assert upload.file.reads == 0
+
+
+def test_invalid_utf8_is_reported():
+    with pytest.raises(UploadDecodeError, match="byte 3"):
+        read(b"abc\xff\xfedef", max_bytes=1000)
+
+
+def guarded_app(max_bytes: int):
+    """An app that drains the body, behind the limit on /upload only."""
+    received = []
+
+    async def app(scope, receive, send):
+        total = 0
+        while True:
+            message = await receive()
+            received.append(message)
+            total += len(message.get("body", b""))
+            if not message.get("more_body"):
+                break
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": str(total).encode()})
+
+    return BodySizeLimitMiddleware(app, max_bytes=max_bytes, paths=["/upload/"]), received
+
+
+def call(app, path: str, chunks, headers=()):
+    scope = {"type": "http", "method": "POST", "path": path, "headers": list(headers)}
+    pending = [{"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+               for i, chunk in enumerate(chunks)]
+    sent = []
+
+    async def receive():
+        return pending.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return sent[0]["status"], b"".join(m.get("body", b"") for m in sent[1:])
+
+
+def test_declared_content_length_over_the_limit_is_refused_unread():
+    app, received = guarded_app(10)
+    status, body = call(app, "/upload", [b"x" * 20], headers=[(b"content-length", b"20")])
+    assert status == 413 and b"less than 10B" in body
+    assert received == []
+
+
+def test_streamed_body_is_cut_off_once_it_passes_the_limit():
+    app, received = guarded_app(10)
+    status, _ = call(app, "/upload", [b"x" * 6, b"x" * 6, b"x" * 6])
+    assert status == 413
+    assert len(received) == 1  # the chunk that crossed the limit never reached the app
+
+
+def test_bodies_within_the_limit_and_other_paths_pass():
+    app, _ = guarded_app(10)
+    assert call(app, "/upload", [b"x" * 5, b"x" * 5]) == (200, b"10")
+    assert call(app, "/other", [b"x" * 50], headers=[(b"content-length", b"50")]) == (200, b"50")
+
+
+@pytest.fixture
+def client(monkeypatch):
+    from app.api.v1.endpoints import resume
+
+    monkeypatch.setattr(resume.settings, "max_file_size", 100)
+    app = FastAPI()
+    app.include_router(resume.router, prefix="/api/v1/resume")
+    with TestClient(app) as client:
+        yield client
+
+
+def test_upload_over_the_file_limit_is_413(client):
+    big = ("x" * 200).encode()
+    response = client.post("/api/v1/resume/upload", files={"file": ("resume.tex", big)})
+    assert response.status_code == 413
+
+    ok = client.post("/api/v1/resume/upload", files={"file": ("resume.tex", b"\\section{Skills}\nPython")})
+    assert ok.status_code == 200 and ok.json()["sections"][0]["section_type"] == "skills"
+
+
+def test_batch_upload_reports_each_file(client):
+    files = [
+        ("files", ("a.tex", b"\\section{Skills}\nPython")),
+        ("files", ("b.tex", b"x" * 200)),
+        ("files", ("c.pdf", b"%PDF")),
+        ("files", ("d.tex", b"\xff\xfe")),
+    ]
+    response = client.post("/api/v1/resume/upload/batch", files=files)
+    results = response.json()["results"]
+
+    assert response.status_code == 200 and response.json()["success"] is False
+    assert [r["success"] for r in results] == [True, False, False, False]
+    assert "less than" in results[1]["error"]
+    assert results[2]["error"] == "Only .tex files are supported"
+    assert "UTF-8" in results[3]["error"]
@@ -0,0 +1,175 @@
+import importlib.util
+import os
+import sys
+import time
+
+import pytest
+
+from app.services import vector_maintenance
+from app.services.rag_service import COLLECTION_NAME, RAGService
+from fakes import FakeClient
+
+NAME = "store"
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(autouse=True)
+def small_pages(monkeypatch):
+    monkeypatch.setattr(vector_maintenance, "PAGE_SIZE", 3)
+
+
+def store(entries, client=None):
+    """A collection holding `entries` as (id, metadata, document), in order."""
+    client = client or FakeClient()
+    collection = client.create_collection(NAME, metadata={"hnsw:space": "cosine"})
+    for n, (entry_id, metadata, document) in enumerate(entries):
+        collection.add(ids=[entry_id], embeddings=[[float(n), 1.0]], documents=[document], metadatas=[metadata])
+    return client, collection
+
+
+def aged(n, **metadata):
+    return [(f"e{i}", {"created_at": float(i), "last_used_at": float(i), **metadata}, f"doc {i}") for i in range(n)]
+
+
+def test_entries_are_read_in_pages_and_windows():
+    _, collection = store(aged(10))
+    assert [e["id"] for e in vector_maintenance.iter_entries(collection, ["metadatas"])] == [
+        f"e{i}" for i in range(10)]
+    window = vector_maintenance.iter_entries(collection, ["metadatas"], start=4, limit=5)
+    assert [e["id"] for e in window] == ["e4", "e5", "e6", "e7", "e8"]
+
+
+def test_dedupe_keeps_the_most_recently_used_copy():
+    _, collection = store([
+        ("a1", {"type": "resume_section", "resume_id": "r1", "content_hash": "h", "last_used_at": 5.0}, "Python"),
+        ("a2", {"type": "resume_section", "resume_id": "r1", "content_hash": "h", "last_used_at": 9.0}, "Python"),
+        # Same text in another resume is not a duplicate
+        ("b1", {"type": "resume_section", "resume_id": "r2", "content_hash": "h", "last_used_at": 1.0}, "Python"),
+        # Legacy entries without a hash: one copy per request under fresh resume ids
+        ("old1", {"type": "resume_section", "resume_id": "x", "created_at": 3.0}, "Docker"),
+        ("old2", {"type": "resume_section", "resume_id": "y", "created_at": 2.0}, "Docker"),
+    ])
+    assert vector_maintenance.dedupe(collection) == 2
+    assert sorted(collection.entries) == ["a2", "b1", "old1"]
+
+
+def test_expiry_removes_old_and_undated_entries():
+    _, collection = store(aged(6) + [("undated", {}, "doc")])
+    assert vector_maintenance.evict_expired(collection, ttl_seconds=10, now=13.5) == 5
+    assert sorted(collection.entries) == ["e4", "e5"]
+
+
+def test_lru_eviction_goes_below_the_budget():
+    _, collection = store(aged(20))
+    # Down to 90% of 10, oldest last use first
+    assert vector_maintenance.evict_lru(collection, max_entries=10) == 11
+    assert sorted(collection.entries, key=lambda i: int(i[1:])) == [f"e{i}" for i in range(11, 20)]
+    assert vector_maintenance.evict_lru(collection, max_entries=10) == 0
+
+
+def test_compaction_keeps_every_live_entry():
+    client, collection = store(aged(7))
+    collection.delete(ids=["e1", "e2"])
+    compacted = vector_maintenance.compact(client, NAME)
+
+    assert client.list_collections() == [NAME]
+    assert compacted is not collection and compacted.metadata == {"hnsw:space": "cosine"}
+    assert compacted.entries == collection.entries
+
+
+def test_crash_between_the_renames_is_undone(monkeypatch):
+    client, collection = store(aged(4))
+    rename = client._rename
+
+    def crash_on_staging(renamed, name):
+        if renamed.name.endswith(vector_maintenance.STAGING_SUFFIX):
+            raise RuntimeError("killed")
+        rename(renamed, name)
+
+    monkeypatch.setattr(client, "_rename", crash_on_staging)
+    with pytest.raises(RuntimeError):
+        vector_maintenance.compact(client, NAME)
+    assert NAME not in client.list_collections()
+
+    vector_maintenance.recover(client, NAME)
+    assert client.list_collections() == [NAME]
+    assert client.get_collection(NAME) is collection and len(collection.entries) == 4
+
+
+def test_crash_before_the_old_copy_is_deleted_keeps_the_new_one(monkeypatch):
+    client, _ = store(aged(4))
+    delete = client.delete_collection
+
+    def crash_on_retired(name):
+        if name.endswith(vector_maintenance.RETIRED_SUFFIX):
+            raise RuntimeError("killed")
+        delete(name)
+
+    monkeypatch.setattr(client, "delete_collection", crash_on_retired)
+    with pytest.raises(RuntimeError):
+        vector_maintenance.compact(client, NAME)
+    monkeypatch.setattr(client, "delete_collection", delete)
+
+    vector_maintenance.recover(client, NAME)
+    assert client.list_collections() == [NAME]
+    assert len(client.get_collection(NAME).entries) == 4
+
+
+@pytest.fixture
+def rag(monkeypatch, tmp_path):
+    service = RAGService()
+    service._client = FakeClient()
+    service._collection = service._client.create_collection(COLLECTION_NAME)
+    monkeypatch.setattr("app.services.rag_service.settings.chroma_db_path", str(tmp_path))
+    monkeypatch.setattr("app.services.rag_service.settings.rag_max_entries", 0)
+    monkeypatch.setattr("app.services.rag_service.settings.rag_max_bytes", 0)
+    monkeypatch.setattr("app.services.rag_service.settings.rag_compact_ratio", 10.0)
+    return service
+
+
+def test_bounded_maintenance_reads_one_window_per_run(rag, monkeypatch):
+    # Four fresh entries, then six long expired ones
+    entries = [(f"new{i}", {"created_at": time.time()}, "doc") for i in range(4)] + aged(6)
+    for entry_id, metadata, document in entries:
+        rag.collection.add(ids=[entry_id], embeddings=[[1.0]], documents=[document], metadatas=[metadata])
+    read = []
+    get = rag.collection.get
+
+    def counting_get(**kwargs):
+        page = get(**kwargs)
+        read[-1] += len(page["ids"])
+        return page
+
+    monkeypatch.setattr(rag.collection, "get", counting_get)
+    reports = []
+    for _ in range(4):
+        read.append(0)
+        reports.append(rag.run_maintenance(scan=4))
+    # Each run reads one window, resuming after the previous one and wrapping around
+    assert [r["expired"] for r in reports] == [0, 4, 2, 0]
+    assert read == [4, 4, 2, 4]
+    assert sorted(rag.collection.entries) == ["new0", "new1", "new2", "new3"]
+
+
+def unavailable(**kwargs):
+    raise RuntimeError("store unavailable")
+
+
+def test_expiry_failures_reach_the_caller(rag, monkeypatch):
+    monkeypatch.setattr(rag.collection, "get", unavailable)
+    with pytest.raises(RuntimeError, match="store unavailable"):
+        rag.collect_garbage(60)
+
+
+def test_expire_command_exits_non_zero_on_failure(rag, monkeypatch, capsys):
+    spec = importlib.util.spec_from_file_location("init_db", os.path.join(BACKEND, "scripts", "init_db.py"))
+    init_db = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(init_db)
+    monkeypatch.setattr(init_db, "get_rag_service", lambda: rag)
+    monkeypatch.setattr(rag.collection, "get", unavailable)
+    monkeypatch.setattr(sys, "argv", ["init_db.py", "expire"])
+
+    with pytest.raises(SystemExit) as exit_info:
+        init_db.main()
+    assert exit_info.value.code == 1
+    assert "expire failed" in capsys.readouterr().out
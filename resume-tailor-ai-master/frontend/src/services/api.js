@@ -3,6 +3,8 @@ const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 class ApiService {
   constructor() {
     this.baseURL = API_BASE_URL;
+    // Last compiled preview, reused while the LaTeX is unchanged
+    this.lastPdf = { source: null, blob: null };
   }
 
   async uploadResume(file) {
@@ -22,7 +24,7 @@ class ApiService {
     return response.json();
   }
 
-  async tailorResume(resumeContent, jobDescription, model) {
+  async tailorResume(resumeContent, jobDescription, model, mode = 'full') {
     const response = await fetch(`${this.baseURL}/api/v1/tailor/`, {
       method: 'POST',
       headers: {
@@ -32,6 +34,7 @@ class ApiService {
         resume: resumeContent,
         job_description: jobDescription,
         model,
+        mode,
       }),
     });
 
@@ -44,6 +47,10 @@ class ApiService {
   }
 
   async compilePdf(latexContent) {
+    if (this.lastPdf.source === latexContent && this.lastPdf.blob) {
+      return this.lastPdf.blob;
+    }
+
     const response = await fetch(`${this.baseURL}/api/v1/tailor/compile`, {
       method: 'POST',
       headers: {
@@ -64,6 +71,7 @@ class ApiService {
     }
 
     const blob = await response.blob();
+    this.lastPdf = { source: latexContent, blob };
     return blob;
   }
 